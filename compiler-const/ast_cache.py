@@ -0,0 +1,499 @@
+"""
+python ast_cache.py mg.f23
+"""
+
+# This file is the AST cache: the parse tree of a source is kept on disk, in a compact binary
+# format, under a key made of the hash of the source and the version of the grammar; a source
+# compiled again is not lexed nor parsed (nor traced) again, its tree is loaded instead.
+#
+# Format of an entry (all integers little endian):
+#   header   => MAGIC, FORMAT_VERSION, then the lengths of the sections (see HEADER);
+#               the sections follow, compressed together with zlib (which also checksums them).
+#   strings  => every distinct string of the tree once: its node type names, the properties of
+#               its typed nodes (names, values...) and its tokens; their lengths, then their text.
+#   kinds    => the string index of every node type name used; kind 0 is a token.
+#   payloads => the properties of the typed nodes (see NODE_CLASSES), equal ones stored once,
+#               as tagged integers (TAG_NONE, TAG_STRING, TAG_NODE, TAG_TUPLE, TAG_INTEGER).
+#   nodes    => the nodes in postorder (the children of a node before it), as three columns:
+#               kind, number of children, and payload (-1 if none; the string of a token).
+# A tree is read back in one pass over the nodes, with a stack; nothing in an entry is ever
+# evaluated, so an entry can only give a tree (or be found corrupt, and removed).
+#
+# The cache is bounded in size: when it grows over max_bytes, the entries used least recently
+# (their modification time, updated on every hit) are removed first.
+
+import hashlib
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+
+import simple_ast
+from flat_ast import TAG_INTEGER, TAG_NODE, TAG_NONE, TAG_STRING, TAG_TUPLE, NodeReference
+from node_types import NODE_TYPE_NAMES, node_type
+from parser_tables import CACHE_DIRECTORY
+from simple_ast import NODE_CLASSES, Node
+
+AST_CACHE_DIRECTORY = os.path.join(CACHE_DIRECTORY, "ast")
+ENTRY_SUFFIX = ".f23ast"
+
+# Size of the cache directory the entries used least recently are removed above.
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+MAGIC = b"F23AST"
+FORMAT_VERSION = 2
+
+# MAGIC, FORMAT_VERSION, number of strings, characters of the strings, number of kinds,
+# number of payloads, number of payload integers, number of nodes.
+HEADER = struct.Struct("<6sHIIIIII")
+
+# The modules the shape of the tree depends on: the tokens, and the grammar with its actions
+# and typed nodes.
+GRAMMAR_MODULES = ("simple_lex", "simple_ast")
+
+grammar_key = None
+
+
+# grammar_version() => a hash of the grammar (of the source of its modules), computed once.
+def grammar_version() -> str:
+    global grammar_key
+    if grammar_key is None:
+        grammar = hashlib.sha256(MAGIC + bytes([FORMAT_VERSION]))
+        for module_name in GRAMMAR_MODULES:
+            with open(sys.modules[module_name].__file__, "rb") as file:
+                grammar.update(file.read())
+        grammar_key = grammar.hexdigest()
+    return grammar_key
+
+
+# source_key(source) => the cache key of a source (str, or bytes, mmap or BytesIO of its file).
+def source_key(source) -> str:
+    if isinstance(source, str):
+        source = source.encode()
+    elif hasattr(source, "getbuffer"):
+        source = source.getbuffer()
+    key = hashlib.sha256(grammar_version().encode())
+    key.update(source)
+    return key.hexdigest()
+
+
+# little_endian(values) => the array as stored: the sections are little endian.
+def little_endian(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+# ----------------------------------------------------------------------------
+# Returns the entry of the tree given as parameter (see the format above).
+# ----------------------------------------------------------------------------
+def encode_tree(root) -> bytes:
+    # The nodes in postorder: the reverse of a preorder that takes the last child first.
+    nodes = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        if isinstance(node, Node):
+            stack.extend(node.children)
+    nodes.reverse()
+    indexes = {id(node): index for index, node in enumerate(nodes)}
+
+    strings = []
+    string_indexes = {}
+
+    def string_index(string):
+        index = string_indexes.get(string)
+        if index is None:
+            index = string_indexes[string] = len(strings)
+            strings.append(string)
+        return index
+
+    kinds = array("I", [string_index("token")])
+    kind_indexes = {}
+    payload_values = array("i")
+    payload_offsets = array("I", [0])
+    payload_indexes = {}
+
+    def encode_value(value, values):
+        if value is None:
+            values.append(TAG_NONE)
+        elif isinstance(value, str):
+            values += (TAG_STRING, string_index(value))
+        elif isinstance(value, Node):
+            values += (TAG_NODE, indexes[id(value)])
+        elif isinstance(value, tuple):
+            values += (TAG_TUPLE, len(value))
+            for item in value:
+                encode_value(item, values)
+        elif isinstance(value, int):
+            # The line of a statement.
+            values += (TAG_INTEGER, value)
+        else:
+            raise ValueError("can not store a {} in the AST cache".format(type(value).__name__))
+
+    node_kinds = array("H")
+    node_counts = array("I")
+    node_payloads = array("i")
+    for node in nodes:
+        if not isinstance(node, Node):
+            # Tokens are kept in the tree as they are (e.g. the "-" of a negative constant).
+            node_kinds.append(0)
+            node_counts.append(0)
+            node_payloads.append(string_index(encode_token(node)))
+            continue
+
+        kind = kind_indexes.get(node.type)
+        if kind is None:
+            kind = kind_indexes[node.type] = len(kinds)
+            kinds.append(string_index(NODE_TYPE_NAMES[node.type]))
+        node_kinds.append(kind)
+        node_counts.append(len(node.children))
+
+        if type(node) is Node:
+            node_payloads.append(-1)
+            continue
+        values = []
+        encode_value(tuple(getattr(node, slot) for slot in node.__slots__), values)
+        values = tuple(values)
+        payload = payload_indexes.get(values)
+        if payload is None:
+            payload = payload_indexes[values] = len(payload_offsets) - 1
+            payload_values.extend(values)
+            payload_offsets.append(len(payload_values))
+        node_payloads.append(payload)
+
+    string_lengths = array("I", [len(string) for string in strings])
+    text = "".join(strings).encode()
+    header = HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        len(strings),
+        len(text),
+        len(kinds),
+        len(payload_offsets) - 1,
+        len(payload_values),
+        len(nodes),
+    )
+    sections = b"".join(
+        [
+            little_endian(string_lengths),
+            text,
+            little_endian(kinds),
+            little_endian(payload_offsets),
+            little_endian(payload_values),
+            little_endian(node_kinds),
+            little_endian(node_counts),
+            little_endian(node_payloads),
+        ]
+    )
+    return header + zlib.compress(sections)
+
+
+# encode_token(token) => the string of a token of the tree; only strings are kept as tokens.
+def encode_token(token) -> str:
+    if not isinstance(token, str):
+        raise ValueError("can not store a {} in the AST cache".format(type(token).__name__))
+    return token
+
+
+# ----------------------------------------------------------------------------
+# Reads the tree of an entry (see encode_tree()) back;
+# raises ValueError if the entry is not one, or is corrupt.
+# ----------------------------------------------------------------------------
+def decode_tree(data: bytes):
+    try:
+        return read_entry(memoryview(data))
+    except (IndexError, KeyError, TypeError, UnicodeDecodeError, struct.error, zlib.error) as error:
+        raise ValueError("corrupt AST cache entry ({})".format(error)) from None
+
+
+def read_entry(data):
+    (
+        magic,
+        version,
+        string_count,
+        text_size,
+        kind_count,
+        payload_count,
+        value_count,
+        node_count,
+    ) = HEADER.unpack_from(data)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("not an AST cache entry of this version")
+
+    data = zlib.decompress(data[HEADER.size :])
+    position = 0
+
+    def read_array(typecode, count):
+        nonlocal position
+        values = array(typecode)
+        end = position + count * values.itemsize
+        if end > len(data):
+            raise ValueError("truncated AST cache entry")
+        values.frombytes(data[position:end])
+        if sys.byteorder == "big":
+            values.byteswap()
+        position = end
+        return values
+
+    string_lengths = read_array("I", string_count)
+    text = bytes(data[position : position + text_size]).decode()
+    position += text_size
+    strings = []
+    start = 0
+    for length in string_lengths:
+        strings.append(text[start : start + length])
+        start += length
+
+    kinds = read_array("I", kind_count)
+    payload_offsets = read_array("I", payload_count + 1)
+    payload_values = read_array("i", value_count)
+    node_kinds = read_array("H", node_count)
+    node_counts = read_array("I", node_count)
+    node_payloads = read_array("i", node_count)
+    if position != len(data):
+        raise ValueError("trailing bytes in AST cache entry")
+
+    # Per kind: its node type in this process, and its class.
+    types = [None]
+    classes = [None]
+    for kind in kinds[1:]:
+        types.append(node_type(strings[kind]))
+        classes.append(NODE_CLASSES.get(types[-1], Node))
+
+    # The payloads, with their references to nodes left as NodeReferences until every node
+    # is read; has_nodes[payload] => whether it has any.
+    payloads = []
+    has_nodes = []
+    for payload in range(payload_count):
+        values = payload_values[payload_offsets[payload] : payload_offsets[payload + 1]]
+        value, end, nodes_found = decode_value(values, 0, strings)
+        if end != len(values):
+            raise ValueError("corrupt payload in AST cache entry")
+        payloads.append(value)
+        has_nodes.append(nodes_found)
+
+    nodes = []
+    stack = []
+    linked = []
+    for kind, count, payload in zip(node_kinds, node_counts, node_payloads):
+        if kind == 0:
+            node = strings[payload]
+        else:
+            node_class = classes[kind]
+            node = node_class.__new__(node_class)
+            node.type = types[kind]
+            if count:
+                if count > len(stack):
+                    raise ValueError("corrupt tree in AST cache entry")
+                node.children = tuple(stack[-count:])
+                del stack[-count:]
+            else:
+                node.children = ()
+            if payload >= 0:
+                if has_nodes[payload]:
+                    linked.append((node, payloads[payload]))
+                else:
+                    for slot, value in zip(node_class.__slots__, payloads[payload]):
+                        setattr(node, slot, value)
+        nodes.append(node)
+        stack.append(node)
+
+    for node, values in linked:
+        for slot, value in zip(node.__slots__, link_nodes(values, nodes)):
+            setattr(node, slot, value)
+
+    if len(stack) != 1:
+        raise ValueError("corrupt tree in AST cache entry")
+    return stack[0]
+
+
+# decode_value(values, position, strings) => (value, position after it, whether it refers to nodes).
+def decode_value(values, position, strings):
+    tag = values[position]
+    if tag == TAG_NONE:
+        return None, position + 1, False
+    if tag == TAG_STRING:
+        return strings[values[position + 1]], position + 2, False
+    if tag == TAG_NODE:
+        return NodeReference(values[position + 1]), position + 2, True
+    if tag == TAG_TUPLE:
+        items = []
+        nodes_found = False
+        position += 2
+        for _ in range(values[position - 1]):
+            item, position, item_nodes = decode_value(values, position, strings)
+            items.append(item)
+            nodes_found = nodes_found or item_nodes
+        return tuple(items), position, nodes_found
+    if tag == TAG_INTEGER:
+        return values[position + 1], position + 2, False
+    raise ValueError("unknown tag {} in AST cache entry".format(tag))
+
+
+# link_nodes(value, nodes) => the value, with its references to nodes replaced by the nodes.
+def link_nodes(value, nodes):
+    if isinstance(value, NodeReference):
+        return nodes[value.index]
+    if isinstance(value, tuple):
+        return tuple(link_nodes(item, nodes) for item in value)
+    return value
+
+
+class ASTCache:
+    def __init__(self, directory=AST_CACHE_DIRECTORY, max_bytes=MAX_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    # get(source) => the tree of the source, or None if it is not cached.
+    def get(self, source):
+        path = self.path(source_key(source))
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except OSError:
+            self.misses += 1
+            return None
+
+        try:
+            tree = decode_tree(data)
+        except ValueError:
+            self.misses += 1
+            self.remove(path)
+            return None
+
+        # Marks the entry as used now, for the eviction.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return tree
+
+    # ----------------------------------------------------------------------------
+    # Caches the tree of the source (before it is changed by constant folding);
+    # written to a temporary file first, so that compilers running at the same time
+    # never load a half written entry. A tree that can not be written is only not cached.
+    # ----------------------------------------------------------------------------
+    def put(self, source, tree):
+        path = self.path(source_key(source))
+        temporary_file = "{}.{}.{}.tmp".format(path, os.getpid(), threading.get_ident())
+        try:
+            data = encode_tree(tree)
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temporary_file, "wb") as file:
+                file.write(data)
+            os.replace(temporary_file, path)
+        except (OSError, ValueError):
+            return
+        self.evict()
+
+    # evict() => removes the entries used least recently until the cache is no bigger than
+    # max_bytes (see evict_entries()); returns the number of entries removed.
+    def evict(self) -> int:
+        return evict_entries(self.directory, ENTRY_SUFFIX, self.max_bytes)
+
+    # size() => returns the number of entries, and the bytes they take.
+    def size(self):
+        try:
+            with os.scandir(self.directory) as directory:
+                sizes = [
+                    entry.stat().st_size for entry in directory if entry.name.endswith(ENTRY_SUFFIX)
+                ]
+        except OSError:
+            return 0, 0
+        return len(sizes), sum(sizes)
+
+    def remove(self, path):
+        remove_entry(path)
+
+
+# ----------------------------------------------------------------------------
+# Removes the entries of a cache directory (its files ending with suffix) used least recently,
+# by their modification time, until they take no more than max_bytes; returns the number of
+# entries removed. The unit cache of the incremental build (incremental.py) is bounded by it too.
+# ----------------------------------------------------------------------------
+def evict_entries(directory_path, suffix, max_bytes) -> int:
+    entries = []
+    try:
+        with os.scandir(directory_path) as directory:
+            for entry in directory:
+                if entry.name.endswith(suffix):
+                    try:
+                        status = entry.stat()
+                    except FileNotFoundError:
+                        # Removed by another compiler.
+                        continue
+                    entries.append((status.st_mtime_ns, status.st_size, entry.path))
+    except OSError:
+        return 0
+
+    size = sum(entry_size for _, entry_size, _ in entries)
+    removed = 0
+    for _, entry_size, path in sorted(entries):
+        if size <= max_bytes:
+            break
+        remove_entry(path)
+        size -= entry_size
+        removed += 1
+
+    return removed
+
+
+def remove_entry(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        # Already removed by another compiler.
+        pass
+
+
+# ----------------------------------------------------------------------------
+# Parses a file through the AST cache, twice, and prints what each time took:
+#   python ast_cache.py <filename>
+# ----------------------------------------------------------------------------
+def main(argv=None):
+    from simple_lex import get_lexer
+
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("usage: python ast_cache.py <filename>", file=sys.stderr)
+        return 2
+
+    with open(argv[0], "r") as file:
+        source = file.read()
+    cache = ASTCache()
+    for attempt in ("first", "second"):
+        start = time.perf_counter()
+        tree = cache.get(source)
+        found = tree is not None
+        if not found:
+            tree = simple_ast.parser.parse(source, lexer=get_lexer().clone())
+            if tree is None:
+                return 1
+            cache.put(source, tree)
+        print(
+            "{: >6}: {: >8.3f} ms ({})".format(
+                attempt,
+                (time.perf_counter() - start) * 1000,
+                "loaded from the cache" if found else "parsed, then cached",
+            )
+        )
+
+    entries, size = cache.size()
+    print("cache: {} entries, {:.1f} kB, in {}".format(entries, size / 1000, cache.directory))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""
+python batch_compile.py mg.f23 tedev.f23 programs/ --jobs 4 --output-dir build
+"""
+
+# This file is the batch compiler: it compiles many .f23 files (given one by one, or as
+# directories, searched for .f23 files) across a pool of worker processes.
+#
+# Every worker builds its own Compilation (see compiler.py) once, when it starts, then compiles the
+# files it is given one after the other with it. Each file gets its own output, in the output
+# directory: <name>.h for <name>.f23 (<name>-2.h, <name>-3.h... when names repeat). A report,
+# with the time taken by every file, the diagnostics of the files that failed, and the totals, is
+# printed at the end.
+#
+# With --ast-cache, the workers load the tree of a file parsed before from the AST cache (see
+# ast_cache.py), shared by all of them, instead of parsing it again.
+
+import os
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+SOURCE_SUFFIX = ".f23"
+OUTPUT_SUFFIX = ".h"
+
+# source/output => the file compiled, and the file its code was written to; ok, error => see
+# CompileResult (compiler.py); lines => lines of C generated; seconds => time taken by the worker;
+# messages => the diagnostics printed by the compiler, without its banners.
+FileResult = namedtuple(
+    "FileResult", ["source", "output", "ok", "error", "lines", "seconds", "messages"]
+)
+
+
+# find_sources(paths) => the .f23 files given as parameter, and (sorted) those in the directories.
+def find_sources(paths) -> list:
+    sources = []
+    for path in paths:
+        if not os.path.isdir(path):
+            sources.append(path)
+            continue
+        for directory, _, file_names in os.walk(path):
+            sources.extend(
+                os.path.join(directory, file_name)
+                for file_name in sorted(file_names)
+                if file_name.endswith(SOURCE_SUFFIX)
+            )
+
+    return sources
+
+
+# output_names(sources, output_directory) => the output file of each source, all different.
+def output_names(sources, output_directory) -> list:
+    outputs = []
+    taken = {}
+    for source in sources:
+        name = os.path.splitext(os.path.basename(source))[0]
+        taken[name] = taken.get(name, 0) + 1
+        if taken[name] > 1:
+            name = "{}-{}".format(name, taken[name])
+        outputs.append(os.path.join(output_directory, name + OUTPUT_SUFFIX))
+
+    return outputs
+
+
+# The Compilation of a worker, built once, before its first file.
+compilation = None
+
+
+# Builds the Compilation of a worker (with its parser and lexer, and its AST cache if ast_cache).
+def start_worker(fold=True, ast_cache=False):
+    global compilation
+    import compiler
+    from ast_cache import ASTCache
+
+    compilation = compiler.Compilation(fold, ASTCache() if ast_cache else None)
+
+
+# ----------------------------------------------------------------------------
+# Compiles one file, in a worker; writes its code to output if it compiled.
+# Returns its FileResult.
+# ----------------------------------------------------------------------------
+def compile_file(source, output, fold=True, ast_cache=False) -> FileResult:
+    import compiler
+
+    if (
+        compilation is None
+        or compilation.fold != fold
+        or (compilation.ast_cache is not None) != ast_cache
+    ):
+        start_worker(fold, ast_cache)
+
+    start = time.perf_counter()
+    try:
+        with open(source, "r") as file:
+            result = compilation.compile(file.read())
+    except OSError as error:
+        result = compiler.CompileResult(False, None, "", str(error))
+    if result.ok:
+        with open(output, "w") as file:
+            file.write(result.code)
+    seconds = time.perf_counter() - start
+
+    messages = [
+        line
+        for line in result.diagnostics.splitlines()
+        if line.strip() and not line.startswith("~")
+    ]
+    lines = result.code.count("\n") if result.ok else 0
+    return FileResult(source, output, result.ok, result.error, lines, seconds, messages)
+
+
+# ----------------------------------------------------------------------------
+# Compiles the sources given as parameter with 'jobs' worker processes;
+# returns their FileResults (in the order of the sources) and the wall time of the batch.
+# ----------------------------------------------------------------------------
+def compile_batch(sources, output_directory="build", jobs=None, fold=True, ast_cache=False):
+    jobs = jobs or os.cpu_count() or 1
+    os.makedirs(output_directory, exist_ok=True)
+    outputs = output_names(sources, output_directory)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=start_worker, initargs=(fold, ast_cache)
+    ) as pool:
+        # Files are handed out a few at a time, so small files do not wait on the pool.
+        chunk_size = max(1, len(sources) // (jobs * 4))
+        results = list(
+            pool.map(
+                compile_file,
+                sources,
+                outputs,
+                [fold] * len(sources),
+                [ast_cache] * len(sources),
+                chunksize=chunk_size,
+            )
+        )
+
+    return results, time.perf_counter() - start
+
+
+# report(results, wall_time, jobs) => returns the report of a batch.
+def report(results, wall_time, jobs) -> str:
+    lines = ["~ BATCH COMPILATION ~"]
+    for result in results:
+        lines.append(
+            "{: >6} | {: >8.4f} s | {: >6} lines | {}".format(
+                "ok" if result.ok else "FAILED", result.seconds, result.lines, result.source
+            )
+        )
+        if not result.ok:
+            lines.append("\t{}".format(result.error))
+            lines.extend("\t{}".format(message) for message in result.messages)
+
+    compiled = sum(1 for result in results if result.ok)
+    worker_time = sum(result.seconds for result in results)
+    lines.append(
+        "files: {} | compiled: {} | failed: {} | lines of C: {}".format(
+            len(results), compiled, len(results) - compiled, sum(r.lines for r in results)
+        )
+    )
+    lines.append(
+        "workers: {} | wall time: {:.3f} s | worker time: {:.3f} s | {:.1f} files/s".format(
+            jobs, wall_time, worker_time, len(results) / wall_time if wall_time else 0.0
+        )
+    )
+    return "\n".join(lines) + "\n"
+
+
+# ----------------------------------------------------------------------------
+#   python batch_compile.py <files or directories> [--jobs N] [--output-dir DIR] [--no-fold]
+#                           [--ast-cache]
+# Exits with 1 if any file failed to compile.
+# ----------------------------------------------------------------------------
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    jobs = None
+    output_directory = "build"
+    paths = []
+    arguments = iter(argv)
+    for argument in arguments:
+        if argument == "--jobs":
+            jobs = int(next(arguments))
+        elif argument == "--output-dir":
+            output_directory = next(arguments)
+        elif argument not in ("--no-fold", "--ast-cache"):
+            paths.append(argument)
+
+    sources = find_sources(paths)
+    if not sources:
+        print(
+            "usage: python batch_compile.py <files or directories> [--jobs N] "
+            "[--output-dir DIR] [--no-fold] [--ast-cache]",
+            file=sys.stderr,
+        )
+        return 2
+
+    jobs = jobs or os.cpu_count() or 1
+    results, wall_time = compile_batch(
+        sources, output_directory, jobs, "--no-fold" not in argv, "--ast-cache" in argv
+    )
+    print(report(results, wall_time, jobs))
+    return 0 if all(result.ok for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1030 @@
+# This file holds the benchmarks for the compiler.
+# Run with: "python benchmark.py" (or "make benchmark").
+
+import contextlib
+import gc
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from code_generation import CodeEmitter, lower_function
+from parse_tracing import (
+    HistogramSink,
+    JsonLinesSink,
+    RingBufferSink,
+    disable_tracing,
+    enable_tracing,
+)
+from parser_tables import build_parser
+from simple_lex import get_lexer
+from tree_walk import walk_tree
+
+
+# ----------------------------------------------------------------------------
+# Times the code emission of 'calls' print_string calls into one function: the lowering of its IR
+# to C (see lower_function()), including the single write of the generated file.
+# ----------------------------------------------------------------------------
+def bench_code_emission(calls: int) -> float:
+    from constant_pool import string_size
+    from ir import Address, Call, IRFunction, Return
+    from memory_layout import WORD_SIZE, words
+
+    # The IR ir_builder.py builds for the calls: every string constant has its own place in SMem.
+    ir_function = IRFunction("main", "integer")
+    block = ir_function.place(ir_function.new_block())
+    location = 0
+    for i in range(calls):
+        argument = '"line {}\\n"'.format(i)
+        block.instructions.append(
+            Call(None, "print_string", [Address("SMem", location, name=argument)])
+        )
+        location += words(string_size(argument)) * WORD_SIZE
+    block.terminator = Return()
+
+    emitter = CodeEmitter()
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, "yourmain.h")
+
+        start = time.perf_counter()
+        lower_function(emitter, ir_function)
+        emitter.write(file_name)
+        return time.perf_counter() - start
+
+
+# ----------------------------------------------------------------------------
+# Times the startup of the parser, with an empty table cache (cold),
+# and with the table cache written by the cold startup (warm).
+# ----------------------------------------------------------------------------
+def bench_parser_startup(repeat: int = 5):
+    import simple_ast
+
+    cold_times = []
+    warm_times = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            build_parser(simple_ast, cache_directory=directory)
+            cold_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            build_parser(simple_ast, cache_directory=directory)
+            warm_times.append(time.perf_counter() - start)
+
+    return min(cold_times), min(warm_times)
+
+
+# ----------------------------------------------------------------------------
+# Times the cold start of a new python process importing each of the modules given
+# as parameter (the best of 'repeat' runs), as every run of the compiler pays it.
+# ----------------------------------------------------------------------------
+def bench_cold_start(module_names, repeat: int = 10):
+    results = []
+    for module_name in module_names:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", "import " + module_name], check=True)
+            times.append(time.perf_counter() - start)
+        results.append((module_name, min(times)))
+
+    return results
+
+
+# ----------------------------------------------------------------------------
+# Times 'jobs' compilations of a file, each by a new compiler process
+# ("python simple_ast.py <filename> --generate"), and each by the compile daemon
+# (a new compile_client.py process per job, as a build would run it).
+# ----------------------------------------------------------------------------
+def bench_compile_daemon(jobs: int = 10, file_name="te2.f23"):
+    with tempfile.TemporaryDirectory() as directory:
+        socket_path = os.path.join(directory, "daemon.sock")
+        output = os.path.join(directory, "yourmain.h")
+        daemon = subprocess.Popen(
+            [sys.executable, "compile_daemon.py", "--socket", socket_path],
+            stdout=subprocess.PIPE,
+        )
+        try:
+            daemon.stdout.readline()  # Listening.
+
+            start = time.perf_counter()
+            for _ in range(jobs):
+                subprocess.run(
+                    [
+                        sys.executable,
+                        os.path.abspath("simple_ast.py"),
+                        os.path.abspath(file_name),
+                        "--generate",
+                    ],
+                    cwd=directory,
+                    stdout=subprocess.DEVNULL,
+                    check=True,
+                )
+            process_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(jobs):
+                subprocess.run(
+                    [
+                        sys.executable,
+                        "compile_client.py",
+                        file_name,
+                        "--socket",
+                        socket_path,
+                        "--output",
+                        output,
+                    ],
+                    stderr=subprocess.DEVNULL,
+                    check=True,
+                )
+            daemon_time = time.perf_counter() - start
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+    return process_time / jobs, daemon_time / jobs
+
+
+# ----------------------------------------------------------------------------
+# Compiles a corpus of 'files' files (mg.f23, tedev.f23 and generated programs of about 300 lines)
+# with the batch compiler, with each number of worker processes given; returns, for each,
+# the wall time of the batch and the files compiled per second.
+# ----------------------------------------------------------------------------
+def bench_batch_compile(files: int, jobs_counts):
+    from batch_compile import compile_batch
+
+    sources = [open("mg.f23").read(), open("tedev.f23").read()]
+    sources += [generate_program(300 + statements) for statements in range(0, 30, 3)]
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for i in range(files):
+            path = os.path.join(directory, "program{}.f23".format(i))
+            with open(path, "w") as file:
+                file.write(sources[i % len(sources)])
+            paths.append(path)
+
+        for jobs in jobs_counts:
+            _, wall_time = compile_batch(paths, os.path.join(directory, "build"), jobs)
+            results.append((jobs, wall_time, files / wall_time))
+
+    return results
+
+
+# ----------------------------------------------------------------------------
+# Times the parsing of a file, with tracing disabled and with each kind of sink.
+# ----------------------------------------------------------------------------
+def bench_parse_tracing(file_name="mg.f23", repeat: int = 20):
+    import simple_ast
+
+    data = open(file_name, "r").read()
+    parser = simple_ast.parser
+
+    def time_parse():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            parser.parse(data, lexer=get_lexer())
+        return (time.perf_counter() - start) / repeat
+
+    results = [("disabled", time_parse())]
+    with open(os.devnull, "w") as devnull:
+        sinks = [
+            ("ring buffer", RingBufferSink()),
+            ("json lines", JsonLinesSink(devnull)),
+            ("histogram", HistogramSink()),
+        ]
+        for name, sink in sinks:
+            enable_tracing(parser, sink)
+            results.append((name, time_parse()))
+            disable_tracing(parser)
+
+    return results
+
+
+# ----------------------------------------------------------------------------
+# Times getting the tree of a source: a full parse, a parse traced as JSON lines,
+# and a load from the AST cache; returns them with the size of the source and of
+# its cache entry. The source is mg.f23, or a generated program of 'statements' statements.
+# ----------------------------------------------------------------------------
+def bench_ast_cache(statements=None, file_name="mg.f23", repeat: int = 20):
+    import simple_ast
+    from ast_cache import ASTCache
+
+    if statements is None:
+        data = open(file_name, "r").read()
+    else:
+        data = generate_program(statements)
+    parser = simple_ast.parser
+
+    def time_get_tree(get_tree):
+        with gc_paused():
+            start = time.perf_counter()
+            for _ in range(repeat):
+                get_tree()
+            return (time.perf_counter() - start) / repeat
+
+    parse_time = time_get_tree(lambda: parser.parse(data, lexer=get_lexer()))
+    with open(os.devnull, "w") as devnull:
+        enable_tracing(parser, JsonLinesSink(devnull))
+        traced_time = time_get_tree(lambda: parser.parse(data, lexer=get_lexer()))
+        disable_tracing(parser)
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ASTCache(directory)
+        cache.put(data, parser.parse(data, lexer=get_lexer()))
+        load_time = time_get_tree(lambda: cache.get(data))
+        entry_bytes = cache.size()[1]
+
+    return len(data.encode()), entry_bytes, parse_time, traced_time, load_time
+
+
+# ----------------------------------------------------------------------------
+# Times the lexing of mg.f23 duplicated to about 'megabytes' MB:
+#   the ply lexer (token() until the end) against tokenize_all() of table_lex.py.
+# ----------------------------------------------------------------------------
+def bench_lexer(megabytes: int, file_name="mg.f23"):
+    import simple_lex
+    import table_lex
+
+    data = open(file_name, "r").read()
+    data *= max(megabytes * 1000000 // len(data), 1)
+
+    with gc_paused():
+        lexer = simple_lex.lexer.clone()
+        lexer.input(data)
+        start = time.perf_counter()
+        tokens = sum(1 for _ in iter(lexer.token, None))
+        ply_time = time.perf_counter() - start
+
+    with gc_paused():
+        start = time.perf_counter()
+        table_tokens = len(table_lex.tokenize_all(data).types)
+        table_time = time.perf_counter() - start
+
+    assert tokens == table_tokens
+    return len(data), tokens, ply_time, table_time
+
+
+# ----------------------------------------------------------------------------
+# Lexes a file of mg.f23 duplicated to about 'megabytes' MB, read at once (open().read())
+# and streamed from an mmap of it (stream_tokens()); returns, for each, the time to the first
+# token, the total time, and the peak memory allocated while lexing.
+# ----------------------------------------------------------------------------
+def bench_stream_lexer(megabytes: int, file_name="mg.f23"):
+    import simple_lex
+
+    data = open(file_name, "r").read()
+    data *= max(megabytes * 1000000 // len(data), 1)
+
+    def read_tokens(path):
+        lexer = simple_lex.lexer.clone()
+        lexer.input(open(path, "r").read())
+        return iter(lexer.token, None)
+
+    def stream_tokens(path):
+        return simple_lex.stream_tokens(simple_lex.map_source(path))
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "big.f23")
+        with open(path, "w") as file:
+            file.write(data)
+        del data
+
+        for tokenize in (read_tokens, stream_tokens):
+            with gc_paused():
+                start = time.perf_counter()
+                tokens = tokenize(path)
+                next(tokens)
+                first_time = time.perf_counter() - start
+                for _ in tokens:
+                    pass
+                total_time = time.perf_counter() - start
+
+            # Measured apart, as tracemalloc slows down every allocation.
+            tracemalloc.start()
+            for _ in tokenize(path):
+                pass
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            results.append((first_time, total_time, peak))
+
+    return results
+
+
+# ----------------------------------------------------------------------------
+# Returns the source of a valid .f23 program, whose main function is made of
+# 'statements' statements: variable definitions, assignments of expressions, and print_string calls.
+# ----------------------------------------------------------------------------
+def generate_program(statements: int) -> str:
+    lines = ["program benchmark", "{", "    function integer main()", "    {"]
+    for i in range(statements):
+        variable = "v{}".format(i - i % 3)
+        if i % 3 == 0:
+            lines.append("        integer {};".format(variable))
+        elif i % 3 == 1:
+            lines.append("        {0} := {1} + {0} * 3;".format(variable, i))
+        else:
+            lines.append('        print_string( "line {}\\n" );'.format(i))
+    lines += ["    }", "}", ""]
+
+    return "\n".join(lines)
+
+
+# ----------------------------------------------------------------------------
+# Generates a straight-line program of about 'statements' statements: in groups of three, a
+# variable set to constant arithmetic, a second one computed from it, and the printing of the
+# second, so the folding pass has constants to fold and variables to propagate.
+# ----------------------------------------------------------------------------
+def generate_arithmetic_program(statements: int) -> str:
+    groups = statements // 3
+    lines = ["program benchmark", "{", "    function integer main()", "    {"]
+    lines.append(
+        "        integer {};".format(", ".join("v{}".format(i) for i in range(2 * groups)))
+    )
+    for i in range(groups):
+        lines.append("        v{} := {} * 3 + {} % 7;".format(2 * i, i, i))
+        lines.append("        v{} := v{} * 2 - {};".format(2 * i + 1, 2 * i, i))
+        lines.append("        print_integer( v{} );".format(2 * i + 1))
+    lines += ["    }", "}", ""]
+
+    return "\n".join(lines)
+
+
+# ----------------------------------------------------------------------------
+# Generates the code of a straight-line program of constant arithmetic, with and without
+# constant folding; returns, for each, the time of the folding pass, the number of C lines
+# generated, and the F23_Time the generated code adds up to when it runs.
+# ----------------------------------------------------------------------------
+def bench_constant_folding(statements: int):
+    import simple_ast
+
+    source = generate_arithmetic_program(statements)
+    results = []
+    for fold in (False, True):
+        tree = simple_ast.parser.parse(source, lexer=get_lexer())
+        with tempfile.TemporaryDirectory() as directory:
+            working_directory = os.getcwd()
+            os.chdir(directory)
+            try:
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    start = time.perf_counter()
+                    if fold:
+                        simple_ast.Node.fold_constants(tree)
+                    fold_time = time.perf_counter() - start
+                    symbol_tables = simple_ast.Node.generate_symbol_tables(tree)
+                    simple_ast.Node.walk_tree_generate_code(tree, symbol_tables)
+                with open("yourmain.h") as file:
+                    code = file.read().splitlines()
+            finally:
+                os.chdir(working_directory)
+
+        f23_time = sum(
+            int(line.split("+=")[1].rstrip(";"))
+            for line in code
+            if line.strip().startswith("F23_Time +=")
+        )
+        results.append((fold_time, len(code), f23_time))
+
+    return results
+
+
+# ----------------------------------------------------------------------------
+# Returns the source of a program of loops over arrays, like the kernels of mg.f23: a vector filled
+# by a do loop and by a while loop, then 'passes' passes over it with a running maximum and sum.
+# ----------------------------------------------------------------------------
+def generate_loop_program(size: int, passes: int = 10) -> str:
+    return "\n".join(
+        [
+            "program loops",
+            "{",
+            "    function integer main()",
+            "    {",
+            "        integer i, j, n, total;",
+            "        double maximum, x;",
+            "        double v[{}];".format(size),
+            "        integer a[{}];".format(size),
+            "        n := {};".format(size - 1),
+            "        do ( i := 0; i <= n; i++ )",
+            "            v[i] := i * 0.5;",
+            "        i := 0;",
+            "        while ( i >= 0 && i <= n )",
+            "            a[i++] := i * 3;",
+            "        total := 0;",
+            "        maximum := 0.0;",
+            "        do ( j := 0; j < {}; j++ )".format(passes),
+            "        {",
+            "            do ( i := 0; i <= n; i++ )",
+            "            {",
+            "                x := v[i] * j;",
+            "                if ( x > maximum ) then",
+            "                    maximum := x;",
+            "                total += a[i] % 7;",
+            "            }",
+            "        }",
+            "        print_integer( total );",
+            "        print_double( maximum );",
+            "        return 0;",
+            "    }",
+            "}",
+            "",
+        ]
+    )
+
+
+# ----------------------------------------------------------------------------
+# Returns the source of a program that passes two integer arrays of 'size' elements, one sized
+# at compile time and one at run time (from the input, size - 1), to a procedure 'calls' times;
+# the procedure adds 1 to their last element, and main returns the sum of both, 2 * calls, if the
+# caller sees what the procedure wrote.
+# ----------------------------------------------------------------------------
+def generate_array_program(size: int, calls: int) -> str:
+    return "\n".join(
+        [
+            "program arrays",
+            "{",
+            "    procedure touch( integer a[], integer n )",
+            "    {",
+            "        a[n] := a[n] + 1;",
+            "    }",
+            "",
+            "    function integer main()",
+            "    {",
+            "        integer i, n, last;",
+            "        read_integer( n );",
+            "        integer v[{}], w[n + 1];".format(size),
+            "        do ( i := 0; i < {}; i++ )".format(calls),
+            "        {",
+            "            touch( v, n );",
+            "            touch( w, n );",
+            "        }",
+            "        return last := v[n] + w[n];",
+            "    }",
+            "}",
+            "",
+        ]
+    )
+
+
+# ----------------------------------------------------------------------------
+# Returns the source of a program of small vector kernels, whose inner loops run 4 times (a
+# constant): 'passes' passes (from the input) that update two vectors of 4 elements and take their
+# dot product.
+# ----------------------------------------------------------------------------
+def generate_vector_program() -> str:
+    return "\n".join(
+        [
+            "program vectors",
+            "{",
+            "    function integer main()",
+            "    {",
+            "        integer i, k, passes;",
+            "        double dot;",
+            "        double v[4], w[4];",
+            "        read_integer( passes );",
+            "        do ( i := 0; i < 4; i++ )",
+            "        {",
+            "            v[i] := i * 1.0;",
+            "            w[i] := 0.0;",
+            "        }",
+            "        do ( k := 0; k < passes; k++ )",
+            "        {",
+            "            do ( i := 0; i < 4; i++ )",
+            "            {",
+            "                v[i] := v[i] + k * 0.5;",
+            "                w[i] := w[i] + v[i];",
+            "            }",
+            "            dot := 0.0;",
+            "            do ( i := 0; i < 4; i++ )",
+            "                dot := dot + v[i] * w[i];",
+            "        }",
+            "        print_double( dot );",
+            "        return 0;",
+            "    }",
+            "}",
+            "",
+        ]
+    )
+
+
+# ----------------------------------------------------------------------------
+# Runs generated C code on the f23 virtual machine: compiles it with f23.c, with the C compiler
+# of $CC (or cc), and runs it; returns what it printed, or None if there is no C compiler.
+# ----------------------------------------------------------------------------
+def run_generated_program(code: str, stdin: str = "", timeout: float = 60):
+    compiler = os.environ.get("CC", "cc")
+    runtime = os.path.join(os.path.dirname(os.path.abspath(__file__)), "f23.c")
+    with tempfile.TemporaryDirectory() as directory:
+        # f23.c includes the yourmain.h of its own directory: both are put in the temporary one.
+        shutil.copy(runtime, directory)
+        with open(os.path.join(directory, "yourmain.h"), "w") as file:
+            file.write(code)
+        program = os.path.join(directory, "f23")
+        try:
+            subprocess.run(
+                [compiler, "-w", "-o", program, os.path.join(directory, "f23.c"), "-lm"],
+                check=True,
+                capture_output=True,
+            )
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        result = subprocess.run(
+            [program], input=stdin, capture_output=True, text=True, timeout=timeout
+        )
+
+    return result.stdout
+
+
+# f23_statistic(output, name) => a statistic printed by f23_exit ("F23_Time", "Return code"...).
+def f23_statistic(output: str, name: str):
+    for line in output.splitlines():
+        if line.strip().startswith(name):
+            return int(line.split("=")[1])
+    return None
+
+
+# run_generated_code(code, stdin, timeout) => the F23_Time of generated C code (see above).
+def run_generated_code(code: str, stdin: str = "", timeout: float = 60):
+    output = run_generated_program(code, stdin, timeout)
+    return None if output is None else f23_statistic(output, "F23_Time")
+
+
+# ----------------------------------------------------------------------------
+# Generates the code of the loop program with the variables in memory, then kept in registers;
+# returns, for each, the AllocationReport of every function, and the F23_Time of the generated
+# code when it runs (None if it cannot be run).
+# ----------------------------------------------------------------------------
+def bench_register_allocation(size: int):
+    import simple_ast
+
+    source = generate_loop_program(size)
+    results = []
+    for promote in (False, True):
+        tree = simple_ast.parser.parse(source, lexer=get_lexer())
+        simple_ast.Node.fold_constants(tree)
+        with open(os.devnull, "w") as devnull:
+            symbol_tables = simple_ast.Node.generate_symbol_tables(tree, file=devnull)
+            emitter = CodeEmitter(promote_variables=promote, optimize_loops=False)
+            simple_ast.Node.walk_tree_generate_code(
+                tree, symbol_tables, emitter=emitter, file=devnull
+            )
+        results.append((emitter.allocation_reports, run_generated_code(emitter.render())))
+
+    return results
+
+
+# ----------------------------------------------------------------------------
+# Compiles and runs the array program of 'size' elements; returns its F23_Time, which does not
+# grow with the size (the arrays are passed by reference), and its return code, which is
+# 2 * calls if the procedure wrote in the arrays of main (not in copies); (None, None) if it cannot
+# be run.
+# ----------------------------------------------------------------------------
+def bench_array_parameters(size: int, calls: int = 10):
+    import simple_ast
+
+    tree = simple_ast.parser.parse(generate_array_program(size, calls), lexer=get_lexer())
+    simple_ast.Node.fold_constants(tree)
+    with open(os.devnull, "w") as devnull:
+        symbol_tables = simple_ast.Node.generate_symbol_tables(tree, file=devnull)
+        emitter = CodeEmitter()
+        simple_ast.Node.walk_tree_generate_code(tree, symbol_tables, emitter=emitter, file=devnull)
+    output = run_generated_program(emitter.render(), stdin="{}\n".format(size - 1))
+    if output is None:
+        return None, None
+    return f23_statistic(output, "F23_Time"), f23_statistic(output, "Return code")
+
+
+# ----------------------------------------------------------------------------
+# Compiles a program without and with loop optimization, and runs it on the input given; returns,
+# for each, the LoopReport of every function, the F23_Time of the run, and what the program
+# printed (without the statistics of f23_exit); the F23_Times are None if it cannot be run.
+# ----------------------------------------------------------------------------
+def bench_loop_optimization(source: str, stdin: str = ""):
+    import simple_ast
+
+    results = []
+    for optimize in (False, True):
+        tree = simple_ast.parser.parse(source, lexer=get_lexer())
+        simple_ast.Node.fold_constants(tree)
+        with open(os.devnull, "w") as devnull:
+            symbol_tables = simple_ast.Node.generate_symbol_tables(tree, file=devnull)
+            emitter = CodeEmitter(optimize_loops=optimize)
+            simple_ast.Node.walk_tree_generate_code(
+                tree, symbol_tables, emitter=emitter, file=devnull
+            )
+        output = run_generated_program(emitter.render(), stdin)
+        if output is None:
+            results.append((emitter.loop_reports, None, None))
+        else:
+            printed = output.partition("f23_exit called")[0]
+            results.append((emitter.loop_reports, f23_statistic(output, "F23_Time"), printed))
+
+    return results
+
+
+# ----------------------------------------------------------------------------
+# Pauses the garbage collector, so that its collections (which walk through every
+# object alive, like all the nodes of a big AST) are not timed with the benchmarks.
+# ----------------------------------------------------------------------------
+@contextlib.contextmanager
+def gc_paused():
+    gc.collect()
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.enable()
+
+
+# ----------------------------------------------------------------------------
+# Returns the AST the parser makes for a program whose main function is made of
+# 'calls' print_string calls, each on a different string literal (8 nodes per call).
+# ----------------------------------------------------------------------------
+def generate_print_string_tree(calls: int):
+    from simple_ast import ConstantNode, FunctionNode, Node, ProgramNode, StatementNode
+    from node_types import (
+        EMPTY,
+        FACTOR,
+        FUNCTION_CALL,
+        FUNCTION_CALL_ARGS,
+        SCOPE_BODY,
+        TERM,
+    )
+
+    statements = []
+    for i in range(calls):
+        constant = ConstantNode(value='"line {}\\n"'.format(i), dtype="SCONSTANT")
+        argument = Node(TERM, children=Node(FACTOR, children=constant))
+        function_call = Node(
+            FUNCTION_CALL,
+            children=[
+                Node("print_string"),
+                Node(FUNCTION_CALL_ARGS, children=[argument, Node(EMPTY)]),
+            ],
+        )
+        statements.append(StatementNode(i + 1, children=function_call))
+
+    function = FunctionNode(
+        name="main",
+        return_type="integer",
+        children=[Node(EMPTY), Node(SCOPE_BODY, children=statements)],
+    )
+    return ProgramNode("benchmark", children=[function])
+
+
+# ----------------------------------------------------------------------------
+# Times the walks through an AST of 'calls' print_string calls:
+#   the bare traversal, print_tree (printing to /dev/null) and generate_symbol_tables.
+# ----------------------------------------------------------------------------
+def bench_tree_walks(calls: int):
+    from simple_ast import Node
+
+    tree = generate_print_string_tree(calls)
+    nodes = sum(1 for _ in walk_tree(tree))
+
+    with gc_paused():
+        start = time.perf_counter()
+        for _ in walk_tree(tree, enter_scope=lambda node, position, scope: position):
+            pass
+        walk_time = time.perf_counter() - start
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        with gc_paused():
+            start = time.perf_counter()
+            Node.print_tree(tree)
+            print_time = time.perf_counter() - start
+
+        with gc_paused():
+            start = time.perf_counter()
+            Node.generate_symbol_tables(tree)
+            symbol_table_time = time.perf_counter() - start
+
+    return nodes, walk_time, print_time, symbol_table_time
+
+
+# ----------------------------------------------------------------------------
+# Measures the memory held by the AST of a generated program of 'statements' statements;
+# returns the number of nodes and the bytes per node (nodes, children and their properties).
+# ----------------------------------------------------------------------------
+def bench_tree_memory(statements: int):
+    import simple_ast
+
+    data = generate_program(statements)
+    simple_ast.parser.parse(generate_program(3), lexer=get_lexer())
+
+    gc.collect()
+    tracemalloc.start()
+    tree = simple_ast.parser.parse(data, lexer=get_lexer())
+    gc.collect()
+    tree_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    nodes = sum(1 for _ in walk_tree(tree))
+    return nodes, tree_bytes / nodes
+
+
+# ----------------------------------------------------------------------------
+# Compares the AST of 'calls' print_string calls with its FlatTree:
+#   bytes per node, objects tracked by the garbage collector, and time of generate_symbol_tables.
+# ----------------------------------------------------------------------------
+def bench_flat_tree(calls: int):
+    import simple_ast
+    from flat_ast import FlatTree
+
+    results = []
+    for flat in (False, True):
+        gc.collect()
+        objects = len(gc.get_objects())
+        tracemalloc.start()
+        tree = generate_print_string_tree(calls)
+        if flat:
+            tree = FlatTree.from_tree(tree)
+        gc.collect()
+        tree_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        objects = len(gc.get_objects()) - objects
+
+        root = tree.root() if flat else tree
+        visit = tree.visit if flat else simple_ast.visit_tree
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            with gc_paused():
+                start = time.perf_counter()
+                simple_ast.Node.generate_symbol_tables(root, visit=visit)
+                symbol_table_time = time.perf_counter() - start
+
+        nodes = tree.size() if flat else sum(1 for _ in walk_tree(tree))
+        results.append((nodes, tree_bytes / nodes, objects, symbol_table_time))
+        del tree, root
+
+    return results
+
+
+# ----------------------------------------------------------------------------
+# Times the constant look-ups of code generation, for 'calls' print_string calls on
+# 'literals' distinct string literals: a scan of a list holding every literal used
+# (duplicates included) against the interned constant pool.
+# ----------------------------------------------------------------------------
+def bench_constant_lookup(calls: int, literals: int):
+    from symbol_table import SymbolTable
+    from symbol_table_properties import DATA_TYPE, VALUE
+
+    values = ['"line {}\\n"'.format(i % literals) for i in range(calls)]
+    table = SymbolTable(scope="function", scope_name="main")
+    const_list = []
+    for value in values:
+        table.put_constant("SCONSTANT", value)
+        const_list.append({DATA_TYPE: "SCONSTANT", VALUE: value})
+
+    with gc_paused():
+        start = time.perf_counter()
+        for value in values:
+            for const in const_list:
+                if const[DATA_TYPE] == "SCONSTANT" and const[VALUE] == value:
+                    pass
+        scan_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for value in values:
+            table.get_constant("SCONSTANT", value)
+        pool_time = time.perf_counter() - start
+
+    return scan_time, pool_time, table.constant_pool.size()
+
+
+# ----------------------------------------------------------------------------
+# Times 'lookups' lookups of a symbol defined 'depth' scopes up: by walking the parent tables
+# and testing each one, as the lookups did, and by the (depth, slot) pair the symbol resolves to
+# (see SymbolTable.resolve()); returns the lookups per second of each.
+# ----------------------------------------------------------------------------
+def bench_symbol_lookup(depth: int, lookups: int = 200000):
+    from symbol_table import SymbolTable
+
+    # A chain of nested scopes, with the looked up symbol defined in the outermost one.
+    table = SymbolTable(parent_table=None, scope="program", scope_name="bench")
+    table.put(symbol="counter", property_key="DATA_TYPE", property_value="integer")
+    for level in range(depth - 1):
+        table = SymbolTable(parent_table=table, scope="procedure", scope_name="p%d" % level)
+        table.put(symbol="local", property_key="DATA_TYPE", property_value="integer")
+
+    with gc_paused():
+        start = time.perf_counter()
+        for _ in range(lookups):
+            current = table
+            while current is not None and not current.is_present("counter"):
+                current = current.parent_table
+            current.get("counter")
+        walk_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(lookups):
+            table.get_resolved(table.resolve("counter"))
+        resolve_time = time.perf_counter() - start
+
+    return lookups / walk_time, lookups / resolve_time
+
+
+def main(sizes):
+    print("~ TREE WALKS (print_string calls, 8 nodes per call) ~")
+    for calls in (31250, 62500, 125000):
+        nodes, walk_time, print_time, symbol_table_time = bench_tree_walks(calls)
+        print(
+            "nodes: {: >8} | walk: {: >7.3f} s | print_tree: {: >7.3f} s | symbol tables: {: >7.3f} s".format(
+                nodes, walk_time, print_time, symbol_table_time
+            )
+        )
+    print()
+
+    print("~ AST MEMORY (generated program) ~")
+    for statements in (1500, 3000, 6000):
+        nodes, bytes_per_node = bench_tree_memory(statements)
+        print(
+            "statements: {: >6} | nodes: {: >7} | bytes per node: {: >6.1f}".format(
+                statements, nodes, bytes_per_node
+            )
+        )
+    print()
+
+    print("~ FLAT TREE (print_string calls, 8 nodes per call) ~")
+    layouts = ("Node objects", "FlatTree")
+    for layout, results in zip(layouts, bench_flat_tree(62500)):
+        nodes, bytes_per_node, objects, symbol_table_time = results
+        print(
+            "{: >12} | nodes: {: >6} | bytes per node: {: >6.1f} | gc objects: {: >6} | symbol tables: {: >7.4f} s".format(
+                layout, nodes, bytes_per_node, objects, symbol_table_time
+            )
+        )
+    print()
+
+    print("~ CONSTANT FOLDING (straight-line arithmetic) ~")
+    for statements in (300, 3000):
+        for folded, results in zip(("off", "on"), bench_constant_folding(statements)):
+            fold_time, lines, f23_time = results
+            print(
+                "statements: {: >5} | folding: {: >3} | pass: {: >7.4f} s | C lines: {: >6} | F23_Time: {: >8}".format(
+                    statements, folded, fold_time, lines, f23_time
+                )
+            )
+    print()
+
+    print("~ REGISTER ALLOCATION (loops over arrays, run on f23.c) ~")
+    for size in (100, 1000):
+        memory, registers = bench_register_allocation(size)
+        for name, report in registers[0].items():
+            print(
+                "size: {: >5} | {: <6} | memory accesses: {: >4} -> {: >4} | F23_Time: {} -> {}".format(
+                    size,
+                    name,
+                    memory[0][name].memory_after,
+                    report.memory_after,
+                    "n/a" if memory[1] is None else memory[1],
+                    "n/a" if registers[1] is None else registers[1],
+                )
+            )
+    print()
+
+    print("~ ARRAY PARAMETERS (passed by reference, run on f23.c) ~")
+    calls = 10
+    for size in (10, 1000, 100000):
+        f23_time, return_code = bench_array_parameters(size, calls)
+        print(
+            "size: {: >6} | calls: {: >3} | F23_Time: {: >6} | callee writes seen by main: {}".format(
+                size,
+                2 * calls,
+                "n/a" if f23_time is None else f23_time,
+                "n/a" if return_code is None else return_code == 2 * calls,
+            )
+        )
+    print()
+
+    print("~ LOOP OPTIMIZATION (mg.f23 and vector kernels, run on f23.c) ~")
+    with open("mg.f23", "r") as file:
+        mg_source = file.read()
+    for name, source, stdin in (
+        ("mg.f23", mg_source, "64\n"),
+        ("mg.f23", mg_source, "1024\n"),
+        ("vectors", generate_vector_program(), "1000\n"),
+    ):
+        before, after = bench_loop_optimization(source, stdin)
+        reports = after[0].values()
+        print(
+            "{: <8} | input: {: <8} | unrolled: {} | hoisted: {: >2} | pointers: {: >2} | reduced: {: >2} | F23_Time: {} -> {} | same output: {}".format(
+                name,
+                stdin.strip(),
+                sum(report.unrolled for report in reports),
+                sum(report.hoisted for report in reports),
+                sum(report.pointers for report in reports),
+                sum(report.reduced for report in reports),
+                "n/a" if before[1] is None else before[1],
+                "n/a" if after[1] is None else after[1],
+                "n/a" if after[1] is None else before[2] == after[2],
+            )
+        )
+    print()
+
+    print("~ CONSTANT LOOKUP (print_string calls) ~")
+    for calls, literals in ((2000, 2000), (2000, 20), (4000, 20)):
+        scan_time, pool_time, constants = bench_constant_lookup(calls, literals)
+        print(
+            "calls: {: >5} | literals: {: >5} | list scan: {: >8.4f} s | pool: {: >8.4f} s | pooled: {: >5}".format(
+                calls, literals, scan_time, pool_time, constants
+            )
+        )
+    print()
+
+    print("~ SYMBOL LOOKUP (symbol defined in the outermost scope) ~")
+    for depth in (1, 4, 16, 64):
+        walk_rate, resolve_rate = bench_symbol_lookup(depth)
+        print(
+            "depth: {: >3} | parent walk: {: >10.0f} lookups/s | resolved: {: >10.0f} lookups/s".format(
+                depth, walk_rate, resolve_rate
+            )
+        )
+    print()
+
+    print("~ LEXER (mg.f23 duplicated) ~")
+    for megabytes in (5, 50):
+        size, tokens, ply_time, table_time = bench_lexer(megabytes)
+        print(
+            "size: {: >5.1f} MB | tokens: {: >8} | ply: {: >7.3f} s | table_lex: {: >7.3f} s | speedup: {: >4.1f}x".format(
+                size / 1e6, tokens, ply_time, table_time, ply_time / table_time
+            )
+        )
+    print()
+
+    print("~ STREAMING LEXER (mg.f23 duplicated to 20 MB) ~")
+    modes = ("read at once", "mmap stream")
+    for mode, results in zip(modes, bench_stream_lexer(20)):
+        first_time, total_time, peak = results
+        print(
+            "{: >12} | first token: {: >8.4f} s | total: {: >7.3f} s | peak memory: {: >7.1f} MB".format(
+                mode, first_time, total_time, peak / 1e6
+            )
+        )
+    print()
+
+    print("~ PARSE TRACING (mg.f23) ~")
+    for name, elapsed in bench_parse_tracing():
+        print("tracing: {: >12} | parse: {: >9.4f} s".format(name, elapsed))
+    print()
+
+    print("~ AST CACHE (parse against load from the cache) ~")
+    for statements in (None, 300, 3000):
+        source_bytes, entry_bytes, parse_time, traced_time, load_time = bench_ast_cache(statements)
+        print(
+            "{: >16} | source: {: >6.1f} kB | entry: {: >5.1f} kB | parse: {: >8.4f} s | traced parse: {: >8.4f} s | load: {: >8.4f} s | {: >4.1f}x".format(
+                "mg.f23" if statements is None else "{} statements".format(statements),
+                source_bytes / 1000,
+                entry_bytes / 1000,
+                parse_time,
+                traced_time,
+                load_time,
+                parse_time / load_time,
+            )
+        )
+    print()
+
+    print("~ COLD START (new python process) ~")
+    for module_name, elapsed in bench_cold_start(["simple_lex", "simple_ast"]):
+        print("import {: >10} | {: >8.4f} s".format(module_name, elapsed))
+    print()
+
+    print("~ COMPILE DAEMON (te2.f23, one process per job) ~")
+    process_time, daemon_time = bench_compile_daemon()
+    print(
+        "compiler process: {: >8.4f} s per job | daemon client: {: >8.4f} s per job".format(
+            process_time, daemon_time
+        )
+    )
+    print()
+
+    print("~ BATCH COMPILATION (300 files) ~")
+    for jobs, wall_time, rate in bench_batch_compile(300, sorted({1, 2, os.cpu_count() or 1})):
+        print(
+            "workers: {: >3} | wall time: {: >7.3f} s | {: >7.1f} files/s".format(
+                jobs, wall_time, rate
+            )
+        )
+    print()
+
+    print("~ PARSER STARTUP ~")
+    cold, warm = bench_parser_startup()
+    print("cold cache: {: >9.4f} s | warm cache: {: >9.4f} s".format(cold, warm))
+    print()
+
+    print("~ CODE EMISSION (print_string calls) ~")
+    for calls in sizes:
+        elapsed = bench_code_emission(calls)
+        print(
+            "calls: {: >8} | total: {: >9.4f} s | per call: {: >7.3f} us".format(
+                calls, elapsed, elapsed / calls * 1e6
+            )
+        )
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 20000, 40000, 80000]
+    main(sizes)
@@ -0,0 +1,246 @@
+"""
+python benchmark_suite.py --repeat 5
+"""
+
+# This file is the benchmark suite of the compiler phases: every benchmark is a synthetic program
+# (see f23_generator.py) compiled phase by phase (lexing, parsing, constant folding, symbol tables,
+# code generation), with every phase timed on its own. The parser is given the tokens lexed
+# before, so that parsing is timed without lexing. Each phase is run 'repeat' times, with the
+# garbage collector paused, and its best time is kept.
+#
+# Every run is appended to a history file, one JSON object per benchmark and line (see
+# history_record()), with the commit it ran on; a phase slower than in the last run of the same
+# benchmark, on the same machine and python, by more than the threshold is reported as a
+# regression (and, with --fail-on-regression, makes the suite exit with 1).
+
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import simple_ast
+from benchmark import gc_paused
+from code_generation import CodeEmitter
+from f23_generator import ProgramShape, generate_program
+from phase_profile import ReplayLexer
+from simple_lex import get_lexer
+from tree_walk import walk_tree
+
+HISTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_history.jsonl")
+
+# A phase slower than in the last run by more than this is a regression.
+REGRESSION_THRESHOLD = 0.10
+
+PHASES = ("lex", "parse", "fold", "symbol tables", "generate code")
+
+# name => the shape of its program; each one scales one parameter of the generator.
+BENCHMARKS = {
+    "baseline": ProgramShape(procedures=8, depth=2, statements=3, expression_length=4, arrays=1),
+    "procedures": ProgramShape(
+        procedures=128, depth=2, statements=3, expression_length=4, arrays=1
+    ),
+    "nesting": ProgramShape(procedures=8, depth=12, statements=3, expression_length=4, arrays=1),
+    "expressions": ProgramShape(
+        procedures=8, depth=2, statements=3, expression_length=48, arrays=1
+    ),
+    "arrays": ProgramShape(procedures=8, depth=2, statements=12, expression_length=4, arrays=16),
+}
+
+
+# ----------------------------------------------------------------------------
+# Compiles the source given as parameter phase by phase, 'repeat' times; returns the best time
+# of every phase (name => seconds), and the size of what the phases handled (tokens, nodes,
+# symbols, lines of C).
+# ----------------------------------------------------------------------------
+def time_phases(source, repeat=5):
+    best = {phase: float("inf") for phase in PHASES}
+    with open(os.devnull, "w") as devnull:
+        for _ in range(repeat):
+            times = {}
+            with gc_paused():
+                start = time.perf_counter()
+                lexer = get_lexer().clone()
+                lexer.input(source)
+                tokens = list(iter(lexer.token, None))
+                times["lex"] = time.perf_counter() - start
+
+                start = time.perf_counter()
+                tree = simple_ast.parser.parse(lexer=ReplayLexer(tokens))
+                times["parse"] = time.perf_counter() - start
+
+                start = time.perf_counter()
+                simple_ast.Node.fold_constants(tree)
+                times["fold"] = time.perf_counter() - start
+
+                start = time.perf_counter()
+                symbol_tables = simple_ast.Node.generate_symbol_tables(tree, file=devnull)
+                times["symbol tables"] = time.perf_counter() - start
+
+                start = time.perf_counter()
+                emitter = CodeEmitter()
+                simple_ast.Node.walk_tree_generate_code(
+                    tree, symbol_tables, emitter=emitter, file=devnull
+                )
+                code = emitter.render()
+                times["generate code"] = time.perf_counter() - start
+
+            for phase, seconds in times.items():
+                best[phase] = min(best[phase], seconds)
+
+    sizes = {
+        "bytes": len(source.encode()),
+        "tokens": len(tokens),
+        "nodes": sum(1 for _ in walk_tree(tree)),
+        "symbols": sum(table.size() for table in symbol_tables.values()),
+        "lines": code.count("\n"),
+    }
+    return best, sizes
+
+
+# current_commit() => the short hash of the commit the suite runs on, or None outside of git.
+def current_commit():
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+        )
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+# history_record(name, shape, seconds, sizes, repeat, commit) => the line of a benchmark run.
+def history_record(name, shape, seconds, sizes, repeat, commit):
+    return {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "machine": platform.node() + " " + platform.machine(),
+        "benchmark": name,
+        "shape": shape._asdict(),
+        "repeat": repeat,
+        "sizes": sizes,
+        "seconds": seconds,
+    }
+
+
+# read_history(file_name) => the records of the history file, oldest first (none if it is missing).
+def read_history(file_name):
+    records = []
+    try:
+        with open(file_name, "r") as file:
+            for line in file:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue  # A line cut by an interrupted run.
+    except OSError:
+        pass
+    return records
+
+
+# ----------------------------------------------------------------------------
+# Returns the last record of the history comparable to the one given as parameter:
+# the same benchmark and program shape, run on the same machine and python; None if none is.
+# ----------------------------------------------------------------------------
+def previous_record(history, record):
+    for old in reversed(history):
+        if all(old.get(key) == record[key] for key in ("benchmark", "shape", "python", "machine")):
+            return old
+    return None
+
+
+# ----------------------------------------------------------------------------
+# Runs the benchmarks named (all of them by default), and appends their records to the history
+# file (unless it is None); returns the report, and the regressions found ("benchmark: phase").
+# ----------------------------------------------------------------------------
+def run_suite(names=None, repeat=5, history_file=HISTORY_FILE, threshold=REGRESSION_THRESHOLD):
+    history = read_history(history_file) if history_file else []
+    commit = current_commit()
+    records = []
+    regressions = []
+    lines = ["~ BENCHMARK SUITE (best of {}, in ms) ~".format(repeat)]
+    lines.append(
+        "{: <12} {: >8} {: >8} ".format("benchmark", "tokens", "nodes")
+        + " ".join("{: >14}".format(phase) for phase in PHASES)
+    )
+
+    for name in names or BENCHMARKS:
+        shape = BENCHMARKS[name]
+        seconds, sizes = time_phases(generate_program(shape), repeat)
+        record = history_record(name, shape, seconds, sizes, repeat, commit)
+        records.append(record)
+
+        old = previous_record(history, record)
+        cells = []
+        for phase in PHASES:
+            cell = "{:.3f}".format(seconds[phase] * 1000)
+            if old and old["seconds"].get(phase):
+                change = seconds[phase] / old["seconds"][phase] - 1
+                cell += " {:+.0%}".format(change)
+                if change > threshold:
+                    cell += "!"
+                    regressions.append("{}: {}".format(name, phase))
+            cells.append("{: >14}".format(cell))
+        lines.append(
+            "{: <12} {: >8} {: >8} ".format(name, sizes["tokens"], sizes["nodes"]) + " ".join(cells)
+        )
+
+    if history_file:
+        with open(history_file, "a") as file:
+            for record in records:
+                file.write(json.dumps(record, sort_keys=True) + "\n")
+        lines.append("history: {} (commit {})".format(history_file, commit))
+    if regressions:
+        lines.append(
+            "regressions (over {:.0%} slower than the last run): {}".format(
+                threshold, ", ".join(regressions)
+            )
+        )
+    return "\n".join(lines) + "\n", regressions
+
+
+# ----------------------------------------------------------------------------
+#   python benchmark_suite.py [benchmarks] [--repeat N] [--history FILE] [--no-history]
+#                             [--threshold PERCENT] [--fail-on-regression]
+# ----------------------------------------------------------------------------
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    names = []
+    repeat = 5
+    history_file = HISTORY_FILE
+    threshold = REGRESSION_THRESHOLD
+    arguments = iter(argv)
+    for argument in arguments:
+        if argument == "--repeat":
+            repeat = int(next(arguments))
+        elif argument == "--history":
+            history_file = next(arguments)
+        elif argument == "--no-history":
+            history_file = None
+        elif argument == "--threshold":
+            threshold = float(next(arguments)) / 100
+        elif argument in BENCHMARKS:
+            names.append(argument)
+        elif argument != "--fail-on-regression":
+            print(
+                "usage: python benchmark_suite.py [{}] [--repeat N] [--history FILE] "
+                "[--no-history] [--threshold PERCENT] [--fail-on-regression]".format(
+                    " | ".join(BENCHMARKS)
+                ),
+                file=sys.stderr,
+            )
+            return 2
+
+    report, regressions = run_suite(names, repeat, history_file, threshold)
+    print(report)
+    return 1 if regressions and "--fail-on-regression" in argv else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+# This file holds the checks of the compiler: each one compiles programs (the .f23 samples, or
+# small programs written for it) and compares what it gets with what it should get.
+# Run with: "python check.py" (or "make check"); it exits with 1 if any check fails.
+
+import io
+import sys
+
+from benchmark import run_generated_program
+from code_generation import CodeEmitter
+from compiler import Compilation
+from flat_ast import FlatTree
+from node_types import STATEMENT
+from simple_ast import CompileError, Node
+from tree_walk import walk_tree
+
+
+# Raised by a check when what it gets is not what it should; its message says what differs.
+class CheckFailed(Exception):
+    pass
+
+
+# Raised by a check that can not run here (a program is run on f23.c, and there is no C compiler).
+class CheckSkipped(Exception):
+    pass
+
+
+# read_source(file_name) => the source of a .f23 file.
+def read_source(file_name: str) -> str:
+    with open(file_name) as file:
+        return file.read()
+
+
+# is_statement(child) => whether a child of a node is a statement node (not a token).
+def is_statement(child):
+    return getattr(child, "type", None) == STATEMENT
+
+
+# parse(source) => the AST of the source, with its constants folded unless fold is False.
+def parse(source: str, fold=True):
+    node = Compilation().parse(source)
+    if node is None:
+        raise CheckFailed("syntax error")
+    if fold:
+        Node.fold_constants(node)
+    return node
+
+
+# ----------------------------------------------------------------------------
+# Returns what the visitors of the symbol table and code generation walks give for a tree:
+# what they print (with the symbol tables), and the code generated. flat walks the FlatTree of
+# the tree instead of its Node objects.
+# ----------------------------------------------------------------------------
+def walk_visitors(node, flat=False):
+    printed = io.StringIO()
+    visit = {}
+    if flat:
+        tree = FlatTree.from_tree(node)
+        node = tree.root()
+        visit = {"visit": tree.visit}
+
+    symbol_tables = Node.generate_symbol_tables(node, file=printed, **visit)
+    for symbol_table in symbol_tables.values():
+        print(symbol_table, file=printed)
+    emitter = CodeEmitter()
+    Node.walk_tree_generate_code(node, symbol_tables, emitter=emitter, file=printed, **visit)
+
+    return printed.getvalue(), emitter.render()
+
+
+# ----------------------------------------------------------------------------
+# The visitors give the same symbol tables and code whether they walk the Node objects of a
+# sample or its FlatTree (flat_ast.py), whose statements have the lines of their nodes; with
+# and without constant folding, so the assignments resolved in the symbol tables (and the
+# expressions they record) are both constants and whole expressions.
+# ----------------------------------------------------------------------------
+def check_flat_tree(file_names=("mg.f23", "tedev.f23")):
+    for file_name in file_names:
+        source = read_source(file_name)
+        node = parse(source)
+        lines = [child.lineno for child, _, _ in walk_tree(node) if is_statement(child)]
+        tree = FlatTree.from_tree(node)
+        flat_lines = [
+            tree.lineno[index] for index in range(tree.size()) if tree.types[index] == STATEMENT
+        ]
+        if not all(lines) or flat_lines != lines:
+            raise CheckFailed(
+                "{}: the statements of the flat tree lost their lines".format(file_name)
+            )
+
+        for fold in (True, False):
+            printed, code = walk_visitors(parse(source, fold))
+            flat_printed, flat_code = walk_visitors(parse(source, fold), flat=True)
+            folded = "" if fold else " (not folded)"
+            if flat_printed != printed:
+                raise CheckFailed(
+                    "{}{}: the symbol tables differ on the flat tree".format(file_name, folded)
+                )
+            if flat_code != code:
+                raise CheckFailed(
+                    "{}{}: the code generated differs on the flat tree".format(file_name, folded)
+                )
+
+
+# ----------------------------------------------------------------------------
+# Returns the code generated for a tree (whose symbol tables are not built yet), with the
+# variables kept in registers or not, and its loops optimized or not (see CodeEmitter).
+# ----------------------------------------------------------------------------
+def generate_code(node, promote_variables=True, optimize_loops=True) -> str:
+    printed = io.StringIO()
+    symbol_tables = Node.generate_symbol_tables(node, file=printed)
+    emitter = CodeEmitter(promote_variables=promote_variables, optimize_loops=optimize_loops)
+    Node.walk_tree_generate_code(node, symbol_tables, emitter=emitter, file=printed)
+    return emitter.render()
+
+
+# run_program(code, stdin) => what generated code prints when it runs on f23.c, up to the
+# statistics of f23_exit; raises CheckSkipped if there is no C compiler to build it.
+def run_program(code: str, stdin: str = "") -> str:
+    output = run_generated_program(code, stdin)
+    if output is None:
+        raise CheckSkipped("no C compiler ($CC or cc) to run f23.c")
+    return output.partition("\n\nf23_exit called")[0]
+
+
+# A program whose procedures write into the arrays they are given: fill writes every element of an
+# integer and a double array, twice passes its own array parameters on to fill and then writes
+# them too, poke writes the first element of the only array it is given. main gives them arrays of
+# a size known at compile time, and sized at run time, and prints what first (also given an array
+# only) returns.
+ARRAY_PARAMETERS_PROGRAM = """
+program arrays
+{
+    procedure fill( integer a[], integer n, double d[] )
+    {
+        integer i;
+        do ( i := 0; i < n; i++ )
+        {
+            a[i] := i * i;
+            d[i] := i * 0.5;
+        }
+    }
+
+    procedure twice( integer a[], integer n, double d[] )
+    {
+        fill( a, n, d );
+        a[n - 1] := a[n - 1] * 2;
+        d[0] := -1.0;
+    }
+
+    procedure poke( integer a[] )
+    {
+        a[0] := a[0] + 100;
+    }
+
+    function integer first( integer a[] )
+    {
+        integer r;
+        return r := a[0] + a[1];
+    }
+
+    function integer main()
+    {
+        integer i, m, n, s;
+        read_integer( n );
+        m := 4;
+        integer v[4], w[n];
+        double x[4], y[n];
+        fill( v, m, x );
+        twice( w, n, y );
+        poke( w );
+        s := first( w );
+        do ( i := 0; i < m; i++ )
+        {
+            print_integer( v[i] );
+            print_string( " " );
+            print_double( x[i] );
+            print_string( "\\n" );
+        }
+        do ( i := 0; i < n; i++ )
+        {
+            print_integer( w[i] );
+            print_string( " " );
+            print_double( y[i] );
+            print_string( "\\n" );
+        }
+        print_integer( s );
+        print_string( "\\n" );
+        return 0;
+    }
+}
+"""
+
+
+# ----------------------------------------------------------------------------
+# Arrays are passed by reference: main sees every element the procedures wrote into its arrays,
+# whether their size is known at compile time or not, with the variables in registers or not.
+# ----------------------------------------------------------------------------
+def check_array_parameters(n: int = 6):
+    values = [(i * i, i * 0.5) for i in range(4)]
+    written = [(i * i, i * 0.5) for i in range(n)]
+    written[0] = (100, -1.0)
+    written[n - 1] = (2 * (n - 1) * (n - 1), (n - 1) * 0.5)
+    values += written
+    # As print_int and print_double of f23.c print them.
+    expected = "".join("{} {:22.15e}\n".format(integer, double) for integer, double in values)
+    expected += "{}\n".format(100 + 1)
+
+    for promote_variables in (True, False):
+        for optimize_loops in (True, False):
+            code = generate_code(parse(ARRAY_PARAMETERS_PROGRAM), promote_variables, optimize_loops)
+            printed = run_program(code, "{}\n".format(n))
+            if printed != expected:
+                raise CheckFailed(
+                    "main sees {!r} in its arrays instead of {!r} (registers: {}, loops: {})".format(
+                        printed, expected, promote_variables, optimize_loops
+                    )
+                )
+
+
+# The samples, with what they read (mg.f23 and tedev.f23 read the size of the fine mesh); None for a
+# sample that is only compiled: the while loop of almountassir.f23 never changes i, so it never ends.
+SAMPLES = {
+    "te1.f23": "",
+    "te2.f23": "",
+    "mg.f23": "64\n",
+    "tedev.f23": "64\n",
+    "almountassir.f23": None,
+}
+
+
+# ----------------------------------------------------------------------------
+# Every sample prints the same whatever the compiler is asked to do: with its constants folded or
+# not, its variables in registers or not, its loops optimized or not (the flags "--no-fold",
+# "--no-registers" and "--no-loop-optimization" of simple_ast.py).
+# ----------------------------------------------------------------------------
+def check_samples(samples=SAMPLES):
+    for file_name, stdin in samples.items():
+        source = read_source(file_name)
+        expected = None
+        for fold in (True, False):
+            for promote_variables in (True, False):
+                for optimize_loops in (True, False):
+                    code = generate_code(parse(source, fold), promote_variables, optimize_loops)
+                    if stdin is None:
+                        continue
+                    printed = run_program(code, stdin)
+                    if expected is None:
+                        expected = printed
+                    elif printed != expected:
+                        raise CheckFailed(
+                            "{} prints something else with (folded: {}, registers: {}, loops: {}) "
+                            "than with all three".format(
+                                file_name, fold, promote_variables, optimize_loops
+                            )
+                        )
+
+
+CHECKS = [
+    check_flat_tree,
+    check_array_parameters,
+    check_samples,
+]
+
+
+def main():
+    failed = 0
+    for check in CHECKS:
+        try:
+            check()
+        except (CheckFailed, CompileError) as failure:
+            failed += 1
+            print("{: <24} FAILED: {}".format(check.__name__, failure))
+        except CheckSkipped as reason:
+            print("{: <24} skipped: {}".format(check.__name__, reason))
+        else:
+            print("{: <24} ok".format(check.__name__))
+
+    print("{} of {} checks failed".format(failed, len(CHECKS)) if failed else "all checks passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,28 @@
 # This file holds the functions that generate code WHILE PARSING.
 
-import os
-
-from node_types import *
+from ir import (
+    DOUBLE,
+    NEGATED_COMPARISONS,
+    Address,
+    AddressOf,
+    Allocate,
+    Binary,
+    Branch,
+    Call,
+    Constant,
+    Convert,
+    Copy,
+    Invoke,
+    Jump,
+    Load,
+    Negate,
+    Return,
+    Store,
+    VirtualRegister,
+)
+from loop_optimization import optimize_loops
+from memory_layout import CONSTANTS_SCOPE, ENTRY_FUNCTION
+from register_allocation import allocate_registers
 
 # ------------------------------------------------
 # A dictionary of the translations from .f23 to .c
@@ -25,53 +45,283 @@ def translate(input_code: str) -> str:
     return input_code
 
 
-def generate_code_function(node):
-    function_name = translate(node.meta.name)
-    function_return_type = translate(node.meta.return_type)
+# Access times (F23_Time) of the generated code:
+#   a load from, or a store to, memory (Mem, FMem, SMem);
+#   an operation on registers (a constant loaded, an arithmetic operation);
+#   a call of a built in function.
+MEMORY_ACCESS_TIME = 20
+REGISTER_TIME = 1
+FUNCTION_CALL_TIME = 100
 
-    generated_code = "{} {}(){{\n\treturn 0;\n}}".format(
-        function_return_type,
-        function_name,
-    )
+# Access time of entering a stack frame, or of leaving it: the FR of the caller saved (or loaded
+# back), and FR and SR set.
+FRAME_TIME = MEMORY_ACCESS_TIME + 2 * REGISTER_TIME
+
+# ----------------------------------------------------------------------------
+# Collects the generated C code in memory, instead of rewriting yourmain.h per snippet.
+# Each function gets its own instruction buffer (a list of C lines);
+# the buffers are joined once, and the file is written in one call, by write().
+# ----------------------------------------------------------------------------
+class CodeEmitter:
+    # promote_variables => keep the variables of the functions in registers where it can
+    # (see register_allocation.py); otherwise they stay in memory, and only expressions use
+    # registers. optimize_loops => optimize the loops of the functions whose variables are kept in
+    # registers (see loop_optimization.py).
+    def __init__(self, promote_variables=True, optimize_loops=True):
+        self.promote_variables = promote_variables
+        self.optimize_loops = optimize_loops
+
+        # function name => [return type, [C lines]]; dicts keep insertion (declaration) order.
+        self.functions = {}
+
+        # C lines run once, at the start of the entry function (static data set up).
+        self.prologue = []
+
+        # function name => the IRFunction its C lines were lowered from (see lower_function()),
+        # the AllocationReport of its registers, and the LoopReport of its loops.
+        self.ir_functions = {}
+        self.allocation_reports = {}
+        self.loop_reports = {}
+
+    # begin_function(name, return_type) => opens an empty instruction buffer for a function.
+    def begin_function(self, name, return_type):
+        if name not in self.functions:
+            self.functions[name] = [return_type, []]
 
-    write_code(code_string=generated_code)
+    # emit(name, line) => appends a line of C code to the buffer of the function given as parameter.
+    def emit(self, name, line):
+        self.functions[name][1].append(line)
 
+    # emit_prologue(line) => appends a line of C code to the prologue.
+    def emit_prologue(self, line):
+        self.prologue.append(line)
 
-def generate_code_function_call(call_type: str, argument: str, mem_location: str):
-    copy_string_line = "strcpy(&SMem[{}], {});\n\t".format(mem_location, argument)
+    # render() => returns the whole generated C file, as a string.
+    # Every function is an int function of C without parameters: the arguments and the values
+    # returned go through the stack of f23.c (see memory_layout.py), only main returns the exit
+    # code to f23.c. They are declared first, as they may be called before they are defined.
+    def render(self) -> str:
+        generated_code = [
+            "int {}();\n".format(translate(name))
+            for name in self.functions
+            if name != ENTRY_FUNCTION
+        ]
+        for name, (return_type, lines) in self.functions.items():
+            generated_code.append("int {}(){{\n".format(translate(name)))
+            if name == ENTRY_FUNCTION:
+                generated_code.extend("\t{}\n".format(line) for line in self.prologue)
+            generated_code.extend("\t{}\n".format(line) for line in lines)
+            generated_code.append("\treturn 0;\n}\n")
 
-    print_constant_line = "{}(&SMem[{}]);\n\t".format(call_type, mem_location)
+        return "".join(generated_code)
+
+    # write(file_name) => writes the generated C file, once.
+    def write(self, file_name="yourmain.h"):
+        write_code(code_string=self.render(), file_name=file_name)
+
+
+# ----------------------------------------------------------------------------
+# Emits the prologue: allocates the static data block given by the memory layout,
+# then copies every string constant into its place in SMem, once.
+# ----------------------------------------------------------------------------
+def generate_code_static_data(emitter: CodeEmitter, layout):
+    if layout.size() == 0:
+        return
+
+    # The first block of the heap starts at layout.base (see memory_layout.py).
+    emitter.emit_prologue("allocate_in_Mem({});".format(layout.size()))
+
+    string_constants = layout.scopes.get(CONSTANTS_SCOPE, ())
+    for value, memory, location, size, register in string_constants:
+        emitter.emit_prologue("strcpy(&SMem[{}], {});".format(location, value))
 
     # Access Time:
-    #   20 for SMem allocation of constant.
-    #   100 for print_string function call.
-    access_time = 20 + 100
-    access_time_line = "F23_Time += {};\n\t".format(str(access_time))
+    #   20 for SMem allocation of each constant.
+    if string_constants:
+        access_time = MEMORY_ACCESS_TIME * len(string_constants)
+        emitter.emit_prologue("F23_Time += {};".format(str(access_time)))
 
-    generated_code = copy_string_line + print_constant_line + access_time_line
 
-    write_code(code_string=generated_code)
+# ----------------------------------------------------------------------------
+# Lowers a function of the IR (see ir.py) to C, into the buffer of the function: the blocks are
+# written in their layout order, each with a label if a jump goes to it; a jump to the next block
+# is left out, as is the branch to it of a conditional branch (the comparison is negated instead).
+# Every block adds its access time to F23_Time once, before its terminator.
+# The registers are allocated first (see register_allocation.py), once its loops are optimized
+# (see loop_optimization.py). A function that uses its stack
+# frame (its variables, or the record of a function it calls) enters it first: the FR of the caller
+# is saved in the top word of its record, FR points to that word and SR below the frame; both are
+# set back before every return (which also gives back the arrays it allocated on the stack).
+# ----------------------------------------------------------------------------
+def lower_function(emitter: CodeEmitter, ir_function):
+    emitter.begin_function(name=ir_function.name, return_type=ir_function.return_type)
+    registers, report = allocate_registers(
+        ir_function,
+        instruction_time,
+        promote=emitter.promote_variables,
+        optimize=optimize_loops if emitter.optimize_loops else None,
+    )
+    emitter.ir_functions[ir_function.name] = ir_function
+    emitter.allocation_reports[ir_function.name] = report
+    if report.optimization is not None:
+        emitter.loop_reports[ir_function.name] = report.optimization
+    blocks = ir_function.blocks
 
+    # The top word of the record, below the words pushed by the caller (see memory_layout.py).
+    record = 1 + (ir_function.frame.pushed_words() if ir_function.frame is not None else 0)
+    uses_frame = any(
+        isinstance(instruction, (Invoke, Allocate))
+        or any(
+            isinstance(value, Address) and value.register is not None
+            for value in instruction.operands()
+        )
+        for block in blocks
+        for instruction in block.instructions + [block.terminator]
+    )
+    if uses_frame:
+        emitter.emit(ir_function.name, "Mem[SR - {}] = FR;".format(record))
+        emitter.emit(ir_function.name, "FR = SR - {};".format(record))
+        emitter.emit(ir_function.name, "SR = FR - {};".format(ir_function.frame_size))
+        emitter.emit(ir_function.name, "F23_Time += {};".format(FRAME_TIME))
 
-def write_code(code_string: str):
-    # ----------------------------------------------------------------------------------------
-    # Check if the C file is empty or not:
-    #   If empty, use the "w" flag to write.
-    #   If NOT empty, use the "a" flag to append to the file and not replace existing content.
-    # ----------------------------------------------------------------------------------------
-    if os.path.getsize("yourmain.h") == 0:
-        with open("yourmain.h", "w") as file:
-            file.write(code_string)
+    # The blocks jumped to, other than by falling through to them.
+    targets = set()
+    for position, block in enumerate(blocks):
+        next_block = blocks[position + 1] if position + 1 < len(blocks) else None
+        for successor in block.successors():
+            if successor is not next_block:
+                targets.add(successor.number)
 
-    else:
-        with open("yourmain.h", "r") as read_file:
-            file_code = read_file.read()
+    def operand(value):
+        if isinstance(value, VirtualRegister):
+            return registers[value.number]
+        if isinstance(value, Address):
+            return "&" + address(value)
+        return c_constant(value)
+
+    def address(value):
+        return "{}[{}]".format(value.memory, location(value))
+
+    # location(value) => the index of the word (or byte, for SMem) of an address.
+    def location(value):
+        base = value.base
+        if isinstance(value.index, Constant):
+            base += value.index.value
+        if value.register is not None:
+            # A slot of the stack frame.
+            base = "{} {} {}".format(value.register, "-" if base < 0 else "+", abs(base))
+        elif base == 0 and isinstance(value.index, VirtualRegister):
+            # An element of an array passed by reference: the index holds its location.
+            return operand(value.index)
+        if value.index is None or isinstance(value.index, Constant):
+            return str(base)
+        return "{} + {}".format(base, operand(value.index))
+
+    for position, block in enumerate(blocks):
+        next_block = blocks[position + 1] if position + 1 < len(blocks) else None
+        lines = []
+        if block.number in targets:
+            lines.append("{}:;".format(block.name))
+
+        for instruction in block.instructions:
+            dest = registers[instruction.dest.number] if instruction.dest is not None else None
+            if isinstance(instruction, Load):
+                lines.append("{} = {};".format(dest, address(instruction.address)))
+            elif isinstance(instruction, Store):
+                lines.append(
+                    "{} = {};".format(address(instruction.address), operand(instruction.source))
+                )
+            elif isinstance(instruction, Copy):
+                lines.append("{} = {};".format(dest, operand(instruction.source)))
+            elif isinstance(instruction, Binary):
+                lines.append(
+                    "{} = {} {} {};".format(
+                        dest,
+                        operand(instruction.left),
+                        instruction.operator,
+                        operand(instruction.right),
+                    )
+                )
+            elif isinstance(instruction, Negate):
+                lines.append("{} = -{};".format(dest, operand(instruction.source)))
+            elif isinstance(instruction, Convert):
+                lines.append(
+                    "{} = ({}) {};".format(
+                        dest, translate(instruction.dest.dtype), operand(instruction.source)
+                    )
+                )
+            elif isinstance(instruction, Call):
+                call = "{}({});".format(
+                    instruction.function, ", ".join(map(operand, instruction.arguments))
+                )
+                lines.append(call if dest is None else "{} = {}".format(dest, call))
+            elif isinstance(instruction, Invoke):
+                lines.append("{}();".format(translate(instruction.function)))
+            elif isinstance(instruction, AddressOf):
+                lines.append("{} = {};".format(dest, location(instruction.address)))
+            elif isinstance(instruction, Allocate):
+                lines.append("SR = SR - {};".format(operand(instruction.size)))
+                lines.append("{} = SR;".format(dest))
 
-            file_code_parts = list(file_code.partition("return 0;"))
+        # Access Time:
+        #   20 for every load and store, 100 for every call, 1 for every other instruction.
+        access_time = sum(map(instruction_time, block.instructions))
+        access_time += instruction_time(block.terminator)
+        terminator = block.terminator
+        if isinstance(terminator, Return) and uses_frame:
+            lines.append("SR = FR + {};".format(record))
+            lines.append("FR = Mem[FR];")
+            access_time += FRAME_TIME
+        if access_time:
+            lines.append("F23_Time += {};".format(str(access_time)))
 
-            index_of_return0 = file_code_parts.index("return 0;")
+        if isinstance(terminator, Jump):
+            if terminator.target is not next_block:
+                lines.append("goto {};".format(terminator.target.name))
+        elif isinstance(terminator, Branch):
+            comparison, target = terminator.comparison, terminator.if_true
+            if target is next_block:
+                comparison, target = NEGATED_COMPARISONS[comparison], terminator.if_false
+            lines.append(
+                "if ({} {} {}) goto {};".format(
+                    operand(terminator.left), comparison, operand(terminator.right), target.name
+                )
+            )
+            if target is terminator.if_true and terminator.if_false is not next_block:
+                lines.append("goto {};".format(terminator.if_false.name))
+        elif terminator.value is not None:
+            lines.append("return {};".format(operand(terminator.value)))
+        elif next_block is not None:
+            # The end of the function returns 0 (see CodeEmitter.render()).
+            lines.append("return 0;")
 
-            file_code_parts.insert(index_of_return0, code_string)
+        for line in lines:
+            emitter.emit(ir_function.name, line)
 
-            with open("yourmain.h", "w") as write_file:
-                write_file.writelines(file_code_parts)
+
+# instruction_time(instruction) => the access time (F23_Time) of an instruction of the IR.
+def instruction_time(instruction) -> int:
+    if isinstance(instruction, (Load, Store)):
+        return MEMORY_ACCESS_TIME
+    if isinstance(instruction, (Call, Invoke)):
+        return FUNCTION_CALL_TIME
+    if isinstance(instruction, (Jump, Return)):
+        return 0
+    return REGISTER_TIME
+
+
+# c_constant(constant) => the C literal of a Constant of the IR.
+def c_constant(constant) -> str:
+    if constant.dtype == DOUBLE:
+        text = repr(float(constant.value))
+    else:
+        text = str(constant.value)
+    return "({})".format(text) if constant.value < 0 else text
+
+
+def write_code(code_string: str, file_name="yourmain.h"):
+    # ----------------------------------------------------------------------------------------
+    # Write the whole generated C file in one call, replacing any previous output.
+    # ----------------------------------------------------------------------------------------
+    with open(file_name, "w") as file:
+        file.write(code_string)
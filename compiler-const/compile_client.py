@@ -0,0 +1,116 @@
+"""
+python compile_client.py te2.f23
+"""
+
+# This file is the client of the compile daemon (compile_daemon.py), and the protocol they share.
+#
+# It only imports the standard library (not ply, nor the compiler), so it starts fast: a build job
+# sends the source of a file to the daemon, which keeps the lexer, the parser and its tables loaded,
+# and gets back the generated C (the content of yourmain.h) and the diagnostics of the compiler.
+#
+# Protocol: one request, then one response, per connection to the daemon's Unix socket; each is
+# a JSON object on one line.
+#   request  => {"command": "compile", "source": <text>, "fold": <bool>}, or {"command": "ping"},
+#               or {"command": "shutdown"}
+#   response => {"ok": <bool>, "code": <C text, or null>, "diagnostics": <text printed by the
+#               compiler>, "error": <why the compilation failed, or null>}
+
+import json
+import os
+import socket
+import sys
+import tempfile
+
+# The socket of the daemon: one per user, in the temporary directory.
+SOCKET_PATH = os.path.join(tempfile.gettempdir(), "f23-compiler-{}.sock".format(os.getuid()))
+
+
+# send_message(connection, message) => sends the message (a dict) as one line of JSON.
+def send_message(connection, message):
+    connection.sendall(json.dumps(message).encode() + b"\n")
+
+
+# receive_message(file) => reads one line of JSON from the file of a connection; None at the end.
+def receive_message(file):
+    line = file.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+# ----------------------------------------------------------------------------
+# Sends a request to the daemon listening on socket_path; returns its response.
+# Raises OSError (ConnectionRefusedError, FileNotFoundError) if no daemon is listening.
+# ----------------------------------------------------------------------------
+def request(message, socket_path=SOCKET_PATH):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(socket_path)
+        send_message(connection, message)
+        connection.shutdown(socket.SHUT_WR)
+        with connection.makefile("rb") as file:
+            return receive_message(file)
+
+
+# compile_source(source, fold, socket_path) => the response of the daemon to the compilation of source.
+def compile_source(source: str, fold=True, socket_path=SOCKET_PATH):
+    return request({"command": "compile", "source": source, "fold": fold}, socket_path)
+
+
+# ----------------------------------------------------------------------------
+# Compiles a file with the daemon, like "python simple_ast.py <filename> --generate":
+#   python compile_client.py <filename> [--no-fold] [--output <file>] [--socket <path>]
+# writes the generated C to yourmain.h (or the --output file), and the diagnostics to stderr.
+# "python compile_client.py --ping" and "--shutdown" check on and stop the daemon.
+# ----------------------------------------------------------------------------
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    socket_path = SOCKET_PATH
+    output = "yourmain.h"
+    if "--socket" in argv:
+        socket_path = argv[argv.index("--socket") + 1]
+    if "--output" in argv:
+        output = argv[argv.index("--output") + 1]
+
+    if "--ping" in argv or "--shutdown" in argv:
+        message = {"command": "ping" if "--ping" in argv else "shutdown"}
+    elif argv and not argv[0].startswith("--"):
+        source = open(argv[0], "r").read()
+        message = {"command": "compile", "source": source, "fold": "--no-fold" not in argv}
+    else:
+        print(
+            "usage: python compile_client.py <filename> [--no-fold] [--output <file>]",
+            file=sys.stderr,
+        )
+        return 2
+
+    try:
+        response = request(message, socket_path)
+    except OSError as error:
+        print(
+            "No compile daemon on {} ({}); start one with: python compile_daemon.py".format(
+                socket_path, error
+            ),
+            file=sys.stderr,
+        )
+        return 3
+
+    if response is None:
+        print("The compile daemon closed the connection without a response", file=sys.stderr)
+        return 3
+
+    if message["command"] != "compile":
+        print(response["diagnostics"])
+        return 0
+
+    sys.stderr.write(response["diagnostics"])
+    if not response["ok"]:
+        print("Compilation failed: {}".format(response["error"]), file=sys.stderr)
+        return 1
+
+    with open(output, "w") as file:
+        file.write(response["code"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+python compile_daemon.py
+"""
+
+# This file is the compile daemon: a long running compiler, which keeps the lexer, the parser and
+# its tables loaded, and compiles the sources sent to it on a Unix socket (see compile_client.py
+# for the client and the protocol), with compiler.compile_source(): the generated C is sent back
+# instead of written to yourmain.h, with all the compiler printed (the diagnostics).
+#
+# Any number of build jobs can connect at the same time, each on its own thread, and are compiled
+# at the same time: every compilation has its own Compilation (see compiler.py).
+#
+# The socket is only readable and writable by its user. A socket left by a daemon that is gone
+# is replaced; the daemon does not start if another one is listening on it.
+
+import os
+import socket
+import socketserver
+import sys
+import threading
+
+import compiler
+from compile_client import SOCKET_PATH, receive_message, send_message
+from simple_lex import get_lexer
+
+
+# response(ok, code, diagnostics, error) => a response of the protocol (see compile_client.py).
+def response(ok, code=None, diagnostics="", error=None):
+    return {"ok": ok, "code": code, "diagnostics": diagnostics, "error": error}
+
+
+class CompileHandler(socketserver.StreamRequestHandler):
+    # Answers the one request of a connection.
+    def handle(self):
+        try:
+            message = receive_message(self.rfile)
+        except ValueError:
+            message = None
+        command = message.get("command") if isinstance(message, dict) else None
+
+        if command == "compile":
+            result = compiler.compile_source(
+                str(message.get("source", "")), bool(message.get("fold", True))
+            )
+            answer = response(*result)
+        elif command == "ping":
+            answer = response(
+                True,
+                diagnostics="compile daemon {} on {}".format(
+                    os.getpid(), self.server.server_address
+                ),
+            )
+        elif command == "shutdown":
+            answer = response(True, diagnostics="compile daemon {} stopped".format(os.getpid()))
+        else:
+            answer = response(False, error="bad request")
+
+        send_message(self.connection, answer)
+
+        # Only once answered: the daemon exits as soon as serve_forever() returns. shutdown() waits
+        # for it to return, so it can not be called from its thread.
+        if command == "shutdown":
+            threading.Thread(target=self.server.shutdown).start()
+
+
+class CompileServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+# ----------------------------------------------------------------------------
+# Removes the socket at socket_path if no daemon listens on it any more;
+# exits if one does.
+# ----------------------------------------------------------------------------
+def claim_socket(socket_path):
+    if not os.path.exists(socket_path):
+        return
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(socket_path)
+        except OSError:
+            os.unlink(socket_path)
+            return
+
+    sys.exit("A compile daemon is already listening on {}".format(socket_path))
+
+
+# ----------------------------------------------------------------------------
+# Runs the daemon on socket_path, until a shutdown request (or Ctrl-C).
+# ----------------------------------------------------------------------------
+def serve(socket_path=SOCKET_PATH):
+    # Built now rather than on the first request (the parser is built by importing simple_ast).
+    get_lexer()
+
+    claim_socket(socket_path)
+    umask = os.umask(0o177)
+    try:
+        server = CompileServer(socket_path, CompileHandler)
+    finally:
+        os.umask(umask)
+
+    print("compile daemon {} listening on {}".format(os.getpid(), socket_path), flush=True)
+    try:
+        with server:
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        os.unlink(socket_path)
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    if "--socket" in arguments:
+        serve(arguments[arguments.index("--socket") + 1])
+    else:
+        serve()
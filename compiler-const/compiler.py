@@ -0,0 +1,127 @@
+# This file holds the compilation of a whole source in process, for the tools that compile without
+# running "python simple_ast.py <filename>": the compile daemon (compile_daemon.py), the batch
+# compiler (batch_compile.py), or a build service that embeds the compiler.
+#
+# A compilation is what "python simple_ast.py <filename> --generate" does, without the printing of
+# the tree: the generated C is returned instead of written to yourmain.h, with all the compiler
+# printed (the diagnostics).
+#
+# A Compilation owns everything a compilation changes: its parser (a clone of the parser of
+# simple_ast.py, over the same tables) and lexer, the symbol tables and constant pool of the
+# program, the code emitter, and the diagnostics. So any number of compilations can run in one
+# process, back to back or at the same time on different threads (one Compilation per thread).
+#
+# Given an ASTCache (see ast_cache.py), a Compilation parses a source only the first time it sees
+# it: the tree of a source already parsed is loaded from the cache, before it is folded.
+
+import io
+import threading
+from collections import namedtuple
+
+import simple_ast
+from code_generation import CodeEmitter
+from parser_tables import clone_parser
+from simple_lex import get_lexer
+
+# ok => whether code was generated; code => the generated C, or None;
+# diagnostics => what the compiler printed; error => why the compilation failed, or None.
+CompileResult = namedtuple("CompileResult", ["ok", "code", "diagnostics", "error"])
+
+
+class Compilation:
+    def __init__(self, fold=True, ast_cache=None):
+        # Constant arithmetic is folded before the symbol tables are built, unless fold is False.
+        self.fold = fold
+        self.ast_cache = ast_cache
+
+        self.parser = clone_parser(simple_ast.parser, errorfunc=self.syntax_error)
+        self.lexer = get_lexer().clone()
+
+        # Of the last source compiled: the symbol tables (scope name => SymbolTable), the constant
+        # pool, the memory layout, the code emitter, and what was printed.
+        self.symbol_tables = {}
+        self.constant_pool = None
+        self.layout = None
+        self.emitter = None
+        self.diagnostics = io.StringIO()
+
+        # Held while a source is compiled: a Compilation compiles one source at a time.
+        self.lock = threading.Lock()
+
+    # syntax_error(token) => reports a syntax error of the parser, as ply does without an error rule.
+    def syntax_error(self, token):
+        if token is None:
+            print("yacc: Parse error in input. EOF", file=self.diagnostics)
+        else:
+            print(
+                "yacc: Syntax error at line %d, token=%s" % (token.lineno, token.type),
+                file=self.diagnostics,
+            )
+
+    # ----------------------------------------------------------------------------
+    # Compiles a source: parses it, folds its constants, builds its symbol tables
+    # and generates its code; returns its CompileResult.
+    # ----------------------------------------------------------------------------
+    def compile(self, source: str) -> CompileResult:
+        with self.lock:
+            self.symbol_tables = {}
+            self.constant_pool = None
+            self.layout = None
+            self.emitter = CodeEmitter()
+            self.diagnostics = io.StringIO()
+
+            code = None
+            error = None
+            try:
+                code = self.generate(source)
+                if code is None:
+                    error = "syntax error"
+            except simple_ast.CompileError as compile_error:
+                print(compile_error, file=self.diagnostics)
+                error = str(compile_error)
+            except Exception as exception:
+                error = "{}: {}".format(type(exception).__name__, exception)
+
+            return CompileResult(error is None, code, self.diagnostics.getvalue(), error)
+
+    # parse(source, lineno) => the AST of the source, whose first line is lineno; None if it does
+    # not parse.
+    def parse(self, source: str, lineno=1):
+        self.lexer.lineno = lineno
+        return self.parser.parse(source, lexer=self.lexer)
+
+    # parse_cached(source) => the AST of the source, from the AST cache if it was parsed before;
+    # None if it does not parse. Only trees parsed without a syntax error are cached.
+    def parse_cached(self, source: str):
+        if self.ast_cache is None:
+            return self.parse(source)
+
+        node = self.ast_cache.get(source)
+        if node is None:
+            reported = self.diagnostics.tell()
+            node = self.parse(source)
+            if node is not None and self.diagnostics.tell() == reported:
+                self.ast_cache.put(source, node)
+        return node
+
+    # generate(source) => the generated C of the source, or None if it does not parse;
+    # raises CompileError if it can not be compiled.
+    def generate(self, source: str):
+        node = self.parse_cached(source)
+        if node is None:
+            return None
+
+        if self.fold:
+            simple_ast.Node.fold_constants(node)
+        self.symbol_tables = simple_ast.Node.generate_symbol_tables(node, file=self.diagnostics)
+        self.constant_pool = self.symbol_tables[node.name].constant_pool
+        self.layout = simple_ast.Node.walk_tree_generate_code(
+            node, self.symbol_tables, emitter=self.emitter, file=self.diagnostics
+        )
+        return self.emitter.render()
+
+
+# compile_source(source, fold, ast_cache) => the CompileResult of the source, compiled by a new
+# Compilation.
+def compile_source(source: str, fold=True, ast_cache=None) -> CompileResult:
+    return Compilation(fold, ast_cache).compile(source)
@@ -0,0 +1,109 @@
+# This file holds the arithmetic of the constant folding pass (see ConstantFolder in simple_ast.py).
+#
+# Constants are evaluated the way the generated C code would: integers are C ints (the R registers),
+# "/" and "%" on integers truncate towards zero, and an operation with a double operand is done in
+# double. An operation that C would not do the same way every time (a division by zero, "%" on
+# doubles, an integer overflow) is never folded; it is left for the program to run.
+#
+# The grammar makes "+ -" and "* / %" right recursive ("a - b - c" is parsed as term MINUS expression),
+# so a chain of operands is evaluated from left to right, as in C.
+import math
+
+# Data types of the numeric literals, as recorded on ConstantNodes by the lexer.
+INTEGER_CONSTANT = "ICONSTANT"
+DOUBLE_CONSTANT = "DCONSTANT"
+
+# Range of a C int.
+INTEGER_MIN = -(2**31)
+INTEGER_MAX = 2**31 - 1
+
+
+# parse_constant(value, dtype) => the number written as value in the source, or None if it is not numeric.
+# Doubles follow the DCONSTANT lexer rule: "1.5", "1.", ".5", with an optional "d" exponent ("2.0d-3").
+def parse_constant(value: str, dtype: str):
+    if dtype == INTEGER_CONSTANT:
+        return int(value)
+    if dtype == DOUBLE_CONSTANT:
+        mantissa, _, exponent = value.partition("d")
+        if exponent.lstrip("+-"):
+            return float(mantissa + "e" + exponent)
+        return float(mantissa)
+
+    return None
+
+
+# format_constant(number) => the (value, dtype) of the literal that writes the (non negative) number.
+def format_constant(number):
+    if isinstance(number, int):
+        return str(number), INTEGER_CONSTANT
+
+    mantissa, _, exponent = repr(number).partition("e")
+    if "." not in mantissa:
+        mantissa += ".0"
+    if exponent:
+        return mantissa + "d" + exponent, DOUBLE_CONSTANT
+    return mantissa, DOUBLE_CONSTANT
+
+
+# convert(number, data_type) => the number as stored in a variable of data_type ("integer" or "double");
+# None if the variable does not hold numbers.
+def convert(number, data_type: str):
+    if number is None:
+        return None
+    if data_type == "integer":
+        return check_integer(math.trunc(number))
+    if data_type == "double":
+        return float(number)
+
+    return None
+
+
+# check_integer(number) => the integer, or None if it does not fit in a C int.
+def check_integer(number: int):
+    if INTEGER_MIN <= number <= INTEGER_MAX:
+        return number
+    return None
+
+
+# evaluate(operator, left, right) => the value of "left operator right", or None if it is not folded.
+def evaluate(operator: str, left, right):
+    if left is None or right is None:
+        return None
+
+    if isinstance(left, float) or isinstance(right, float):
+        if operator == "+":
+            result = left + right
+        elif operator == "-":
+            result = left - right
+        elif operator == "*":
+            result = left * right
+        elif operator == "/" and right != 0:
+            result = left / right
+        else:
+            return None
+        return float(result) if math.isfinite(result) else None
+
+    if operator == "+":
+        return check_integer(left + right)
+    if operator == "-":
+        return check_integer(left - right)
+    if operator == "*":
+        return check_integer(left * right)
+    if operator in ("/", "%") and right != 0:
+        quotient = abs(left) // abs(right)
+        if (left < 0) != (right < 0):
+            quotient = -quotient
+        if operator == "/":
+            return check_integer(quotient)
+        return left - right * quotient
+
+    return None
+
+
+# evaluate_chain(values, operators) => the value of values[0] operators[0] values[1] ..., from left
+# to right; or None if any of them is not known, or an operation is not folded.
+def evaluate_chain(values: list, operators: list):
+    result = values[0]
+    for operator, value in zip(operators, values[1:]):
+        result = evaluate(operator, result, value)
+    return result
@@ -0,0 +1,47 @@
+# ---Constant Pool--- #
+# The literals of a program, interned: every distinct (data type, value) pair is stored once,
+# in a python dictionary keyed by the pair, so a constant is found in O(1).
+#
+# One pool is shared by all the symbol tables of a program, so the same string literal used in
+# different scopes (print_string( "Hello\n" ); in two functions) is one entry, with one SMem offset.
+# String constants are given their SMem offset once, by the memory layout (memory_layout.py).
+from symbol_table_properties import DATA_TYPE, MEM_LOCATION, VALUE
+
+
+# Data type of the string literals, as recorded on ConstantNodes by the lexer.
+STRING_CONSTANT = "SCONSTANT"
+
+
+# string_size(value) => the number of SMem bytes a string literal takes, given its source text;
+# the quotation marks are not stored, and 1 is added for the end of string in C.
+def string_size(value: str) -> int:
+    return len(value) - 2 + 1
+
+
+class ConstantPool:
+    def __init__(self):
+        # (data type, value) => constant entry {DATA_TYPE, VALUE, MEM_LOCATION}.
+        self.constants = {}
+
+    # size() => returns the number of distinct constants in the pool.
+    def size(self):
+        return len(self.constants)
+
+    # intern(dtype, value) => returns the entry of the constant, adding it if it is not in the pool yet.
+    def intern(self, dtype, value):
+        key = (dtype, value)
+        entry = self.constants.get(key)
+        if entry is None:
+            entry = {DATA_TYPE: dtype, VALUE: value, MEM_LOCATION: None}
+            self.constants[key] = entry
+
+        return entry
+
+    # get(dtype, value) => returns the entry of the constant, or None if it was never interned.
+    def get(self, dtype, value):
+        return self.constants.get((dtype, value))
+
+    def __repr__(self):
+        return "Constant Pool\n\t {constants}\n".format(
+            constants=list(self.constants.values())
+        )
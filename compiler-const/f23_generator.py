@@ -0,0 +1,194 @@
+"""
+python f23_generator.py --procedures 20 --depth 3 --expression-length 6 --arrays 2 > big.f23
+"""
+
+# This file generates synthetic f23 programs, for the benchmarks: valid programs of the grammar of
+# simple_ast.py, which also build their symbol tables and generate code, with their size and shape
+# set by a few parameters (see ProgramShape):
+#   procedures        => procedures and functions in the program body (every other one is a
+#                        function, the only scopes code is generated for), besides main;
+#   depth             => how deep while, do and if statements are nested in every one of them;
+#   statements        => simple statements (assignments, array stores, increments, prints) at
+#                        every level of the nesting;
+#   expression_length => operands of every expression (variables, constants, array elements);
+#   arrays            => arrays declared in every procedure and function, used by the expressions;
+#   seed              => the seed of the choices made (operators, operands...), so that the same
+#                        parameters always give the same program.
+#
+# The procedures are never called, so that a program of the same shape stays the same program as
+# the compiler learns more of the language (the history of the benchmark suite compares them).
+
+import random
+import sys
+from collections import namedtuple
+
+ProgramShape = namedtuple(
+    "ProgramShape",
+    ["procedures", "depth", "statements", "expression_length", "arrays", "seed"],
+    defaults=[8, 2, 3, 4, 1, 0],
+)
+
+# The scalar variables of every scope (n is the argument of the procedures and functions).
+VARIABLES = ("i", "j", "k", "t")
+OPERATORS = ("+", "-", "*", "/", "%")
+ARRAY_SIZE = 16
+INDENT = "    "
+
+
+# ----------------------------------------------------------------------------
+# Generates the text of one procedure or function, or of main, with a random.Random;
+# the nested statements are written by its methods, one line at a time.
+# ----------------------------------------------------------------------------
+class ScopeGenerator:
+    def __init__(self, shape, rng, arrays):
+        self.shape = shape
+        self.rng = rng
+        self.arrays = arrays
+        self.lines = []
+        # Cycles through while, do and if for the nested statements.
+        self.nested = 0
+
+    def line(self, level, text):
+        self.lines.append(INDENT * level + text)
+
+    # operand() => a variable, a constant, or an element of an array.
+    def operand(self):
+        choice = self.rng.random()
+        if choice < 0.4:
+            return self.rng.choice(VARIABLES + ("n",))
+        if choice < 0.7 or not self.arrays:
+            return str(self.rng.randint(1, 99))
+        return "{}[{}]".format(self.rng.choice(self.arrays), self.rng.choice(VARIABLES))
+
+    # expression() => an expression of shape.expression_length operands, some in parentheses.
+    def expression(self):
+        terms = [self.operand()]
+        for _ in range(self.shape.expression_length - 1):
+            operand = self.operand()
+            if self.rng.random() < 0.15:
+                operand = "( {} + {} )".format(operand, self.operand())
+            terms.append(self.rng.choice(OPERATORS))
+            terms.append(operand)
+        return " ".join(terms)
+
+    # condition() => a comparison between a variable and an expression.
+    def condition(self):
+        return "{} {} {}".format(
+            self.rng.choice(VARIABLES), self.rng.choice(("<", "<=", ">", "==")), self.expression()
+        )
+
+    def simple_statement(self, level, number):
+        kind = number % 4
+        variable = self.rng.choice(VARIABLES)
+        if kind == 0 or (kind == 1 and not self.arrays):
+            self.line(level, "{} := {};".format(variable, self.expression()))
+        elif kind == 1:
+            self.line(
+                level,
+                "{}[{}] := {};".format(self.rng.choice(self.arrays), variable, self.expression()),
+            )
+        elif kind == 2:
+            self.line(level, "{}{};".format(variable, self.rng.choice(("++", "--"))))
+        else:
+            self.line(level, "print_integer( {} );".format(variable))
+
+    # ----------------------------------------------------------------------------
+    # Writes shape.statements simple statements at 'level', then, while depth is left,
+    # a while, do or if statement (in turn) holding the block one level deeper.
+    # ----------------------------------------------------------------------------
+    def block(self, level, depth):
+        for number in range(self.shape.statements):
+            self.simple_statement(level, number)
+        if depth == 0:
+            return
+
+        kind = self.nested % 3
+        self.nested += 1
+        if kind == 0:
+            self.line(level, "while ( {} )".format(self.condition()))
+        elif kind == 1:
+            variable = self.rng.choice(VARIABLES)
+            self.line(
+                level,
+                "do ( {0} := 0; {0} < {1}; {0}++ )".format(variable, self.rng.randint(2, 20)),
+            )
+        else:
+            self.line(level, "if ( {} ) then".format(self.condition()))
+        self.line(level, "{")
+        self.block(level + 1, depth - 1)
+        self.line(level, "}")
+        if kind == 2:
+            self.line(level, "else")
+            self.line(level, "{")
+            self.block(level + 1, depth - 1)
+            self.line(level, "}")
+
+    # body(level) => declares the variables and arrays of the scope, then writes its statements.
+    def body(self, level):
+        self.line(level, "integer {};".format(", ".join(VARIABLES)))
+        for array in self.arrays:
+            self.line(level, "integer {}[{}];".format(array, ARRAY_SIZE))
+        for variable in VARIABLES:
+            self.line(level, "{} := {};".format(variable, self.rng.randint(0, 9)))
+        self.block(level, self.shape.depth)
+
+
+# generate_program(shape) => the text of the program of the ProgramShape given as parameter.
+def generate_program(shape=ProgramShape()) -> str:
+    rng = random.Random(shape.seed)
+    lines = ["program synthetic", "{"]
+
+    for number in range(shape.procedures):
+        arrays = ["a{}_{}".format(number, array) for array in range(shape.arrays)]
+        scope = ScopeGenerator(shape, rng, arrays)
+        if number % 2:
+            scope.line(1, "function integer f{}( integer n )".format(number))
+        else:
+            scope.line(1, "procedure p{}( integer n )".format(number))
+        scope.line(1, "{")
+        scope.body(2)
+        if number % 2:
+            scope.line(2, "return k;")
+        scope.line(1, "}")
+        scope.line(0, "")
+        lines += scope.lines
+
+    main = ScopeGenerator(shape, rng, ["m{}".format(array) for array in range(shape.arrays)])
+    main.line(1, "function integer main()")
+    main.line(1, "{")
+    main.line(2, "integer n;")
+    main.line(2, "n := {};".format(rng.randint(10, 99)))
+    main.body(2)
+    main.line(1, "}")
+    lines += main.lines
+
+    lines += ["}", ""]
+    return "\n".join(lines)
+
+
+# ----------------------------------------------------------------------------
+# Writes a generated program to stdout:
+#   python f23_generator.py [--procedures N] [--depth N] [--statements N]
+#                           [--expression-length N] [--arrays N] [--seed N]
+# ----------------------------------------------------------------------------
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    parameters = {}
+    arguments = iter(argv)
+    for argument in arguments:
+        field = argument[2:].replace("-", "_")
+        if not argument.startswith("--") or field not in ProgramShape._fields:
+            print(
+                "usage: python f23_generator.py [--procedures N] [--depth N] [--statements N] "
+                "[--expression-length N] [--arrays N] [--seed N]",
+                file=sys.stderr,
+            )
+            return 2
+        parameters[field] = int(next(arguments))
+
+    sys.stdout.write(generate_program(ProgramShape(**parameters)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
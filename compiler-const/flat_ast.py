@@ -0,0 +1,405 @@
+# This file holds the flattened form of the AST, for whole-program analyses of big programs.
+#
+# A FlatTree stores the nodes of an AST as columns (struct of arrays) instead of objects:
+#   types[i]        => node type of node i (see node_types.py).
+#   first_child[i]  => index of the first child of node i, or -1.
+#   next_sibling[i] => index of the next sibling of node i, or -1.
+#   lineno[i]       => line of node i, when the parser recorded one (a statement), otherwise 0.
+#   payload[i]      => where the properties of node i (its name, value...) start in values, or -1;
+#                      for a token (e.g. the "-" of a negative constant), the index of its string.
+# The properties of a node are tagged integers in the values column (see the TAG_ values below,
+# also the ones of the AST cache, ast_cache.py); equal properties are stored once. The strings
+# (names, constants, tokens) are interned in the string table: all their characters in the string
+# text, and where each one starts in the column string_starts. So a tree is a few arrays and one
+# string, whatever its size, and holds nothing the garbage collector tracks.
+# Nodes are numbered in breadth-first order, so the root is 0 and the children of a node are
+# numbered after it.
+#
+# The tree is converted with FlatTree.from_tree() and to_tree(), and the symbol table and code
+# generation walks run on it with visit=flat_tree.visit. The visitors with a flat form (see
+# FLAT_VISITORS) read the columns; the others are given FlatNode views of the nodes they visit.
+
+from array import array
+
+import simple_ast
+from constant_folding import evaluate, parse_constant
+from node_types import CONSTANT, EXPRESSION, IDENTIFIER, TERM, TOKEN
+from simple_ast import NODE_CLASSES, Node
+
+# The tags of the values of the properties: None; a string (then its index in the string table);
+# a node (then its index); a tuple (then its length, and its items); an integer (then the integer).
+TAG_NONE = 0
+TAG_STRING = 1
+TAG_NODE = 2
+TAG_TUPLE = 3
+TAG_INTEGER = 4
+
+# node type => the properties of its typed node class held in values, by name => their position.
+# The line of a statement is not one of them: it has its own column.
+PROPERTY_POSITIONS = {
+    node_type: {
+        name: position
+        for position, name in enumerate(slot for slot in node_class.__slots__ if slot != "lineno")
+    }
+    for node_type, node_class in NODE_CLASSES.items()
+}
+
+# The scope of the nodes a walk has not reached (see FlatTree.visit()).
+UNVISITED = object()
+
+
+# A reference, in a payload, to another node of the tree (e.g. the arguments of a procedure).
+class NodeReference:
+    __slots__ = ("index",)
+
+    def __init__(self, index):
+        self.index = index
+
+
+class FlatTree:
+    def __init__(self):
+        self.types = array("H")
+        self.first_child = array("i")
+        self.next_sibling = array("i")
+        self.lineno = array("i")
+        self.payload = array("i")
+        self.values = array("i")
+        self.text = ""
+        self.string_starts = array("i", [0])
+
+    # size() => returns the number of nodes of the tree.
+    def size(self):
+        return len(self.types)
+
+    # root() => returns the root node of the tree.
+    def root(self):
+        return FlatNode(self, 0)
+
+    # children(index) => returns the indexes of the children of a node.
+    def children(self, index):
+        children = []
+        child = self.first_child[index]
+        while child >= 0:
+            children.append(child)
+            child = self.next_sibling[child]
+
+        return children
+
+    # string(index) => the string of the string table at the index.
+    def string(self, index):
+        return self.text[self.string_starts[index] : self.string_starts[index + 1]]
+
+    # node(index) => a FlatNode view of a node, or the string of a token.
+    def node(self, index):
+        if self.types[index] == TOKEN:
+            return self.string(self.payload[index])
+        return FlatNode(self, index)
+
+    # property(index, name) => the property of a node (of its typed node class), or None if its
+    # class has no such property; the nodes it refers to are given as FlatNode views.
+    def property(self, index, name):
+        position = PROPERTY_POSITIONS.get(self.types[index], {}).get(name)
+        if position is None:
+            return None
+        # The properties are a tuple: its tag, its length, then its items.
+        start = self.payload[index] + 2
+        for _ in range(position):
+            start = self.skip_value(start)
+        return self.decode_value(start, self.node)[0]
+
+    # decode_value(start, node) => (the value whose tag is at start in values, where it ends);
+    # node(index) => what a reference to the node at the index is decoded to.
+    def decode_value(self, start, node):
+        values = self.values
+        tag = values[start]
+        if tag == TAG_NONE:
+            return None, start + 1
+        if tag == TAG_STRING:
+            return self.string(values[start + 1]), start + 2
+        if tag == TAG_NODE:
+            return node(values[start + 1]), start + 2
+        if tag == TAG_INTEGER:
+            return values[start + 1], start + 2
+        items = []
+        start += 2
+        for _ in range(values[start - 1]):
+            item, start = self.decode_value(start, node)
+            items.append(item)
+        return tuple(items), start
+
+    # skip_value(start) => where the value whose tag is at start in values ends.
+    def skip_value(self, start):
+        values = self.values
+        tag = values[start]
+        if tag == TAG_NONE:
+            return start + 1
+        if tag != TAG_TUPLE:
+            return start + 2
+        start += 2
+        for _ in range(values[start - 1]):
+            start = self.skip_value(start)
+        return start
+
+    # ----------------------------------------------------------------------------
+    # Returns the FlatTree of the tree (of Node objects) given as parameter.
+    # ----------------------------------------------------------------------------
+    @classmethod
+    def from_tree(cls, root):
+        tree = cls()
+        indexes = {}
+        typed_nodes = []
+        strings = []
+        string_indexes = {}
+
+        def string_index(string):
+            index = string_indexes.get(string)
+            if index is None:
+                index = string_indexes[string] = len(strings)
+                strings.append(string)
+            return index
+
+        def add_node(node):
+            index = len(tree.types)
+            if isinstance(node, Node):
+                tree.types.append(node.type)
+                tree.payload.append(-1)
+                if type(node) is not Node and PROPERTY_POSITIONS[node.type]:
+                    typed_nodes.append((node, index))
+            else:
+                # Tokens are kept in the tree as they are (e.g. the "-" of a negative constant).
+                tree.types.append(TOKEN)
+                tree.payload.append(string_index(node))
+            tree.first_child.append(-1)
+            tree.next_sibling.append(-1)
+            tree.lineno.append(getattr(node, "lineno", 0))
+            indexes[id(node)] = index
+            return index
+
+        # Breadth-first: the queue is the nodes numbered, from the one whose children are next.
+        queue = [root]
+        add_node(root)
+        for index, node in enumerate(queue):
+            previous_child = -1
+            for child in getattr(node, "children", ()):
+                child_index = add_node(child)
+                if previous_child < 0:
+                    tree.first_child[index] = child_index
+                else:
+                    tree.next_sibling[previous_child] = child_index
+                previous_child = child_index
+                queue.append(child)
+
+        # Properties are added once every node has an index, since they may refer to nodes.
+        def encode_value(value, values):
+            if value is None:
+                values.append(TAG_NONE)
+            elif isinstance(value, str):
+                values += (TAG_STRING, string_index(value))
+            elif isinstance(value, Node):
+                values += (TAG_NODE, indexes[id(value)])
+            elif isinstance(value, tuple):
+                values += (TAG_TUPLE, len(value))
+                for item in value:
+                    encode_value(item, values)
+            else:
+                values += (TAG_INTEGER, value)
+
+        payload_starts = {}
+        for node, index in typed_nodes:
+            values = []
+            properties = PROPERTY_POSITIONS[node.type]
+            encode_value(tuple(getattr(node, name) for name in properties), values)
+            values = tuple(values)
+            start = payload_starts.get(values)
+            if start is None:
+                start = payload_starts[values] = len(tree.values)
+                tree.values.extend(values)
+            tree.payload[index] = start
+
+        tree.text = "".join(strings)
+        for string in strings:
+            tree.string_starts.append(tree.string_starts[-1] + len(string))
+        return tree
+
+    # ----------------------------------------------------------------------------
+    # Returns the tree of Node objects of this FlatTree.
+    # Nodes are rebuilt from the last one up, so the children of a node are always rebuilt first.
+    # ----------------------------------------------------------------------------
+    def to_tree(self):
+        nodes = [None] * self.size()
+
+        for index in range(self.size() - 1, -1, -1):
+            node_type = self.types[index]
+            if node_type == TOKEN:
+                nodes[index] = self.string(self.payload[index])
+                continue
+
+            node_class = NODE_CLASSES.get(node_type, Node)
+            node = node_class.__new__(node_class)
+            node.type = node_type
+            node.children = tuple(nodes[child] for child in self.children(index))
+            if node_class is not Node:
+                properties = ()
+                if self.payload[index] >= 0:
+                    properties = self.decode_value(self.payload[index], nodes.__getitem__)[0]
+                for name, value in zip(PROPERTY_POSITIONS[node_type], properties):
+                    setattr(node, name, value)
+                if "lineno" in node_class.__slots__:
+                    node.lineno = self.lineno[index]
+            nodes[index] = node
+
+        return nodes[0]
+
+    # ----------------------------------------------------------------------------
+    # Walks through the tree in breadth-first order, calling the visitor of each node's type (same
+    # as tree_walk.visit_tree, with the node index given as its position). As the nodes are
+    # numbered breadth-first, it is the order of their indexes: every node reached is given its
+    # scope by its parent, in scopes. A visitor with a flat form (see FLAT_VISITORS) is called with
+    # the tree and the index of the node; any other one with a FlatNode view of the node.
+    # ----------------------------------------------------------------------------
+    def visit(self, root, visitors, scope=None):
+        types = self.types
+        first_child = self.first_child
+        next_sibling = self.next_sibling
+        flat_visitors = {
+            node_type: FLAT_VISITORS.get(visitor) for node_type, visitor in visitors.items()
+        }
+
+        scopes = [UNVISITED] * self.size()
+        scopes[root.index] = scope
+        for index in range(root.index, self.size()):
+            scope = scopes[index]
+            if scope is UNVISITED:
+                continue
+
+            node_type = types[index]
+            visitor = visitors.get(node_type)
+            if visitor is not None:
+                flat_visitor = flat_visitors[node_type]
+                if flat_visitor is not None:
+                    child_scope = flat_visitor(self, index, index, scope)
+                else:
+                    child_scope = visitor(FlatNode(self, index), index, scope)
+                if child_scope is not None:
+                    scope = child_scope
+
+            child = first_child[index]
+            while child >= 0:
+                scopes[child] = scope
+                child = next_sibling[child]
+
+
+# ----------------------------------------------------------------------------
+# A view of one node of a FlatTree, with the same attributes as a Node:
+# type, children, lineno, and the properties of its typed node class (name, value, dtype...);
+# it is printed as its Node is, so the visitors print and record the same things for both.
+# ----------------------------------------------------------------------------
+class FlatNode:
+    __slots__ = ("tree", "index")
+
+    def __init__(self, tree, index):
+        self.tree = tree
+        self.index = index
+
+    @property
+    def type(self):
+        return self.tree.types[self.index]
+
+    @property
+    def lineno(self):
+        return self.tree.lineno[self.index]
+
+    @property
+    def children(self):
+        tree = self.tree
+        return tuple(tree.node(child) for child in tree.children(self.index))
+
+    def __getattr__(self, name):
+        tree = self.tree
+        if name not in PROPERTY_POSITIONS.get(tree.types[self.index], ()):
+            raise AttributeError(name)
+        return tree.property(self.index, name)
+
+    # meta_repr() => the representation of the properties of the node, as its Node class gives it.
+    def meta_repr(self):
+        node_class = NODE_CLASSES.get(self.type, Node)
+        return node_class.meta_repr(self)
+
+    def __repr__(self):
+        return Node.__repr__(self)
+
+
+# ----------------------------------------------------------------------------
+# The flat forms of the visitors of the symbol table walk the most nodes go through (see
+# simple_ast.py): each one is given the tree and the index of a node instead of a node, and reads
+# the columns, as the visitor would read the node. Only the values kept in the symbol tables
+# (the constants and identifiers of an expression) are FlatNode views.
+# ----------------------------------------------------------------------------
+def add_constant(tree, index, position, symbol_table):
+    symbol_table.put_constant(
+        const_dtype=tree.property(index, "dtype"),
+        const_value=tree.property(index, "value"),
+    )
+
+
+def assign_variable(tree, index, position, symbol_table):
+    types = tree.types
+    id_name = None
+    id_value = None
+    child = tree.first_child[index]
+    while child >= 0:
+        if types[child] == IDENTIFIER:
+            id_name = tree.property(child, "name")
+        elif types[child] == EXPRESSION:
+            id_value = folded_value(tree, child)
+            if id_value is None:
+                id_value = expression_value(tree, child, [])
+        child = tree.next_sibling[child]
+
+    simple_ast.set_variable_value(symbol_table, id_name, id_value)
+
+
+# folded_value(tree, index) => get_folded_value() of the node at the index.
+def folded_value(tree, index):
+    types = tree.types
+    while types[index] == EXPRESSION or types[index] == TERM:
+        child = tree.first_child[index]
+        if child < 0 or tree.next_sibling[child] >= 0:
+            return None
+        index = child
+
+    children = tree.children(index)
+    negative = types[children[0]] == TOKEN
+    constant = children[-1]
+    if len(children) != 1 + negative or types[constant] != CONSTANT:
+        return None
+
+    value = parse_constant(tree.property(constant, "value"), tree.property(constant, "dtype"))
+    return evaluate("-", 0, value) if negative else value
+
+
+# expression_value(tree, index, expression_list) => get_expression_value() of the node at the index.
+def expression_value(tree, index, expression_list):
+    node_type = tree.types[index]
+    if node_type == TOKEN:
+        return expression_list
+    if node_type == CONSTANT or node_type == IDENTIFIER:
+        expression_list.append(FlatNode(tree, index))
+
+    child = tree.first_child[index]
+    position = 0
+    while child >= 0:
+        if position == 1:
+            expression_list.append(tree.node(child))
+        else:
+            expression_value(tree, child, expression_list)
+        child = tree.next_sibling[child]
+        position += 1
+    return expression_list
+
+
+# The visitors of simple_ast.py => their flat form.
+FLAT_VISITORS = {
+    simple_ast.add_constant: add_constant,
+    simple_ast.assign_variable: assign_variable,
+}
@@ -0,0 +1,68 @@
+"""
+python import_profile.py simple_ast
+"""
+
+# This file measures what importing a module of the compiler costs a cold start: the module is
+# imported in a new python process, with "python -X importtime", and the time spent importing
+# every module (on its own, and with the modules it imports) is read from what python reports.
+#
+# The compiler prints it with "python simple_ast.py <filename> --import-profile".
+
+import os
+import subprocess
+import sys
+from collections import namedtuple
+
+# self_us => microseconds spent in the module itself; cumulative_us => with the modules it imports;
+# depth => how deep in the imports it is (0 for the module given to profile_imports()).
+ImportCost = namedtuple("ImportCost", ["name", "self_us", "cumulative_us", "depth"])
+
+
+# ----------------------------------------------------------------------------
+# Imports the module given as parameter in a new python process (run from the directory
+# of this file), and returns the ImportCost of every module it imported, in import order.
+# ----------------------------------------------------------------------------
+def profile_imports(module_name="simple_ast") -> list:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + module_name],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+
+    costs = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if not fields[0].strip().isdigit():
+            continue  # The header line.
+        # The name is indented by 2 spaces per level of imports, after one space.
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        costs.append(ImportCost(name.strip(), int(fields[0]), int(fields[1]), depth))
+
+    return costs
+
+
+# report(costs, limit) => returns the total import time, and the 'limit' most costly modules.
+def report(costs, limit=15) -> str:
+    total = sum(cost.cumulative_us for cost in costs if cost.depth <= 0)
+    lines = [
+        "~ IMPORT PROFILE ~",
+        "total: {:.1f} ms, {} modules".format(total / 1000, len(costs)),
+        "{: >10} {: >12}  module".format("self ms", "cumulative ms"),
+    ]
+    for cost in sorted(costs, key=lambda cost: cost.self_us, reverse=True)[:limit]:
+        lines.append(
+            "{: >10.2f} {: >12.2f}  {}".format(
+                cost.self_us / 1000, cost.cumulative_us / 1000, cost.name
+            )
+        )
+
+    return "\n".join(lines) + "\n"
+
+
+if __name__ == "__main__":
+    print(report(profile_imports(*sys.argv[1:2])))
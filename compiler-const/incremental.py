@@ -0,0 +1,419 @@
+"""
+python incremental.py mg.f23
+"""
+
+# This file is the incremental build: a source is compiled unit by unit (a unit is a function or
+# procedure of the program body), and the units that did not change since they were last compiled
+# are not lexed, parsed nor folded again.
+#
+# A source is first split into its units by a light scan for braces (skipping the comments and
+# strings), without lexing it. Every unit is keyed by a hash of its text (and of the compiler and
+# the folding), and cached on disk, in __pycache__/units: its folded AST, the (breadth-first) depth
+# and order of its scopes, its generated C (one instruction buffer per function), and the line it
+# started on. A unit that moved in the source (lines added or removed above it) is still used: the
+# lines of its statements are shifted when it is loaded, so its errors give the lines of the
+# source. Like the AST cache (ast_cache.py), the unit cache is bounded in size: the units used
+# least recently are removed first.
+#
+# The units are then linked together, as in a whole compilation: the symbol tables are generated
+# from the ASTs of all the units (all the scopes share the constant pool), then the memory layout.
+# The C of a cached unit is reused as long as every variable and string constant of its scopes is
+# where it was when the C was generated, and the functions it may call take the same parameters;
+# otherwise it is generated again from its cached AST ("relinked"). The functions are put back in
+# the order of a whole compilation, so the output is the same as one.
+#
+# A source that can not be split into units (or with a unit that does not parse on its own) is
+# compiled as a whole, so its diagnostics are those of a whole compilation.
+
+import hashlib
+import os
+import pickle
+import re
+import sys
+import threading
+from collections import namedtuple
+
+import simple_ast
+from ast_cache import MAX_CACHE_BYTES, evict_entries
+from code_generation import CodeEmitter, generate_code_static_data
+from compiler import Compilation
+from memory_layout import layout_memory
+from node_types import FUNCTION, PROCEDURE
+from parser_tables import CACHE_DIRECTORY
+from symbol_table_properties import ARRAY_SIZE, MEM_LOCATION, MEMORY, REFERENCE, REGISTER
+from table_lex import TOKEN_NAMES, tokenize_all
+from tree_walk import visit_tree, walk_tree
+
+UNIT_CACHE_DIRECTORY = os.path.join(CACHE_DIRECTORY, "units")
+UNIT_SUFFIX = ".pickle"
+
+# Changed with what a cached unit holds, so that the units cached before are not loaded.
+UNIT_FORMAT = b"unit-2"
+
+# The modules that decide what a unit compiles to: a cached unit is only used by the compiler
+# that cached it.
+COMPILER_MODULES = (
+    "simple_lex",
+    "simple_ast",
+    "constant_folding",
+    "constant_pool",
+    "symbol_table",
+    "memory_layout",
+    "ir",
+    "ir_builder",
+    "register_allocation",
+    "loop_optimization",
+    "code_generation",
+)
+
+# What the split looks at: the comments and strings (skipped, as they may hold braces), the braces,
+# and the keywords a unit starts with.
+UNIT_SCANNER = re.compile(
+    r'//[^\n]*|"[^"]*"|(?P<brace>[{}])'
+    r"|(?<![a-zA-Z_\$0-9])(?P<keyword>function|procedure)(?![a-zA-Z_\$0-9])"
+)
+
+# text => the source of the unit; line => its first line in the source; key => its cache key.
+Unit = namedtuple("Unit", ["text", "line", "key"])
+
+# Of the last compilation: units => the units of the source (0 if it was not split into units);
+# cached => units whose AST was cached; reused => cached units whose C was reused as it was;
+# compiled => units lexed and parsed.
+CacheStats = namedtuple("CacheStats", ["units", "cached", "reused", "compiled"])
+
+compiler_key = None
+
+
+# compiler_hash() => a hash of the source of the compiler modules, computed once.
+def compiler_hash() -> str:
+    global compiler_key
+    if compiler_key is None:
+        compiler = hashlib.sha256()
+        for module_name in COMPILER_MODULES:
+            with open(sys.modules[module_name].__file__, "rb") as file:
+                compiler.update(file.read())
+        compiler_key = compiler.hexdigest()
+    return compiler_key
+
+
+# unit_key(text, fold) => the cache key of a unit.
+def unit_key(text: str, fold=True) -> str:
+    key = hashlib.sha256(compiler_hash().encode())
+    key.update(UNIT_FORMAT)
+    key.update(b"fold" if fold else b"no-fold")
+    key.update(text.encode())
+    return key.hexdigest()
+
+
+# token_names(text) => the names of the tokens of the text.
+def token_names(text: str) -> list:
+    return [TOKEN_NAMES[token_type] for token_type in tokenize_all(text).types]
+
+
+# ----------------------------------------------------------------------------
+# Splits a source into its units; returns the name of the program and its Units,
+# or None if the source is not "program <name> { <functions and procedures> }".
+# ----------------------------------------------------------------------------
+def split_units(source: str, fold=True):
+    spans = []
+    depth = 0
+    start = None
+    end = None
+    for match in UNIT_SCANNER.finditer(source):
+        if match.lastgroup == "keyword":
+            if depth == 1 and start is None:
+                start = match.start()
+        elif match.lastgroup == "brace":
+            if match.group() == "{":
+                depth += 1
+                continue
+            depth -= 1
+            if depth == 1 and start is not None:
+                spans.append((start, match.end()))
+                start = None
+            elif depth <= 0:
+                end = match.start()
+                break
+
+    if end is None or start is not None or not spans:
+        return None
+
+    # Only the blanks and comments may be left out of the units.
+    header = token_names(source[: spans[0][0]])
+    if header != ["K_PROGRAM", "IDENTIFIER", "LCURLY"]:
+        return None
+    for (_, gap_start), (gap_end, _) in zip(spans, spans[1:]):
+        if token_names(source[gap_start:gap_end]):
+            return None
+    if token_names(source[spans[-1][1] :]) != ["RCURLY"]:
+        return None
+
+    name = tokenize_all(source[: spans[0][0]]).values[1]
+    units = []
+    line = 1
+    position = 0
+    for start, end in spans:
+        line += source.count("\n", position, start)
+        position = start
+        text = source[start:end]
+        units.append(Unit(text, line, unit_key(text, fold)))
+
+    return name, units
+
+
+# ----------------------------------------------------------------------------
+# Returns the scopes of the AST of a unit, as (depth, order, type, name),
+# in the (breadth-first) order the walks go through them; the unit is at depth 1.
+# ----------------------------------------------------------------------------
+def unit_scopes(node) -> list:
+    scopes = []
+    for order, (scope_node, position, depth) in enumerate(
+        walk_tree(node, scope=1, enter_scope=lambda node, position, depth: depth + 1)
+    ):
+        if getattr(scope_node, "type", None) in (FUNCTION, PROCEDURE):
+            scopes.append((depth, order, scope_node.type, scope_node.name))
+    return scopes
+
+
+# ----------------------------------------------------------------------------
+# Returns where the memory layout placed every variable and string constant of the scopes
+# given as parameter, and the records of all the functions and procedures (which the scopes may
+# call): the C of the scopes only holds while this does not change.
+# ----------------------------------------------------------------------------
+def scopes_layout(scopes, symbol_tables) -> list:
+    layout = []
+    for depth, order, scope_type, name in scopes:
+        symbol_table = symbol_tables[name]
+        for symbol in symbol_table.slots:
+            properties = symbol_table.get(symbol)
+            layout.append(
+                (
+                    name,
+                    symbol,
+                    properties.get(MEMORY),
+                    properties.get(MEM_LOCATION),
+                    properties.get(REGISTER),
+                    properties.get(REFERENCE),
+                )
+            )
+        for key, const in symbol_table.table.get("CONSTANTS", {}).items():
+            layout.append((name, key, const[MEM_LOCATION]))
+
+    for name, symbol_table in symbol_tables.items():
+        frame = symbol_table.frame
+        if frame is not None:
+            parameters = tuple(
+                (properties.get(MEMORY), properties.get(ARRAY_SIZE))
+                for parameter, properties in frame.parameters
+            )
+            layout.append((name, parameters, frame.return_memory))
+    return layout
+
+
+# ----------------------------------------------------------------------------
+# Shifts the lines of the statements of the AST of a cached unit (see StatementNode) to a unit of
+# the same text that starts on the line given as parameter.
+# ----------------------------------------------------------------------------
+def move_unit(cached_unit, line):
+    shift = line - cached_unit["line"]
+    if shift:
+        for node, position, scope in walk_tree(cached_unit["tree"]):
+            if isinstance(node, simple_ast.StatementNode):
+                node.lineno += shift
+        cached_unit["line"] = line
+
+
+class UnitCache:
+    def __init__(self, directory=UNIT_CACHE_DIRECTORY, max_bytes=MAX_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def path(self, key):
+        return os.path.join(self.directory, key + UNIT_SUFFIX)
+
+    # load(key) => the cached unit of the key, or None (not cached, or unreadable).
+    def load(self, key):
+        path = self.path(key)
+        try:
+            with open(path, "rb") as file:
+                cached_unit = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+        # Marks the unit as used now, for the eviction.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return cached_unit
+
+    # save(key, unit) => caches the unit; written to a temporary file first, so that compilations
+    # running at the same time never load a half written unit. A unit that can not be written is
+    # only not cached.
+    def save(self, key, unit):
+        path = self.path(key)
+        temporary_file = "{}.{}.{}.tmp".format(path, os.getpid(), threading.get_ident())
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temporary_file, "wb") as file:
+                pickle.dump(unit, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_file, path)
+        except OSError:
+            return
+        evict_entries(self.directory, UNIT_SUFFIX, self.max_bytes)
+
+
+# ----------------------------------------------------------------------------
+# A Compilation (see compiler.py) that compiles a source unit by unit, with a UnitCache;
+# its stats are the CacheStats of the last source compiled.
+# ----------------------------------------------------------------------------
+class IncrementalCompilation(Compilation):
+    def __init__(self, fold=True, cache_directory=UNIT_CACHE_DIRECTORY):
+        super().__init__(fold)
+        self.cache = UnitCache(cache_directory)
+        self.stats = None
+
+    # generate(source) => the generated C of the source (see Compilation.generate).
+    def generate(self, source: str):
+        self.stats = CacheStats(0, 0, 0, 0)
+        split = split_units(source, self.fold)
+        if split is None:
+            return super().generate(source)
+        name, units = split
+
+        # The units not cached are parsed (each as the only unit of a program, with the line
+        # numbers of the source) and folded; their AST is cached now, even if the program then
+        # fails to compile.
+        cached_units = []
+        compiled = 0
+        for unit in units:
+            cached_unit = self.cache.load(unit.key)
+            if cached_unit is None:
+                node = self.parse("program {} {{{}}}".format(name, unit.text), unit.line)
+                if node is None or len(node.children) != 1 or self.diagnostics.tell():
+                    return self.generate_whole(source, units)
+                node = node.children[0]
+                if self.fold:
+                    simple_ast.Node.fold_constants(node)
+                cached_unit = {
+                    "tree": node,
+                    "scopes": unit_scopes(node),
+                    "code": None,
+                    "layout": None,
+                    "line": unit.line,
+                }
+                self.cache.save(unit.key, cached_unit)
+                compiled += 1
+            else:
+                move_unit(cached_unit, unit.line)
+            cached_units.append(cached_unit)
+        self.stats = CacheStats(len(units), len(units) - compiled, 0, compiled)
+
+        # The functions are put together by name: a name may only be used by one unit.
+        owners = {}
+        for index, cached_unit in enumerate(cached_units):
+            for depth, order, scope_type, scope_name in cached_unit["scopes"]:
+                if owners.setdefault(scope_name, index) != index:
+                    return self.generate_whole(source, units)
+
+        program = simple_ast.ProgramNode(name, children=[unit["tree"] for unit in cached_units])
+        self.symbol_tables = simple_ast.Node.generate_symbol_tables(program, file=self.diagnostics)
+        self.constant_pool = self.symbol_tables[name].constant_pool
+        self.layout = layout_memory(self.symbol_tables.values())
+
+        simple_ast.print_banner("WALKING THROUGH THE AST", "GENERATING CODE", file=self.diagnostics)
+        generate_code_static_data(self.emitter, self.layout)
+
+        # The functions of every unit, in the order of a whole compilation: breadth-first,
+        # so by depth first, then by unit.
+        functions = []
+        reused = 0
+        for index, (unit, cached_unit) in enumerate(zip(units, cached_units)):
+            layout = scopes_layout(cached_unit["scopes"], self.symbol_tables)
+            if cached_unit["code"] is None or cached_unit["layout"] != layout:
+                emitter = CodeEmitter()
+                visit_tree(
+                    cached_unit["tree"],
+                    simple_ast.code_visitors(emitter),
+                    scope=self.symbol_tables[name],
+                )
+                cached_unit["code"] = emitter.functions
+                cached_unit["layout"] = layout
+                self.cache.save(unit.key, cached_unit)
+            else:
+                reused += 1
+
+            for depth, order, scope_type, scope_name in cached_unit["scopes"]:
+                if scope_type in (FUNCTION, PROCEDURE) and scope_name in cached_unit["code"]:
+                    functions.append((depth, index, order, scope_name))
+
+        for depth, index, order, scope_name in sorted(functions):
+            code = cached_units[index]["code"]
+            self.emitter.functions.setdefault(scope_name, code[scope_name])
+
+        self.stats = self.stats._replace(reused=reused)
+        return self.emitter.render()
+
+    # generate_whole(source, units) => the generated C of the source, compiled as a whole.
+    def generate_whole(self, source, units):
+        self.diagnostics.seek(0)
+        self.diagnostics.truncate()
+        code = super().generate(source)
+        self.stats = CacheStats(len(units), 0, 0, len(units))
+        return code
+
+
+# report(stats) => returns the line reporting the CacheStats of a compilation.
+def report(stats) -> str:
+    if not stats.units:
+        return "incremental: compiled as a whole (not split into units)"
+    return "incremental: {} units | {} cached, {} with their C | {} compiled | hit rate {:.1f}%".format(
+        stats.units,
+        stats.cached,
+        stats.reused,
+        stats.compiled,
+        100.0 * stats.cached / stats.units,
+    )
+
+
+# ----------------------------------------------------------------------------
+# Compiles a file incrementally, like "python simple_ast.py <filename> --generate":
+#   python incremental.py <filename> [--no-fold] [--output <file>] [--cache-dir <dir>]
+# writes the generated C to yourmain.h (or the --output file), the diagnostics and the cache
+# report to stderr.
+# ----------------------------------------------------------------------------
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0].startswith("--"):
+        print(
+            "usage: python incremental.py <filename> [--no-fold] [--output <file>] "
+            "[--cache-dir <dir>]",
+            file=sys.stderr,
+        )
+        return 2
+
+    output = "yourmain.h"
+    cache_directory = UNIT_CACHE_DIRECTORY
+    if "--output" in argv:
+        output = argv[argv.index("--output") + 1]
+    if "--cache-dir" in argv:
+        cache_directory = argv[argv.index("--cache-dir") + 1]
+
+    with open(argv[0], "r") as file:
+        source = file.read()
+    compilation = IncrementalCompilation("--no-fold" not in argv, cache_directory)
+    result = compilation.compile(source)
+
+    sys.stderr.write(result.diagnostics)
+    print(report(compilation.stats), file=sys.stderr)
+    if not result.ok:
+        print("Compilation failed: {}".format(result.error), file=sys.stderr)
+        return 1
+
+    with open(output, "w") as file:
+        file.write(result.code)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,419 @@
+# This file holds the intermediate representation (IR) of the generated code: a typed three-address
+# code, between the AST and the C code of the f23 virtual machine (see ir_builder.py for how it is
+# built from the AST, and code_generation.py for how it is lowered to C).
+#
+# A function is a list of basic blocks; every block is a list of instructions, ended by one
+# terminator (a jump, a conditional branch or a return), and is only entered at its start.
+# Instructions work on:
+#   VirtualRegister => a value computed by an instruction, "integer" or "double"; there are as
+#                      many as needed, they are allocated to the R and F registers when lowering
+#                      (see register_allocation.py).
+#   Constant        => an integer or double known at compile time.
+#   Address         => a place in memory: Mem, FMem or SMem, at a word (or byte, for SMem)
+#                      location, plus an index for an array element.
+# Variables live in memory: they are read by a Load and written by a Store, until register
+# allocation promotes those of the function itself to registers. The built in functions are calls
+# of the f23.c runtime (print_int, get_int...); a function or procedure of the program is invoked
+# through its activation record on the stack (see memory_layout.py): its arguments are stored
+# below SR before, and its value is loaded from there after. An array is passed by reference: the
+# index of its first element in Mem, and its length; its elements are then read and written
+# through an Address indexed by that base.
+
+from constant_folding import format_constant
+
+INTEGER = "integer"
+DOUBLE = "double"
+
+# Comparison => the comparison that is true when it is false.
+NEGATED_COMPARISONS = {"==": "!=", "!=": "==", "<": ">=", ">=": "<", ">": "<=", "<=": ">"}
+
+
+class VirtualRegister:
+    __slots__ = ("number", "dtype")
+
+    def __init__(self, number, dtype):
+        self.number = number
+        self.dtype = dtype
+
+    def __repr__(self):
+        return "%{}{}".format("d" if self.dtype == DOUBLE else "i", self.number)
+
+
+class Constant:
+    __slots__ = ("value", "dtype")
+
+    def __init__(self, value, dtype):
+        self.value = value
+        self.dtype = dtype
+
+    def __repr__(self):
+        return format_constant(self.value)[0]
+
+
+class Address:
+    # memory => "Mem", "FMem" or "SMem"; base => the location of the variable (of the first
+    # element of an array); index => the operand of the element of an array, or None;
+    # name => the variable, for the listings; register => None for the static data, "FR" when
+    # base is an offset from the frame register (a slot of the stack frame), or "SR" from the
+    # stack register (a slot of the record of a function called).
+    __slots__ = ("memory", "base", "index", "name", "register")
+
+    def __init__(self, memory, base, index=None, name=None, register=None):
+        self.memory = memory
+        self.base = base
+        self.index = index
+        self.name = name
+        self.register = register
+
+    # dtype => the type of the values at the address.
+    @property
+    def dtype(self):
+        return DOUBLE if self.memory == "FMem" else INTEGER
+
+    # key() => what tells the variable apart from the others, for a variable (no index).
+    def key(self):
+        return self.memory, self.register, self.base
+
+    # with_index(index) => the same address, with another index.
+    def with_index(self, index):
+        return Address(self.memory, self.base, index, self.name, self.register)
+
+    def __repr__(self):
+        base = self.base
+        if self.register is not None:
+            base = "{} {} {}".format(self.register, "-" if base < 0 else "+", abs(base))
+        if self.index is None:
+            return "{}[{}]".format(self.memory, base)
+        return "{}[{} + {}]".format(self.memory, base, self.index)
+
+
+# registers_of(operands) => the virtual registers among the operands (and the indexes of addresses).
+def registers_of(operands):
+    registers = []
+    for operand in operands:
+        if isinstance(operand, Address):
+            operand = operand.index
+        if isinstance(operand, VirtualRegister):
+            registers.append(operand)
+    return registers
+
+
+# ----------------------------------------------------------------------------
+# The instructions. Every one has:
+#   dest       => the virtual register it defines, or None;
+#   operands() => what it reads (registers, constants, addresses), the slots named by OPERANDS;
+#   uses()     => the virtual registers it reads.
+# ----------------------------------------------------------------------------
+class Instruction:
+    __slots__ = ("dest",)
+    OPERANDS = ()
+
+    def operands(self):
+        return tuple(getattr(self, slot) for slot in self.OPERANDS)
+
+    def uses(self):
+        return registers_of(self.operands())
+
+    # replace_uses(replacements) => reads the operand replacements[register] instead of every
+    # virtual register (number) it maps, here and in the indexes of addresses.
+    def replace_uses(self, replacements):
+        for slot in self.OPERANDS:
+            setattr(self, slot, replace_operand(getattr(self, slot), replacements))
+
+
+# replace_operand(operand, replacements) => the operand, with the replacements of replace_uses().
+def replace_operand(operand, replacements):
+    if isinstance(operand, VirtualRegister):
+        return replacements.get(operand.number, operand)
+    if isinstance(operand, Address) and isinstance(operand.index, VirtualRegister):
+        index = replacements.get(operand.index.number, operand.index)
+        return operand if index is operand.index else operand.with_index(index)
+    return operand
+
+
+# dest := memory[address]
+class Load(Instruction):
+    __slots__ = ("address",)
+    OPERANDS = ("address",)
+
+    def __init__(self, dest, address):
+        self.dest = dest
+        self.address = address
+
+    def __repr__(self):
+        return "{} = load {}".format(self.dest, self.address)
+
+
+# memory[address] := source
+class Store(Instruction):
+    __slots__ = ("address", "source")
+    OPERANDS = ("address", "source")
+
+    def __init__(self, address, source):
+        self.dest = None
+        self.address = address
+        self.source = source
+
+    def __repr__(self):
+        return "store {}, {}".format(self.address, self.source)
+
+
+# dest := source (a constant, or another register)
+class Copy(Instruction):
+    __slots__ = ("source",)
+    OPERANDS = ("source",)
+
+    def __init__(self, dest, source):
+        self.dest = dest
+        self.source = source
+
+    def __repr__(self):
+        return "{} = {}".format(self.dest, self.source)
+
+
+# dest := left operator right, where operator is + - * / %
+class Binary(Instruction):
+    __slots__ = ("operator", "left", "right")
+    OPERANDS = ("left", "right")
+
+    def __init__(self, dest, operator, left, right):
+        self.dest = dest
+        self.operator = operator
+        self.left = left
+        self.right = right
+
+    def __repr__(self):
+        return "{} = {} {} {}".format(self.dest, self.left, self.operator, self.right)
+
+
+# dest := -source
+class Negate(Instruction):
+    __slots__ = ("source",)
+    OPERANDS = ("source",)
+
+    def __init__(self, dest, source):
+        self.dest = dest
+        self.source = source
+
+    def __repr__(self):
+        return "{} = -{}".format(self.dest, self.source)
+
+
+# dest := (double) source
+class Convert(Instruction):
+    __slots__ = ("source",)
+    OPERANDS = ("source",)
+
+    def __init__(self, dest, source):
+        self.dest = dest
+        self.source = source
+
+    def __repr__(self):
+        return "{} = double {}".format(self.dest, self.source)
+
+
+# dest := the word index of address in Mem (FR + base for a slot of the stack frame): where an
+# array passed by reference starts.
+class AddressOf(Instruction):
+    __slots__ = ("address",)
+    OPERANDS = ("address",)
+
+    def __init__(self, dest, address):
+        self.dest = dest
+        self.address = address
+
+    def __repr__(self):
+        return "{} = address {}".format(self.dest, self.address)
+
+
+# dest := the word index of size new words on the stack, below SR (SR is moved down to it); they
+# are given back when the function returns.
+class Allocate(Instruction):
+    __slots__ = ("size",)
+    OPERANDS = ("size",)
+
+    def __init__(self, dest, size):
+        self.dest = dest
+        self.size = size
+
+    def __repr__(self):
+        return "{} = allocate {}".format(self.dest, self.size)
+
+
+# dest := function(arguments), a function of the f23.c runtime; dest is None if it returns nothing.
+# An Address argument is passed as a pointer (&SMem[...] for print_string).
+class Call(Instruction):
+    __slots__ = ("function", "arguments")
+
+    def __init__(self, dest, function, arguments=()):
+        self.dest = dest
+        self.function = function
+        self.arguments = tuple(arguments)
+
+    def operands(self):
+        return self.arguments
+
+    def replace_uses(self, replacements):
+        self.arguments = tuple(
+            replace_operand(argument, replacements) for argument in self.arguments
+        )
+
+    def __repr__(self):
+        call = "call {}({})".format(self.function, ", ".join(map(repr, self.arguments)))
+        return call if self.dest is None else "{} = {}".format(self.dest, call)
+
+
+# Invokes a function or procedure of the program; any register may hold something else after it.
+class Invoke(Instruction):
+    __slots__ = ("function",)
+
+    def __init__(self, function):
+        self.dest = None
+        self.function = function
+
+    def __repr__(self):
+        return "invoke {}".format(self.function)
+
+
+# ----------------------------------------------------------------------------
+# The terminators, which end every block: successors() => the blocks it can go to.
+# ----------------------------------------------------------------------------
+class Jump(Instruction):
+    __slots__ = ("target",)
+
+    def __init__(self, target):
+        self.dest = None
+        self.target = target
+
+    def successors(self):
+        return (self.target,)
+
+    def __repr__(self):
+        return "jump {}".format(self.target.name)
+
+
+# Goes to if_true when "left comparison right" holds, to if_false otherwise.
+class Branch(Instruction):
+    __slots__ = ("comparison", "left", "right", "if_true", "if_false")
+    OPERANDS = ("left", "right")
+
+    def __init__(self, comparison, left, right, if_true, if_false):
+        self.dest = None
+        self.comparison = comparison
+        self.left = left
+        self.right = right
+        self.if_true = if_true
+        self.if_false = if_false
+
+    def successors(self):
+        return (self.if_true, self.if_false)
+
+    def __repr__(self):
+        return "branch {} {} {}, {}, {}".format(
+            self.left, self.comparison, self.right, self.if_true.name, self.if_false.name
+        )
+
+
+# Returns from the function, with value (None for no value).
+class Return(Instruction):
+    __slots__ = ("value",)
+
+    def __init__(self, value=None):
+        self.dest = None
+        self.value = value
+
+    OPERANDS = ("value",)
+
+    def successors(self):
+        return ()
+
+    def __repr__(self):
+        return "return" if self.value is None else "return {}".format(self.value)
+
+
+class BasicBlock:
+    __slots__ = ("number", "instructions", "terminator")
+
+    def __init__(self, number):
+        self.number = number
+        self.instructions = []
+        self.terminator = None
+
+    @property
+    def name(self):
+        return "L{}".format(self.number)
+
+    def successors(self):
+        return () if self.terminator is None else self.terminator.successors()
+
+    def __repr__(self):
+        return "<BasicBlock {}>".format(self.name)
+
+
+# ----------------------------------------------------------------------------
+# A function of the IR: its blocks, in the order they are laid out (the first one is its entry),
+# and the counters of its blocks and virtual registers.
+# ----------------------------------------------------------------------------
+class IRFunction:
+    def __init__(self, name, return_type):
+        self.name = name
+        self.return_type = return_type
+        self.blocks = []
+        self.block_count = 0
+        self.register_count = 0
+
+        # The keys (see Address.key()) of the scalar variables of the function itself:
+        # register allocation may keep them in registers (see register_allocation.py).
+        self.variables = set()
+        # virtual register number => the Address of the variable it was promoted from.
+        self.homes = {}
+        # Words of the stack frame of the function (its slots are below FR), and the Frame made by
+        # the memory layout (see memory_layout.py), with the parameters and the return slot.
+        self.frame_size = 0
+        self.frame = None
+
+    # new_block() => a new block, not laid out yet (see place()).
+    def new_block(self):
+        block = BasicBlock(self.block_count)
+        self.block_count += 1
+        return block
+
+    # place(block) => lays out the block after the last one.
+    def place(self, block):
+        self.blocks.append(block)
+        return block
+
+    # new_register(dtype) => a new virtual register of the type given as parameter.
+    def new_register(self, dtype):
+        register = VirtualRegister(self.register_count, dtype)
+        self.register_count += 1
+        return register
+
+    # reachable_blocks() => the blocks that can be reached from the entry, in layout order.
+    def reachable_blocks(self):
+        if not self.blocks:
+            return []
+        reached = {self.blocks[0].number}
+        pending = [self.blocks[0]]
+        while pending:
+            for successor in pending.pop().successors():
+                if successor.number not in reached:
+                    reached.add(successor.number)
+                    pending.append(successor)
+        return [block for block in self.blocks if block.number in reached]
+
+    # remove_unreachable_blocks() => drops the blocks that can not be reached from the entry.
+    def remove_unreachable_blocks(self):
+        self.blocks = self.reachable_blocks()
+
+    # listing() => the IR of the function, as text.
+    def listing(self) -> str:
+        if self.return_type is None:
+            lines = ["procedure {}".format(self.name)]
+        else:
+            lines = ["function {} {}".format(self.return_type, self.name)]
+        for block in self.blocks:
+            lines.append("{}:".format(block.name))
+            lines.extend("    {!r}".format(instruction) for instruction in block.instructions)
+            lines.append("    {!r}".format(block.terminator))
+        return "\n".join(lines) + "\n"
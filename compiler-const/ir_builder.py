@@ -0,0 +1,714 @@
+# This file builds the IR (see ir.py) of a function from its AST, once constants are folded and the
+# memory layout has placed its variables (see memory_layout.py).
+#
+# The statements of the function body are built in order, into basic blocks: if, while and do
+# statements become conditional branches and jumps between blocks, and && || ! conditions are
+# short circuited (a && b only computes b when a holds). Expressions are computed into virtual
+# registers, from left to right as in C; an operation with a double operand is done in double.
+#
+# A function or procedure of the program is called through its activation record (see
+# memory_layout.py): the values of the arguments are computed first, then stored in the record,
+# below SR, the callee is invoked, and the value of a function is loaded from its return slot.
+# The variables of the function live in its own record, at offsets from FR.
+#
+# An array is passed by reference, whatever its size: the index of its first element in Mem and
+# its length are stored in the record, and the elements of an array parameter are read and written
+# where that base points, in the array of the caller. An array of a function sized at run time is
+# allocated on the stack when its definition runs, and has a reference in the record too.
+#
+# A statement the IR cannot express yet (a string expression, a variable that has no place in
+# memory...) can not be compiled: the statement and its line are reported as a CompileError, and
+# no code is generated for the program. So is a statement of a nested function or procedure that
+# uses a variable in the record of the function it is defined in: FR is the record of the nested
+# one, which has no link to the record of the other (its variables in static data, strings, and
+# those of the program can be used).
+
+from constant_folding import DOUBLE_CONSTANT, INTEGER_CONSTANT, convert, parse_constant
+from ir import (
+    DOUBLE,
+    INTEGER,
+    Address,
+    AddressOf,
+    Allocate,
+    Binary,
+    Branch,
+    Call,
+    Constant,
+    Convert,
+    Invoke,
+    IRFunction,
+    Jump,
+    Load,
+    Negate,
+    Return,
+    Store,
+)
+from memory_layout import ENTRY_FUNCTION
+from node_types import *
+from symbol_table_properties import (
+    ARRAY_SIZE,
+    MEM_LOCATION,
+    MEMORY,
+    PARAMETER,
+    REFERENCE,
+    REGISTER,
+)
+
+# Built in function => (function of the f23.c runtime, data type of its argument or result).
+PRINT_FUNCTIONS = {
+    "print_integer": ("print_int", INTEGER),
+    "print_double": ("print_double", DOUBLE),
+}
+READ_FUNCTIONS = {
+    "read_integer": ("get_int", INTEGER),
+    "read_double": ("get_double", DOUBLE),
+}
+
+
+# Raised while building a statement the IR cannot express yet (see above); statement() gives it
+# the statement it was raised in, whose message the code generation walk reports.
+class Unsupported(Exception):
+    statement = None
+
+    # message(function_name) => the message of the CompileError reported for it: the kind of
+    # the statement (e.g. "function_call"), its function, its line, and what can not be built.
+    def message(self, function_name):
+        statement = kind = self.statement
+        if statement is not None and statement.type == STATEMENT:
+            kind = statement.children[0]
+        return 'Error! Statement "{}" of "{}" at line {} can not be compiled: {}.'.format(
+            NODE_TYPE_NAMES[kind.type] if kind is not None else "?",
+            function_name,
+            getattr(statement, "lineno", 0),
+            self,
+        )
+
+
+# ----------------------------------------------------------------------------
+# Builds the IRFunction of a "function" or "procedure" node; the variables it uses are looked up
+# in the symbol table of the function (and its parents), which holds their place in memory.
+# ----------------------------------------------------------------------------
+class IRBuilder:
+    def __init__(self, function_node, symbol_table):
+        self.node = function_node
+        self.symbol_table = symbol_table
+        self.function = IRFunction(function_node.name, getattr(function_node, "return_type", None))
+        self.function.frame = symbol_table.frame
+        if symbol_table.frame is not None:
+            self.function.frame_size = symbol_table.frame.local_words
+        # The block instructions are added to; it is always laid out and not terminated yet.
+        self.block = self.function.place(self.function.new_block())
+
+    # build() => the IRFunction of the function, with its unreachable blocks removed.
+    def build(self) -> IRFunction:
+        # The body is the last child (a procedure without parameters has no "arguments" node).
+        self.body(self.node.children[-1])
+        self.terminate(Return())
+        self.function.remove_unreachable_blocks()
+        return self.function
+
+    # ----------------------------------------------------------------------------
+    # Blocks.
+    # ----------------------------------------------------------------------------
+    def emit(self, instruction):
+        self.block.instructions.append(instruction)
+        return instruction.dest
+
+    # terminate(terminator) => ends the current block; what comes after it, until the next block
+    # is started, goes into a new block that nothing jumps to.
+    def terminate(self, terminator):
+        self.block.terminator = terminator
+        self.block = self.function.place(self.function.new_block())
+
+    # start(block) => lays out the block, and adds the next instructions to it; the current block
+    # falls through to it (the jump is left out of the C code, see code_generation.py).
+    def start(self, block):
+        self.block.terminator = Jump(block)
+        self.block = self.function.place(block)
+
+    # ----------------------------------------------------------------------------
+    # Statements.
+    # ----------------------------------------------------------------------------
+    def body(self, node):
+        if node.type == SCOPE_BODY:
+            for child in node.children:
+                self.statement(child)
+        else:
+            self.statement(node)
+
+    # statement(node) => builds a statement; an Unsupported raised while building it is given
+    # the statement (the innermost one, for the statements of an if, do or while).
+    def statement(self, node):
+        try:
+            self.build_statement(node)
+        except Unsupported as error:
+            if error.statement is None:
+                error.statement = node
+            raise
+
+    def build_statement(self, node):
+        node_type = node.type
+        if node_type == STATEMENT:
+            self.build_statement(node.children[0])
+        elif node_type == SCOPE_BODY:
+            self.body(node)
+        elif node_type == VARIABLE_ASSIGNMENT:
+            self.assignment(node)
+        elif node_type == VARIABLE_DECLARATION:
+            self.declaration(node)
+        elif node_type == VARIABLE_DECREMENT_INCREMENT:
+            self.increment(node)
+        elif node_type == FUNCTION_CALL:
+            self.call(node)
+        elif node_type == FUNCTION_RETURN:
+            self.function_return(node)
+        elif node_type == IF:
+            self.if_statement(node)
+        elif node_type == WHILE:
+            self.while_statement(node)
+        elif node_type == DO:
+            self.do_statement(node)
+        elif node_type == PROCEDURE_CALL:
+            self.invoke(node.name, self.arguments(node.children[0]))
+        elif node_type == VARIABLE_DEFINITION or node_type == ARRAY_VARIABLE_DEFINITION:
+            self.definition(node)
+        # Nested functions and procedures are built on their own.
+
+    # definition(node) => allocates the arrays sized at run time of a definition (or of the
+    # "identifiers" after a declaration); any other variable only takes memory (see
+    # memory_layout.py).
+    def definition(self, node):
+        pending = [node]
+        while pending:
+            node = pending.pop()
+            children = node.children
+            if node.type == ARRAY_VARIABLE_DEFINITION and len(children) > 2:
+                self.allocate_array(children[1].name, children[2])
+            elif node.type == VARIABLE_DEFINITION:
+                pending.append(children[1])
+            elif node.type == IDENTIFIERS:
+                if children[0].type == IDENTIFIER and len(children) > 2:
+                    self.allocate_array(children[0].name, children[1])
+                pending.append(children[-1])
+
+    def allocate_array(self, name, size):
+        properties = self.symbol_table.get_visible(name)
+        if not properties.get(REFERENCE) or properties.get(PARAMETER) is not None:
+            return
+        length = self.index(size)
+        base = self.emit(Allocate(self.function.new_register(INTEGER), length))
+        self.store(self.reference(name, properties), base)
+        self.store(self.reference(name, properties, 1), length)
+
+    # assignment(node) => builds "variable operator value" (or "array[index] operator value");
+    # returns the operand of the value stored, for chained assignments.
+    def assignment(self, node):
+        children = node.children
+        if len(children) == 4:
+            # An array element: IDENTIFIER, index, ASSIGN (a string), value.
+            address = self.element(children[0].name, children[1])
+            operator = children[2]
+        else:
+            address = self.variable(children[0].name)
+            operator = NODE_TYPE_NAMES[children[1].type]
+
+        value = self.value(children[-1])
+        if operator != ":=":
+            # "x += value" is "x := x + value" (and so on, for the other operators).
+            value = self.binary(operator[0], self.load(address), value)
+        return self.store(address, value)
+
+    def declaration(self, node):
+        # "variable_declaration" assigns its expression to the last variable of its definition
+        # ("integer i, n := 1" assigns n); the identifiers are chained in "identifiers" nodes.
+        definition, assign, expression, identifiers = node.children
+        self.definition(definition)
+        self.definition(identifiers)
+        identifier = None
+        pending = [definition.children[1]]
+        while pending:
+            child = pending.pop()
+            if child.type == IDENTIFIER:
+                identifier = child
+            elif child.type == IDENTIFIERS:
+                pending.extend(reversed(child.children))
+        if identifier is None:
+            raise Unsupported("declaration")
+        self.store(self.variable(identifier.name), self.expression(expression))
+
+    # increment(node) => builds "variable++" or "variable--"; returns the operand of the value
+    # the variable had before, as an index (a[i++]) uses it.
+    def increment(self, node):
+        address = self.variable(node.children[0].name)
+        value = self.load(address)
+        operator = NODE_TYPE_NAMES[node.children[1].type][0]
+        self.store(address, self.binary(operator, value, Constant(1, INTEGER)))
+        return value
+
+    def function_return(self, node):
+        value = node.children[0]
+        if value.type == IDENTIFIER:
+            value = self.load(self.variable(value.name))
+        elif value.type == CONSTANT:
+            value = self.constant(value)
+        else:
+            value = self.value(value)
+        if self.function.return_type not in (INTEGER, DOUBLE):
+            raise Unsupported("return from a {}".format(self.function.return_type or "procedure"))
+        value = self.convert(value, self.function.return_type)
+
+        # main returns its value to f23.c (the exit code); a function called returns it in the
+        # return slot of its record.
+        frame = self.function.frame
+        if self.function.name != ENTRY_FUNCTION and frame is not None:
+            self.store(Address(frame.return_memory, frame.return_location, register="FR"), value)
+            value = None
+        self.terminate(Return(value))
+
+    # ----------------------------------------------------------------------------
+    # Control flow.
+    # ----------------------------------------------------------------------------
+    def if_statement(self, node):
+        # An "if_statement" holds its "if" (condition, body), and what comes after "else":
+        # a statement or scope body, or the "if" and "after else" of an "else if".
+        join = self.function.new_block()
+        self.if_chain(node.children[0], node.children[1] if len(node.children) > 1 else None, join)
+        self.start(join)
+
+    def if_chain(self, if_node, after_else, join):
+        if if_node.type == EMPTY:
+            if after_else is not None:
+                raise Unsupported("empty if with an else")
+            return
+
+        condition, body = if_node.children
+        then_block = self.function.new_block()
+        else_block = join if after_else is None else self.function.new_block()
+        self.condition(condition, then_block, else_block)
+
+        self.start(then_block)
+        self.body(body)
+        self.terminate(Jump(join))
+        if after_else is None:
+            return
+
+        self.start(else_block)
+        if after_else.type == AFTER_ELSE_ELSE:
+            self.body(after_else.children[0])
+        else:
+            self.if_chain(after_else.children[0], after_else.children[1], join)
+        self.terminate(Jump(join))
+
+    def while_statement(self, node):
+        condition, body = node.children
+        header = self.function.new_block()
+        body_block = self.function.new_block()
+        exit_block = self.function.new_block()
+
+        self.start(header)
+        self.condition(condition, body_block, exit_block)
+        self.start(body_block)
+        self.body(body)
+        self.terminate(Jump(header))
+        self.start(exit_block)
+
+    def do_statement(self, node):
+        # "do ( init; condition; step ) body": the step runs after the body, every time.
+        init, condition, step, body = node.children
+        self.build_statement(init)
+
+        header = self.function.new_block()
+        body_block = self.function.new_block()
+        exit_block = self.function.new_block()
+
+        self.start(header)
+        self.condition(condition, body_block, exit_block)
+        self.start(body_block)
+        self.body(body)
+        self.build_statement(step)
+        self.terminate(Jump(header))
+        self.start(exit_block)
+
+    # ----------------------------------------------------------------------------
+    # Builds the branches of a "boolean_logic" condition: to if_true when it holds, to if_false
+    # otherwise. && and || only compute their right side when the left one does not decide.
+    # ----------------------------------------------------------------------------
+    def condition(self, node, if_true, if_false):
+        children = node.children
+        if len(children) == 1:
+            self.comparison(children[0], if_true, if_false)
+        elif len(children) == 2:
+            # "! arithmetic_logic"
+            self.comparison(children[1], if_false, if_true)
+        else:
+            right = self.function.new_block()
+            if children[1].comparison == "&&":
+                self.comparison(children[0], right, if_false)
+            else:
+                self.comparison(children[0], if_true, right)
+            self.start(right)
+            self.comparison(children[2], if_true, if_false)
+
+    def comparison(self, node, if_true, if_false):
+        left, comparison, right = node.children
+        left = self.value(left)
+        right = self.value(right)
+        if left.dtype != right.dtype:
+            left, right = self.convert(left, DOUBLE), self.convert(right, DOUBLE)
+        self.terminate(Branch(comparison.comparison, left, right, if_true, if_false))
+
+    # ----------------------------------------------------------------------------
+    # Calls of the built in functions, and of the functions of the program (see invoke());
+    # call(node) => the operand of the value returned, if any.
+    # ----------------------------------------------------------------------------
+    def call(self, node):
+        function_node, arguments = node.children
+        if function_node.type == IDENTIFIER:
+            return self.invoke(function_node.name, self.arguments(arguments))
+        function_name = NODE_TYPE_NAMES[function_node.type]
+        arguments = self.arguments(arguments)
+
+        if function_name in READ_FUNCTIONS:
+            runtime_function, dtype = READ_FUNCTIONS[function_name]
+            if not arguments:
+                return self.emit(Call(self.function.new_register(dtype), runtime_function))
+            # "read_integer( n )" reads a value into every variable given, in order.
+            for argument in arguments:
+                identifier, index = self.read_target(argument)
+                if index is None:
+                    address = self.variable(identifier.name)
+                else:
+                    address = self.element(identifier.name, index)
+                self.store(
+                    address, self.emit(Call(self.function.new_register(dtype), runtime_function))
+                )
+            return None
+
+        if len(arguments) != 1:
+            raise Unsupported("print of {} arguments".format(len(arguments)))
+        if function_name == "print_string":
+            self.emit(Call(None, "print_string", [self.string(arguments[0])]))
+            return None
+        if function_name not in PRINT_FUNCTIONS:
+            raise Unsupported(function_name)
+
+        runtime_function, dtype = PRINT_FUNCTIONS[function_name]
+        value = self.convert(self.argument(arguments[0]), dtype)
+        self.emit(Call(None, runtime_function, [value]))
+        return None
+
+    # arguments(node) => the arguments of a call: "term" nodes, and (identifier, index) pairs for
+    # the "identifiers" ones, whose index is None when the identifier is not an array element.
+    # The arguments of a procedure call are a single "identifiers" or "term" node.
+    @staticmethod
+    def arguments(node):
+        arguments = []
+        while node.type == FUNCTION_CALL_ARGS or node.type == PROCEDURE_CALL_ARGS:
+            if node.type == PROCEDURE_CALL_ARGS:
+                argument, node = node.children[0], node.children[0]
+            else:
+                argument, node = node.children
+            if argument.type != IDENTIFIERS:
+                arguments.append(argument)
+                continue
+            while argument.type == IDENTIFIERS:
+                children = argument.children
+                if children[0].type == IDENTIFIER:
+                    index = children[1] if len(children) > 2 else None
+                    arguments.append((children[0], index))
+                argument = children[-1]
+        return arguments
+
+    # read_target(argument) => the (identifier, index) of the variable (or array element) an
+    # argument of a read is, whether it was parsed as "identifiers" or as a "term".
+    @staticmethod
+    def read_target(argument):
+        if isinstance(argument, tuple):
+            return argument
+        node = argument
+        while node.type != FACTOR and len(node.children) == 1:
+            node = node.children[0]
+        children = node.children
+        if node.type == FACTOR and getattr(children[0], "type", None) == IDENTIFIER:
+            return children[0], children[1] if len(children) > 1 else None
+        raise Unsupported("read into an expression")
+
+    def argument(self, argument):
+        if isinstance(argument, tuple):
+            identifier, index = argument
+            if index is None:
+                return self.load(self.variable(identifier.name))
+            return self.load(self.element(identifier.name, index))
+        return self.expression(argument)
+
+    # string(argument) => the address in SMem of a string constant, of a string variable, or of
+    # the string a string parameter refers to.
+    def string(self, argument):
+        if isinstance(argument, tuple):
+            identifier, index = argument
+            properties = self.symbol_table.get_visible(identifier.name)
+            if index is not None or properties is None or properties.get(MEMORY) != "SMem":
+                raise Unsupported("string argument")
+            if properties.get(PARAMETER) is not None:
+                location = self.load(self.address(identifier.name, properties, memory="Mem"))
+                return Address("SMem", 0, location, name=identifier.name)
+            return Address("SMem", properties[MEM_LOCATION], name=identifier.name)
+
+        node = argument
+        while node.type != CONSTANT:
+            if node.type == IDENTIFIER:
+                return self.string((node, None))
+            if len(node.children) != 1 or not hasattr(node.children[0], "type"):
+                raise Unsupported("string expression")
+            node = node.children[0]
+        # The constant was given its place in SMem by the memory layout (one O(1) look-up).
+        const = self.symbol_table.get_constant(node.dtype, node.value)
+        if const is None or const.get(MEM_LOCATION) is None:
+            raise Unsupported("string constant")
+        return Address("SMem", const[MEM_LOCATION], name=node.value)
+
+    # ----------------------------------------------------------------------------
+    # Calls of the functions and procedures of the program: the record of the callee starts below
+    # the SR of the caller (its FR will be SR - pushed words - 1, see memory_layout.py), so every
+    # argument is stored at an offset from SR; the values of all the arguments are computed first,
+    # as computing one may call another function. invoke(name, arguments) => the operand of the
+    # value returned, or None for a procedure.
+    # ----------------------------------------------------------------------------
+    def invoke(self, name, arguments):
+        callee = self.symbol_table.symbol_tables.get(name)
+        if callee is None or callee.frame is None:
+            raise Unsupported("call of {}".format(name))
+        frame = callee.frame
+        if len(arguments) != len(frame.parameters):
+            raise Unsupported("call of {} with {} arguments".format(name, len(arguments)))
+
+        below = -frame.pushed_words() - 1
+        stores = []
+        for argument, (parameter, properties) in zip(arguments, frame.parameters):
+            location = below + properties[MEM_LOCATION]
+            if properties.get(REFERENCE):
+                base, length = self.array_reference(argument, properties[MEMORY])
+                stores.append((Address("Mem", location, name=parameter, register="SR"), base))
+                stores.append((Address("Mem", location + 1, name=parameter, register="SR"), length))
+            elif properties.get(ARRAY_SIZE) is not None:
+                raise Unsupported("array argument {}".format(parameter))
+            elif properties[MEMORY] == "SMem":
+                # The location of the string in SMem.
+                string = self.string(argument)
+                value = string.index if string.index is not None else Constant(string.base, INTEGER)
+                stores.append((Address("Mem", location, name=parameter, register="SR"), value))
+            else:
+                slot = Address(properties[MEMORY], location, name=parameter, register="SR")
+                stores.append((slot, self.convert(self.argument(argument), slot.dtype)))
+
+        for slot, value in stores:
+            self.store(slot, value)
+        self.emit(Invoke(name))
+        if frame.return_memory is None:
+            return None
+        return self.load(Address(frame.return_memory, below + frame.return_location, register="SR"))
+
+    # array_reference(argument, memory) => the operands of the reference to the array given as
+    # argument: the index in Mem of its first element, and its length; memory is the one of the
+    # elements of the parameter. The only argument of a call is a "term", not an (identifier,
+    # index) pair: the identifier is the one of its factor.
+    def array_reference(self, argument, memory):
+        if not isinstance(argument, tuple):
+            node = argument
+            while node.type != FACTOR and node.type != IDENTIFIER and len(node.children) == 1:
+                node = node.children[0]
+            if node.type == FACTOR and len(node.children) == 1:
+                node = node.children[0]
+            if getattr(node, "type", None) != IDENTIFIER:
+                raise Unsupported("array argument")
+            argument = node, None
+        if argument[1] is not None:
+            raise Unsupported("array argument")
+        name = argument[0].name
+        properties = self.symbol_table.get_visible(name)
+        if properties is None or properties.get(ARRAY_SIZE) is None:
+            raise Unsupported("array argument {}".format(name))
+        if properties.get(MEMORY) != memory:
+            raise Unsupported("array argument {} in {}".format(name, properties.get(MEMORY)))
+
+        if properties.get(REFERENCE):
+            return (
+                self.load(self.reference(name, properties)),
+                self.load(self.reference(name, properties, 1)),
+            )
+        length = Constant(properties[ARRAY_SIZE] or 1, INTEGER)
+        if properties.get(REGISTER) is None:
+            return Constant(properties[MEM_LOCATION], INTEGER), length
+        # An array of the record of the function: its index is only known from FR.
+        array = self.address(name, properties, Constant(0, INTEGER))
+        return self.emit(AddressOf(self.function.new_register(INTEGER), array)), length
+
+    # ----------------------------------------------------------------------------
+    # Expressions; each returns an operand: a Constant, or the VirtualRegister of the value.
+    # ----------------------------------------------------------------------------
+
+    # value(node) => the operand of the right hand side of an assignment (or a comparison).
+    def value(self, node):
+        node_type = node.type
+        if node_type == EXPRESSION or node_type == TERM:
+            return self.expression(node)
+        if node_type == VARIABLE_ASSIGNMENT:
+            return self.assignment(node)
+        if node_type == FUNCTION_CALL:
+            value = self.call(node)
+            if value is None:
+                raise Unsupported("call without a value")
+            return value
+        raise Unsupported(NODE_TYPE_NAMES[node_type])
+
+    # expression(node) => the operand of an expression (terms joined by + -) or of a term
+    # (factors joined by * / %), computed from left to right.
+    def expression(self, node):
+        node_type = node.type
+        if node_type == FACTOR:
+            return self.factor(node)
+        if node_type != EXPRESSION and node_type != TERM:
+            raise Unsupported(NODE_TYPE_NAMES[node_type])
+
+        result = self.expression(node.children[0])
+        while len(node.children) == 3:
+            operator = node.children[1].operator
+            node = node.children[2]
+            result = self.binary(operator, result, self.expression(node.children[0]))
+        return result
+
+    def factor(self, node):
+        children = node.children
+        negative = not hasattr(children[0], "type")
+        if negative:
+            # The MINUS token is kept as a string.
+            children = children[1:]
+
+        operand = children[0]
+        if len(children) > 1:
+            value = self.load(self.element(operand.name, children[1]))
+        elif operand.type == CONSTANT:
+            value = self.constant(operand)
+        elif operand.type == IDENTIFIER:
+            value = self.load(self.variable(operand.name))
+        else:
+            value = self.expression(operand)
+
+        if not negative:
+            return value
+        if isinstance(value, Constant):
+            return Constant(-value.value, value.dtype)
+        return self.emit(Negate(self.function.new_register(value.dtype), value))
+
+    @staticmethod
+    def constant(node):
+        if node.dtype == INTEGER_CONSTANT:
+            return Constant(parse_constant(node.value, node.dtype), INTEGER)
+        if node.dtype == DOUBLE_CONSTANT:
+            return Constant(parse_constant(node.value, node.dtype), DOUBLE)
+        raise Unsupported("string constant in an expression")
+
+    # binary(operator, left, right) => the operand of "left operator right".
+    def binary(self, operator, left, right):
+        dtype = INTEGER if left.dtype == INTEGER and right.dtype == INTEGER else DOUBLE
+        if operator == "%" and dtype == DOUBLE:
+            raise Unsupported("% on doubles")
+        left, right = self.convert(left, dtype), self.convert(right, dtype)
+        return self.emit(Binary(self.function.new_register(dtype), operator, left, right))
+
+    # convert(operand, dtype) => the operand, as a value of the data type given as parameter.
+    def convert(self, operand, dtype):
+        if operand.dtype == dtype:
+            return operand
+        if isinstance(operand, Constant):
+            value = convert(operand.value, dtype)
+            if value is None:
+                raise Unsupported("constant out of range")
+            return Constant(value, dtype)
+        return self.emit(Convert(self.function.new_register(dtype), operand))
+
+    # ----------------------------------------------------------------------------
+    # Variables in memory.
+    # ----------------------------------------------------------------------------
+
+    # variable(name) => the Address of a (scalar, integer or double) variable.
+    def variable(self, name):
+        properties = self.symbol_table.get_visible(name)
+        if properties is None or properties.get(ARRAY_SIZE) is not None:
+            raise Unsupported("variable {}".format(name))
+        return self.address(name, properties)
+
+    # element(name, index) => the Address of an element of an array; the index is an expression,
+    # or "i++" / "i--", whose value is the one i had before.
+    def element(self, name, index):
+        properties = self.symbol_table.get_visible(name)
+        if properties is None or properties.get(ARRAY_SIZE) is None:
+            raise Unsupported("array {}".format(name))
+        return self.address(name, properties, self.index(index))
+
+    # index(node) => the operand of an index (or of the size of an array): an integer expression,
+    # or "i++" / "i--".
+    def index(self, node):
+        if node.type == VARIABLE_DECREMENT_INCREMENT:
+            value = self.increment(node)
+        else:
+            value = self.expression(node)
+        if value.dtype != INTEGER:
+            raise Unsupported("index of type {}".format(value.dtype))
+        return value
+
+    # address(name, properties, index, memory) => the Address of a variable (of an element of an
+    # array), through memory if given (the word of a string parameter is read through Mem).
+    def address(self, name, properties, index=None, memory=None):
+        memory = memory or properties.get(MEMORY)
+        if memory not in ("Mem", "FMem"):
+            raise Unsupported("{} in {}".format(name, memory))
+        register = properties.get(REGISTER)
+        scope = self.symbol_table.lookup(name)
+        if register is not None and scope is not self.symbol_table:
+            # FR is the record of this function, not the one of the enclosing function.
+            raise Unsupported(enclosing_variable(name, scope))
+        if properties.get(REFERENCE):
+            # An element of the array the reference points to.
+            base = self.load(self.reference(name, properties))
+            if isinstance(index, Constant):
+                return Address(memory, index.value, base, name)
+            return Address(memory, 0, self.binary("+", base, index), name)
+        address = Address(memory, properties[MEM_LOCATION], index, name, register)
+        if index is None and scope is self.symbol_table:
+            self.function.variables.add(address.key())
+        return address
+
+    # reference(name, properties, word) => the Address of a word of the reference to an array, in
+    # the record of the function: 0 for the index of its first element, 1 for its length. Both are
+    # variables of the function, which it may keep in registers.
+    def reference(self, name, properties, word=0):
+        scope = self.symbol_table.lookup(name)
+        if scope is not self.symbol_table:
+            raise Unsupported(enclosing_variable(name, scope))
+        address = Address("Mem", properties[MEM_LOCATION] + word, name=name, register="FR")
+        self.function.variables.add(address.key())
+        return address
+
+    def load(self, address):
+        return self.emit(Load(self.function.new_register(address.dtype), address))
+
+    # store(address, value) => stores the value, as the variable holds it; returns its operand.
+    def store(self, address, value):
+        value = self.convert(value, address.dtype)
+        self.emit(Store(address, value))
+        return value
+
+
+# enclosing_variable(name, scope) => what can not be built when a nested function or procedure uses
+# a variable in the record of the function it is defined in: it has no link to that record.
+def enclosing_variable(name, scope):
+    return (
+        '"{}" is a variable of the enclosing "{}"; a nested function or procedure can only use'
+        " its own variables and those of the program"
+    ).format(name, scope.scope_name)
+
+
+# build_ir(function_node, symbol_table) => the IRFunction of a "function" node.
+def build_ir(function_node, symbol_table) -> IRFunction:
+    return IRBuilder(function_node, symbol_table).build()
@@ -0,0 +1,693 @@
+# This file optimizes the loops of a function of the IR (see ir.py), once its variables are kept in
+# virtual registers (see register_allocation.py), before the registers are allocated.
+#
+# The loops are the natural loops of the blocks: a jump back to a block that dominates it (its
+# header) closes a loop, made of the blocks that reach the jump without going through the header.
+# Every loop is given a preheader: a block that jumps to the header, that the code moved out of the
+# loop goes to (the block before the loop, or a new one). The loops are optimized innermost first:
+#   - a loop of one block, that counts an integer variable from a constant up or down to a
+#     constant, is unrolled when it runs a few times (UNROLL_TRIPS): its block is copied once per
+#     trip instead, and the variable is folded to its constant in every copy;
+#   - the computations that read no value written in the loop are hoisted to the preheader (the
+#     loop invariants), when the value they write is only read inside the loop, after them;
+#   - the index of an array element that is its base plus an induction variable (a variable
+#     written once in the loop, as i := i + c), plus a constant, is strength reduced: a pointer,
+#     base + i, is set in the preheader and moved by c where i is, and the element is read at
+#     pointer + constant, without an addition per access. A loop test on a variable that is then
+#     only counted is made on the pointer instead (p < base + n for i < n), and the variable is
+#     dropped.
+# A loop that invokes a function of the program is only unrolled: every value hoisted out of it, or
+# pointer made for it, would be saved before the call and loaded back after (see
+# save_across_calls() in register_allocation.py), which takes longer than computing it again.
+# The values computed and never read are removed last.
+
+import copy
+
+from constant_folding import convert, evaluate
+from ir import (
+    DOUBLE,
+    INTEGER,
+    NEGATED_COMPARISONS,
+    Address,
+    AddressOf,
+    Binary,
+    Branch,
+    Constant,
+    Convert,
+    Copy,
+    Invoke,
+    Jump,
+    Load,
+    Negate,
+    Store,
+    VirtualRegister,
+)
+from register_allocation import liveness
+
+# A loop that runs at most that many times is unrolled, if its copies make at most
+# UNROLL_INSTRUCTIONS instructions.
+UNROLL_TRIPS = 8
+UNROLL_INSTRUCTIONS = 64
+
+# Comparison => its value on two integers.
+COMPARISONS = {
+    "==": lambda left, right: left == right,
+    "!=": lambda left, right: left != right,
+    "<": lambda left, right: left < right,
+    "<=": lambda left, right: left <= right,
+    ">": lambda left, right: left > right,
+    ">=": lambda left, right: left >= right,
+}
+
+# Comparison => the one that holds with its operands swapped.
+SWAPPED_COMPARISONS = {"==": "==", "!=": "!=", "<": ">", ">": "<", "<=": ">=", ">=": "<="}
+
+
+# ----------------------------------------------------------------------------
+# What the optimization did to a function: the loops it found, the instructions hoisted out of
+# them, the pointers made for induction variables, the array accesses they reduced, the loop tests
+# made on a pointer, and the loops unrolled.
+# ----------------------------------------------------------------------------
+class LoopReport:
+    def __init__(self, name):
+        self.name = name
+        self.loops = 0
+        self.hoisted = 0
+        self.pointers = 0
+        self.reduced = 0
+        self.tests = 0
+        self.unrolled = 0
+
+
+# A natural loop: its header block, and the numbers of its blocks (the header included).
+class Loop:
+    def __init__(self, header, blocks):
+        self.header = header
+        self.blocks = blocks
+
+
+# ----------------------------------------------------------------------------
+# Optimizes the loops of a function in place; returns the LoopReport.
+# ----------------------------------------------------------------------------
+def optimize_loops(ir_function):
+    report = LoopReport(ir_function.name)
+
+    loops = find_loops(ir_function)
+    report.loops = len(loops)
+    removed = set()
+    for loop in loops:
+        if not loop.blocks & removed and unroll(ir_function, loop):
+            removed |= loop.blocks
+            report.unrolled += 1
+    if report.unrolled:
+        ir_function.remove_unreachable_blocks()
+        loops = find_loops(ir_function)
+
+    # The liveness is found once: what is done to a loop only makes values live for less long, or
+    # over a loop and its preheader only, so it holds enough for the loops around it.
+    live_in, _ = liveness(ir_function)
+    for loop in loops:
+        blocks = loop_blocks(ir_function, loop)
+        if any(
+            isinstance(instruction, Invoke)
+            for block in blocks
+            for instruction in block.instructions
+        ):
+            continue
+        preheader = make_preheader(ir_function, loop, loops, live_in)
+        report.hoisted += hoist_invariants(loop, blocks, preheader, live_in)
+        pointers, reduced, tests = reduce_strength(ir_function, loop, blocks, preheader, live_in)
+        report.pointers += pointers
+        report.reduced += reduced
+        report.tests += tests
+
+    if report.unrolled or report.reduced:
+        remove_dead_code(ir_function)
+    return report
+
+
+# predecessors_of(blocks) => block number => the blocks (among those given) that go to it.
+def predecessors_of(blocks):
+    predecessors = {block.number: [] for block in blocks}
+    for block in blocks:
+        for successor in block.successors():
+            predecessors[successor.number].append(block)
+    return predecessors
+
+
+# ----------------------------------------------------------------------------
+# Returns the dominators of every block reachable from the entry (block number => set of block
+# numbers): the blocks that every path from the entry to it goes through.
+# ----------------------------------------------------------------------------
+def dominators_of(blocks, predecessors):
+    numbers = {block.number for block in blocks}
+    dominators = {block.number: set(numbers) for block in blocks}
+    dominators[blocks[0].number] = {blocks[0].number}
+    changed = True
+    while changed:
+        changed = False
+        for block in blocks[1:]:
+            found = set(numbers)
+            for predecessor in predecessors[block.number]:
+                found &= dominators[predecessor.number]
+            found.add(block.number)
+            if found != dominators[block.number]:
+                dominators[block.number] = found
+                changed = True
+    return dominators
+
+
+# ----------------------------------------------------------------------------
+# Returns the natural loops of a function, innermost (smallest) first; the loops closed by several
+# jumps back to the same header are one loop. A loop headed by the entry block is left out: no
+# preheader can be put before it.
+# ----------------------------------------------------------------------------
+def find_loops(ir_function):
+    blocks = ir_function.reachable_blocks()
+    if not blocks:
+        return []
+    predecessors = predecessors_of(blocks)
+    dominators = dominators_of(blocks, predecessors)
+    bodies = {}  # header => the numbers of the blocks of its loop
+    for block in blocks:
+        for header in block.successors():
+            if header.number not in dominators[block.number] or header is blocks[0]:
+                continue
+            body = bodies.setdefault(header, {header.number})
+            pending = [block]
+            while pending:
+                member = pending.pop()
+                if member.number not in body:
+                    body.add(member.number)
+                    pending.extend(predecessors[member.number])
+    return sorted(
+        (Loop(header, body) for header, body in bodies.items()), key=lambda loop: len(loop.blocks)
+    )
+
+
+# loop_blocks(ir_function, loop) => the blocks of the loop, in layout order.
+def loop_blocks(ir_function, loop):
+    return [block for block in ir_function.blocks if block.number in loop.blocks]
+
+
+# retarget(terminator, old, new) => makes the terminator go to the block new instead of old.
+def retarget(terminator, old, new):
+    if isinstance(terminator, Jump):
+        terminator.target = new
+    elif isinstance(terminator, Branch):
+        if terminator.if_true is old:
+            terminator.if_true = new
+        if terminator.if_false is old:
+            terminator.if_false = new
+
+
+# ----------------------------------------------------------------------------
+# Returns the preheader of a loop: the only block out of it that goes to its header, if it only
+# jumps there; otherwise a new block, laid out before the header, that the blocks out of the loop
+# go to instead (and that the loops around this one now hold); what is live at its start is what
+# is live at the header (live_in, block number => set).
+# ----------------------------------------------------------------------------
+def make_preheader(ir_function, loop, loops, live_in):
+    header = loop.header
+    entries = [
+        block
+        for block in ir_function.blocks
+        if block.number not in loop.blocks and any(s is header for s in block.successors())
+    ]
+    if len(entries) == 1 and isinstance(entries[0].terminator, Jump):
+        return entries[0]
+
+    preheader = ir_function.new_block()
+    preheader.terminator = Jump(header)
+    for block in entries:
+        retarget(block.terminator, header, preheader)
+    ir_function.blocks.insert(ir_function.blocks.index(header), preheader)
+    for other in loops:
+        if other is not loop and header.number in other.blocks:
+            other.blocks.add(preheader.number)
+    live_in[preheader.number] = set(live_in[header.number])
+    return preheader
+
+
+# definition_counts(blocks) => virtual register number => how many instructions of the blocks
+# write it.
+def definition_counts(blocks):
+    counts = {}
+    for block in blocks:
+        for instruction in block.instructions:
+            if instruction.dest is not None:
+                counts[instruction.dest.number] = counts.get(instruction.dest.number, 0) + 1
+    return counts
+
+
+# exit_live(blocks, loop, live_in) => the virtual registers live where the loop is left.
+def exit_live(blocks, loop, live_in):
+    live = set()
+    for block in blocks:
+        for successor in block.successors():
+            if successor.number not in loop.blocks:
+                live |= live_in[successor.number]
+    return live
+
+
+# safe_computation(instruction) => the instruction only computes its destination from its
+# operands, and can not fail (integer division by zero can); it may be moved or removed.
+def safe_computation(instruction):
+    if isinstance(instruction, Binary):
+        return instruction.dest.dtype == DOUBLE or instruction.operator not in ("/", "%")
+    return isinstance(instruction, (Negate, Convert, AddressOf))
+
+
+# ----------------------------------------------------------------------------
+# Moves the loop invariant computations of a loop to its preheader, until none is left; returns
+# how many were moved. A computation is moved when no operand is written in the loop, it is the
+# only write of its destination there, and its destination is neither read in the loop before it
+# (live at the header) nor after the loop (live at an exit). blocks => the blocks of the loop;
+# live_in => block number => the virtual registers live at its start.
+# ----------------------------------------------------------------------------
+def hoist_invariants(loop, blocks, preheader, live_in) -> int:
+    counts = definition_counts(blocks)
+    kept = live_in[loop.header.number] | exit_live(blocks, loop, live_in)
+
+    hoisted = 0
+    changed = True
+    while changed:
+        changed = False
+        for block in blocks:
+            staying = []
+            for instruction in block.instructions:
+                if (
+                    not safe_computation(instruction)
+                    or counts[instruction.dest.number] != 1
+                    or instruction.dest.number in kept
+                    or any(counts.get(register.number) for register in instruction.uses())
+                ):
+                    staying.append(instruction)
+                    continue
+                preheader.instructions.append(instruction)
+                counts[instruction.dest.number] = 0
+                hoisted += 1
+                changed = True
+            block.instructions = staying
+    return hoisted
+
+
+# ----------------------------------------------------------------------------
+# Returns the basic induction variables of a loop: virtual register number => (its VirtualRegister,
+# the instruction that writes it, its step). An induction variable is an integer written once in
+# the loop, by i := i + c or i := i - c; i may be read through a copy made before in its block
+# (t := i; i := t + 1, as i++ is built).
+# ----------------------------------------------------------------------------
+def induction_variables(blocks, counts):
+    variables = {}
+    for block in blocks:
+        copies = {}  # virtual register number => the one it is a copy of, in the block
+        for instruction in block.instructions:
+            dest = instruction.dest
+            if (
+                isinstance(instruction, Binary)
+                and dest.dtype == INTEGER
+                and instruction.operator in ("+", "-")
+                and counts[dest.number] == 1
+            ):
+                left, right = instruction.left, instruction.right
+                if instruction.operator == "+" and isinstance(left, Constant):
+                    left, right = right, left
+                if (
+                    isinstance(left, VirtualRegister)
+                    and isinstance(right, Constant)
+                    and right.value != 0
+                    and dest.number in (left.number, copies.get(left.number))
+                ):
+                    step = right.value if instruction.operator == "+" else -right.value
+                    variables[dest.number] = dest, instruction, step
+            if dest is not None:
+                copies = {
+                    copy: source
+                    for copy, source in copies.items()
+                    if dest.number not in (copy, source)
+                }
+                if isinstance(instruction, Copy) and isinstance(
+                    instruction.source, VirtualRegister
+                ):
+                    copies[dest.number] = instruction.source.number
+    return variables
+
+
+# ----------------------------------------------------------------------------
+# An affine form of an integer value: variable + base + offset, where variable is an induction
+# variable (its current value) or None, base a loop invariant virtual register or None, and offset a
+# constant. add_forms(left, right, sign) => left + right (sign 1) or left - right (sign -1), or None
+# if that is not an affine form.
+# ----------------------------------------------------------------------------
+def add_forms(left, right, sign):
+    if left is None or right is None:
+        return None
+    if sign < 0 and (right[0] is not None or right[1] is not None):
+        return None
+    if (left[0] is not None and right[0] is not None) or (
+        left[1] is not None and right[1] is not None
+    ):
+        return None
+    return (
+        left[0] if left[0] is not None else right[0],
+        left[1] if left[1] is not None else right[1],
+        left[2] + sign * right[2],
+    )
+
+
+# ----------------------------------------------------------------------------
+# Strength reduces the array accesses of a loop indexed by an induction variable (see the top of
+# the file); returns the pointers made, the accesses rewritten, and the loop tests made on a
+# pointer. The affine forms are followed through the instructions of every block, in order: when
+# an induction variable moves, the forms that read it before move back by its step.
+# ----------------------------------------------------------------------------
+def reduce_strength(ir_function, loop, blocks, preheader, live_in):
+    counts = definition_counts(blocks)
+    variables = induction_variables(blocks, counts)
+    if not variables:
+        return 0, 0, 0
+
+    pointers = {}  # (variable number, base number) => the pointer's VirtualRegister
+    invariants = {}  # loop invariant virtual register number => its VirtualRegister
+
+    def form(operand, forms):
+        if isinstance(operand, Constant):
+            return (None, None, operand.value) if operand.dtype == INTEGER else None
+        if not isinstance(operand, VirtualRegister) or operand.dtype != INTEGER:
+            return None
+        if operand.number in variables:
+            return operand.number, None, 0
+        if operand.number in forms:
+            return forms[operand.number]
+        if not counts.get(operand.number):
+            invariants[operand.number] = operand
+            return None, operand.number, 0
+        return None
+
+    def reduced(address, forms):
+        found = form(address.index, forms)
+        if found is None or found[0] is None:
+            return None
+        variable, base, offset = found
+        if base is None:
+            index = variables[variable][0]
+        else:
+            if (variable, base) not in pointers:
+                pointer = ir_function.new_register(INTEGER)
+                preheader.instructions.append(
+                    Binary(pointer, "+", invariants[base], variables[variable][0])
+                )
+                pointers[variable, base] = pointer
+            index = pointers[variable, base]
+        if index is address.index and offset == 0:
+            return None
+        return Address(address.memory, address.base + offset, index, address.name, address.register)
+
+    rewritten = 0
+    for block in blocks:
+        forms = {}  # virtual register number => its affine form, where it is in the block
+        for instruction in block.instructions:
+            if isinstance(instruction, (Load, Store)) and isinstance(
+                instruction.address.index, VirtualRegister
+            ):
+                address = reduced(instruction.address, forms)
+                if address is not None:
+                    instruction.address = address
+                    rewritten += 1
+
+            dest = instruction.dest
+            if dest is None:
+                continue
+            found = None
+            if isinstance(instruction, Copy):
+                found = form(instruction.source, forms)
+            elif isinstance(instruction, Binary) and instruction.operator in ("+", "-"):
+                sign = 1 if instruction.operator == "+" else -1
+                found = add_forms(
+                    form(instruction.left, forms), form(instruction.right, forms), sign
+                )
+            forms.pop(dest.number, None)
+            if dest.number in variables:
+                step = variables[dest.number][2]
+                for number, (variable, base, offset) in list(forms.items()):
+                    if variable == dest.number:
+                        forms[number] = variable, base, offset - step
+            elif found is not None:
+                forms[dest.number] = found
+
+    # Every pointer moves with its induction variable, right after it.
+    for (variable, base), pointer in pointers.items():
+        _, update, step = variables[variable]
+        for block in blocks:
+            if update in block.instructions:
+                position = block.instructions.index(update) + 1
+                operator = "+" if step > 0 else "-"
+                block.instructions.insert(
+                    position, Binary(pointer, operator, pointer, Constant(abs(step), INTEGER))
+                )
+
+    # The index computations the accesses no longer read go first, not to be taken for readers of
+    # the variables.
+    leaving = exit_live(blocks, loop, live_in)
+    remove_unread(blocks, leaving)
+    tests = 0
+    for variable in {variable for variable, _ in pointers}:
+        base = next(base for counted, base in pointers if counted == variable)
+        tests += replace_test(
+            ir_function,
+            blocks,
+            preheader,
+            leaving,
+            variables[variable],
+            pointers[variable, base],
+            invariants[base],
+            counts,
+        )
+    return len(pointers), rewritten, tests
+
+
+# ----------------------------------------------------------------------------
+# Makes the loop test on an induction variable a test on its pointer, base + variable
+# (p < base + n for i < n), when the variable is read nowhere else in the loop but to count it,
+# and not after the loop (leaving => the virtual registers live where the loop is left); its
+# counting is then removed. Returns 1 if it was done, 0 otherwise.
+# ----------------------------------------------------------------------------
+def replace_test(ir_function, blocks, preheader, leaving, variable, pointer, base, counts) -> int:
+    register, update, _ = variable
+    if register.number in leaving:
+        return 0
+
+    readers = {}  # virtual register number => the instructions of the loop that read it
+    for block in blocks:
+        for instruction in block.instructions + [block.terminator]:
+            for used in instruction.uses():
+                readers.setdefault(used.number, []).append(instruction)
+
+    # The instructions that only count the variable: its update, and the copy it reads.
+    counting = [update]
+    counted = update.uses()[0]
+    if counted.number != register.number:
+        copies = [
+            instruction
+            for block in blocks
+            for instruction in block.instructions
+            if instruction.dest is not None and instruction.dest.number == counted.number
+        ]
+        if readers.get(counted.number) != [update] or len(copies) != 1 or counted.number in leaving:
+            return 0
+        counting.append(copies[0])
+
+    tests = [instruction for instruction in readers[register.number] if instruction not in counting]
+    if len(tests) != 1 or not isinstance(tests[0], Branch):
+        return 0
+    test = tests[0]
+    sides = [
+        isinstance(operand, VirtualRegister) and operand.number == register.number
+        for operand in (test.left, test.right)
+    ]
+    bound = test.right if sides[0] else test.left
+    if sides[0] == sides[1] or (isinstance(bound, VirtualRegister) and counts.get(bound.number)):
+        return 0
+
+    limit = ir_function.new_register(INTEGER)
+    preheader.instructions.append(Binary(limit, "+", base, bound))
+    if sides[0]:
+        test.left, test.right = pointer, limit
+    else:
+        test.left, test.right = limit, pointer
+    for block in blocks:
+        block.instructions = [
+            instruction for instruction in block.instructions if instruction not in counting
+        ]
+    return 1
+
+
+# remove_unread(blocks, leaving) => removes the instructions of the blocks of a loop whose value is
+# read neither in the loop nor after it (live where it is left), as remove_dead_code() would.
+def remove_unread(blocks, leaving):
+    readers = {}  # virtual register number => how many times the blocks read it
+    for block in blocks:
+        for instruction in block.instructions + [block.terminator]:
+            for register in instruction.uses():
+                readers[register.number] = readers.get(register.number, 0) + 1
+    changed = True
+    while changed:
+        changed = False
+        for block in blocks:
+            for instruction in list(block.instructions):
+                dest = instruction.dest
+                if (
+                    dest is None
+                    or readers.get(dest.number)
+                    or dest.number in leaving
+                    or not (safe_computation(instruction) or isinstance(instruction, (Copy, Load)))
+                ):
+                    continue
+                block.instructions.remove(instruction)
+                for register in instruction.uses():
+                    readers[register.number] -= 1
+                changed = True
+
+
+# ----------------------------------------------------------------------------
+# Unrolls a loop, if it is a header that only tests an induction variable against a constant, and
+# one block that jumps back to it; the variable must be set to a constant right before the loop,
+# and the loop must run at most UNROLL_TRIPS times (and be small enough, see UNROLL_INSTRUCTIONS).
+# The copies of the block go to the end of the block before the loop, which then leaves it; the
+# constants are folded in them. Returns True if the loop was unrolled.
+# ----------------------------------------------------------------------------
+def unroll(ir_function, loop) -> bool:
+    header = loop.header
+    test = header.terminator
+    if len(loop.blocks) != 2 or header.instructions or not isinstance(test, Branch):
+        return False
+    body, leave = test.if_true, test.if_false
+    comparison = test.comparison
+    if body.number not in loop.blocks:
+        body, leave = leave, body
+        comparison = NEGATED_COMPARISONS[comparison]
+    if body is header or leave.number in loop.blocks or not isinstance(body.terminator, Jump):
+        return False
+    entries = [
+        block
+        for block in ir_function.blocks
+        if block.number not in loop.blocks and any(s is header for s in block.successors())
+    ]
+    if len(entries) != 1 or not isinstance(entries[0].terminator, Jump):
+        return False
+    preheader = entries[0]
+
+    register, bound = test.left, test.right
+    if isinstance(register, Constant):
+        register, bound = bound, register
+        comparison = SWAPPED_COMPARISONS[comparison]
+    variables = induction_variables([body], definition_counts([body]))
+    if (
+        not isinstance(register, VirtualRegister)
+        or register.number not in variables
+        or not isinstance(bound, Constant)
+        or bound.dtype != INTEGER
+    ):
+        return False
+    start = None
+    for instruction in reversed(preheader.instructions):
+        if instruction.dest is not None and instruction.dest.number == register.number:
+            start = instruction
+            break
+    if not isinstance(start, Copy) or not isinstance(start.source, Constant):
+        return False
+
+    value, step, trips = start.source.value, variables[register.number][2], 0
+    while COMPARISONS[comparison](value, bound.value):
+        value += step
+        trips += 1
+        if trips > UNROLL_TRIPS:
+            return False
+    if trips * len(body.instructions) > UNROLL_INSTRUCTIONS:
+        return False
+
+    for _ in range(trips):
+        preheader.instructions.extend(copy.copy(instruction) for instruction in body.instructions)
+    preheader.terminator = Jump(leave)
+    fold_constants(preheader)
+    return True
+
+
+# ----------------------------------------------------------------------------
+# Folds the constants of a block: a register set to a constant is read as that constant after, and
+# a computation of constants (see constant_folding.py) is replaced by its value.
+# ----------------------------------------------------------------------------
+def fold_constants(block):
+    known = {}  # virtual register number => its Constant
+    for position, instruction in enumerate(block.instructions):
+        instruction.replace_uses(known)
+        dest = instruction.dest
+        if dest is None:
+            continue
+        known.pop(dest.number, None)
+        value = None
+        if isinstance(instruction, Copy) and isinstance(instruction.source, Constant):
+            value = instruction.source.value
+        elif isinstance(instruction, Binary) and all(
+            isinstance(operand, Constant) for operand in instruction.operands()
+        ):
+            value = evaluate(instruction.operator, instruction.left.value, instruction.right.value)
+        elif isinstance(instruction, (Negate, Convert)) and isinstance(
+            instruction.source, Constant
+        ):
+            value = instruction.source.value
+            value = -value if isinstance(instruction, Negate) else value
+        value = convert(value, dest.dtype)
+        if value is not None:
+            known[dest.number] = Constant(value, dest.dtype)
+            block.instructions[position] = Copy(dest, known[dest.number])
+    block.terminator.replace_uses(known)
+
+
+# ----------------------------------------------------------------------------
+# Removes the instructions whose value is never read: the computations that can not fail (see
+# safe_computation()), the copies and the loads, by the liveness of their destination, until none
+# is left.
+# ----------------------------------------------------------------------------
+def remove_dead_code(ir_function):
+    changed = True
+    while changed:
+        changed = False
+        _, live_out = liveness(ir_function)
+        for block in ir_function.blocks:
+            live = live_out[block.number] | {
+                register.number for register in block.terminator.uses()
+            }
+            kept = []
+            for instruction in reversed(block.instructions):
+                dest = instruction.dest
+                if (
+                    dest is not None
+                    and dest.number not in live
+                    and (safe_computation(instruction) or isinstance(instruction, (Copy, Load)))
+                ):
+                    changed = True
+                    continue
+                if dest is not None:
+                    live.discard(dest.number)
+                live.update(register.number for register in instruction.uses())
+                kept.append(instruction)
+            block.instructions = kept[::-1]
+
+
+# report(reports) => the table of the LoopReports given as parameter, with their totals.
+def report(reports) -> str:
+    columns = ("loops", "unrolled", "hoisted", "pointers", "reduced", "tests")
+    row = "{: <20}" + " {: >9}" * len(columns)
+    lines = ["~ LOOP OPTIMIZATION ~", row.format("function", *columns)]
+    for item in reports:
+        lines.append(row.format(item.name, *(getattr(item, column) for column in columns)))
+    lines.append(
+        row.format("total", *(sum(getattr(item, column) for item in reports) for column in columns))
+    )
+    lines.append(
+        "(hoisted: loop invariants moved out; pointers: made for induction variables; reduced: "
+        "array accesses through them; tests: loop tests made on them)"
+    )
+    return "\n".join(lines) + "\n"
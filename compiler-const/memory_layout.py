@@ -0,0 +1,253 @@
+# ---Memory Layout--- #
+# Gives every variable and string constant of a program its own place in the memory of the
+# f23 virtual machine (f23.c), before any code is generated.
+#
+# Mem, FMem and SMem are three views of the same memory: Mem[i] and FMem[i] are the 8 byte word i,
+# and SMem[8 * i] is the first byte of that word. So the layout is done in whole words, handed out
+# in order and never shared: integers and doubles are word aligned, strings start on a word
+# boundary, and no two items overlap, whatever their length.
+#
+# The static data of a program is one block of the heap. The first block allocate_in_Mem() hands out
+# starts right after its 2 word header, at Mem[2]; the prologue of the generated code allocates it,
+# then copies the string constants into it, once, before anything else runs.
+#
+# The integer and double variables of a function or procedure live in its activation record, on
+# the stack of f23.c instead (it starts at the end of Mem, and grows down): every call has its own.
+# SR is the top of the stack, and FR the record of the function running, which looks like this:
+#
+#   Mem[FR + 1 + n]          the value returned, for a function (integer or double)
+#   Mem[FR + 1] ...          the parameters, in order: n words, stored by the caller below its SR
+#   Mem[FR]                  the FR of the caller
+#   ... Mem[FR - 1]          the local variables (and the registers saved, the values spilled)
+#   Mem[SR]                  the last word of the record
+#
+# A string parameter is the SMem location of its string (a reference); string variables stay in
+# the static data. An array parameter is a reference to the array of the caller, never a copy of
+# it: 2 words, the Mem (or FMem) index of its first element, and its number of elements. So is an
+# array of a function sized at run time ("double fm[fm1 + 1]"): its elements are put on the stack,
+# below SR, when its definition runs.
+#
+# A nested function or procedure has a record of its own too, with no link to the record of the
+# function it is defined in: it can not use the variables there (see ir_builder.py).
+from constant_pool import STRING_CONSTANT, string_size
+from symbol_table_properties import (
+    ARRAY_SIZE,
+    DATA_TYPE,
+    MEM_LOCATION,
+    MEMORY,
+    PARAMETER,
+    REFERENCE,
+    REGISTER,
+    VALUE,
+)
+
+# Bytes per word of Mem.
+WORD_SIZE = 8
+
+# Mem index of the first static data word (Allocate_Block_Header in f23.c).
+STATIC_BASE = 2
+
+# Bytes of a string variable: as big as the string input buffer (F23_SbufSize in f23.c).
+STRING_SIZE = 1025
+
+# Words of the reference to an array: the location of its first element, and its length.
+REFERENCE_WORDS = 2
+
+# data type => (view of Mem the variable is accessed through, size of one element in bytes).
+MEMORY_VIEWS = {
+    "integer": ("Mem", WORD_SIZE),
+    "double": ("FMem", WORD_SIZE),
+    "string": ("SMem", STRING_SIZE),
+}
+
+# Name of the memory map section of the constants, which are shared by all the scopes.
+CONSTANTS_SCOPE = "CONSTANTS"
+
+# The .f23 function the generated program starts in; it runs the prologue first. f23.c calls it,
+# so it has no parameters, and returns its value to f23.c (the exit code), not in its record.
+ENTRY_FUNCTION = "main"
+
+
+# words(size) => the number of words taken by an item of size bytes.
+def words(size: int) -> int:
+    return (size + WORD_SIZE - 1) // WORD_SIZE
+
+
+# ----------------------------------------------------------------------------
+# The activation record of a function or procedure (see above): its parameters, its return slot,
+# and the words of its local variables, below FR.
+# ----------------------------------------------------------------------------
+class Frame:
+    def __init__(self, name, return_type=None):
+        # The (name, properties) of the parameters, in order, and the words they take.
+        self.parameters = []
+        self.parameter_words = 0
+        # The view of Mem of the value returned ("Mem" or "FMem"), or None if nothing is.
+        self.return_memory = None
+        if return_type in ("integer", "double") and name != ENTRY_FUNCTION:
+            self.return_memory = MEMORY_VIEWS[return_type][0]
+        self.local_words = 0
+
+    # return_location => the offset from FR of the value returned.
+    @property
+    def return_location(self):
+        return 1 + self.parameter_words
+
+    # pushed_words() => the words a caller stores below its SR: the parameters, and the return slot.
+    def pushed_words(self):
+        return self.parameter_words + (self.return_memory is not None)
+
+
+class MemoryLayout:
+    def __init__(self, base=STATIC_BASE):
+        self.base = base
+        self.top = base
+
+        # scope name => [(name, memory, location, size in bytes, register)], in layout order;
+        # register is None for the static data, "FR" for an offset from FR (a stack frame).
+        self.scopes = {}
+        # scope name => the Frame of a function or procedure.
+        self.frames = {}
+
+    # allocate(scope_name, name, memory, size) => gives an item of size bytes the next free words;
+    # returns its location: a byte offset for SMem, a word index for Mem and FMem.
+    def allocate(self, scope_name, name, memory, size):
+        word = self.top
+        self.top += max(words(size), 1)
+
+        location = word * WORD_SIZE if memory == "SMem" else word
+        self.scopes.setdefault(scope_name, []).append((name, memory, location, size, None))
+        return location
+
+    # allocate_frame(frame, scope_name, name, memory, size) => gives an item of size bytes the
+    # next free words of a stack frame, below FR; returns its location, as an offset from FR.
+    def allocate_frame(self, frame, scope_name, name, memory, size):
+        frame.local_words += max(words(size), 1)
+        location = -frame.local_words
+        self.scopes.setdefault(scope_name, []).append((name, memory, location, size, "FR"))
+        return location
+
+    # place_parameter(frame, scope_name, name, memory, size) => gives a parameter of size words
+    # the next words of a stack frame, above FR; returns its location, as an offset from FR.
+    def place_parameter(self, frame, scope_name, name, memory, size=1):
+        location = frame.parameter_words + 1
+        frame.parameter_words += size
+        self.scopes.setdefault(scope_name, []).append(
+            (name, memory, location, size * WORD_SIZE, "FR")
+        )
+        return location
+
+    # size() => returns the number of words of static data.
+    def size(self):
+        return self.top - self.base
+
+    # scope_size(scope_name) => returns the number of bytes of static data taken by a scope.
+    def scope_size(self, scope_name):
+        return sum(
+            max(words(size), 1) * WORD_SIZE
+            for name, memory, location, size, register in self.scopes.get(scope_name, ())
+            if register is None
+        )
+
+    # report() => returns the memory map: every item with its location, and the bytes used per scope.
+    def report(self) -> str:
+        lines = ["~ MEMORY MAP ~"]
+        for scope_name, items in self.scopes.items():
+            line = "{}: {} bytes".format(scope_name, self.scope_size(scope_name))
+            frame = self.frames.get(scope_name)
+            if frame is not None:
+                line += ", stack frame: {} words from its callers, {} of locals".format(
+                    frame.pushed_words(), frame.local_words
+                )
+            lines.append(line)
+            for name, memory, location, size, register in items:
+                if register is not None:
+                    sign = "-" if location < 0 else "+"
+                    location = "{} {} {}".format(register, sign, abs(location))
+                lines.append(
+                    "\t{: <14} {: >6} bytes  {}".format(
+                        "{}[{}]".format(memory, location), size, name
+                    )
+                )
+            if frame is not None and frame.return_memory is not None:
+                lines.append(
+                    "\t{: <14} {: >6} bytes  (return value)".format(
+                        "{}[FR + {}]".format(frame.return_memory, frame.return_location), WORD_SIZE
+                    )
+                )
+        lines.append(
+            "static data: Mem[{}] to Mem[{}], {} words, {} bytes".format(
+                self.base, self.top - 1, self.size(), self.size() * WORD_SIZE
+            )
+        )
+        return "\n".join(lines) + "\n"
+
+
+# ----------------------------------------------------------------------------
+# Lays out the variables of every symbol table given as parameter, in order (in the static data,
+# or in the Frame of their function or procedure, set on its table), then the string constants of
+# their (shared) constant pool; records MEMORY, MEM_LOCATION, REGISTER and REFERENCE on their
+# entries, and returns the MemoryLayout.
+# ----------------------------------------------------------------------------
+def layout_memory(symbol_tables, base=STATIC_BASE) -> MemoryLayout:
+    layout = MemoryLayout(base)
+
+    constant_pool = None
+    for symbol_table in symbol_tables:
+        constant_pool = symbol_table.constant_pool
+        scope_name = symbol_table.scope_name
+
+        # Every table but the program table is the one of a function or procedure.
+        frame = None
+        if symbol_table.parent_table is not None:
+            frame = symbol_table.frame = layout.frames[scope_name] = Frame(
+                scope_name, symbol_table.return_type
+            )
+
+        for symbol in symbol_table.slots:
+            properties = symbol_table.get(symbol)
+            memory, size = MEMORY_VIEWS.get(properties.get(DATA_TYPE), ("Mem", WORD_SIZE))
+
+            # An array of unknown size (0) takes one element in the static data; in a frame, it
+            # is a reference (an array parameter, or an array sized at run time).
+            array_size = properties.get(ARRAY_SIZE)
+            if array_size:
+                size *= array_size
+            reference = frame is not None and array_size == 0 and memory != "SMem"
+
+            properties[MEMORY] = memory
+            properties[REGISTER] = None
+            properties[REFERENCE] = reference
+            if frame is not None and properties.get(PARAMETER) is not None:
+                frame.parameters.append((symbol, properties))
+                properties[REGISTER] = "FR"
+                if reference:
+                    properties[MEM_LOCATION] = layout.place_parameter(
+                        frame, scope_name, symbol + "[]", "Mem", REFERENCE_WORDS
+                    )
+                else:
+                    properties[MEM_LOCATION] = layout.place_parameter(
+                        frame, scope_name, symbol, memory
+                    )
+            elif reference:
+                properties[REGISTER] = "FR"
+                properties[MEM_LOCATION] = layout.allocate_frame(
+                    frame, scope_name, symbol + "[]", "Mem", REFERENCE_WORDS * WORD_SIZE
+                )
+            elif frame is not None and memory != "SMem":
+                properties[REGISTER] = "FR"
+                properties[MEM_LOCATION] = layout.allocate_frame(
+                    frame, scope_name, symbol, memory, size
+                )
+            else:
+                properties[MEM_LOCATION] = layout.allocate(scope_name, symbol, memory, size)
+
+    if constant_pool is not None:
+        for const in constant_pool.constants.values():
+            if const[DATA_TYPE] == STRING_CONSTANT:
+                const[MEMORY] = "SMem"
+                const[MEM_LOCATION] = layout.allocate(
+                    CONSTANTS_SCOPE, const[VALUE], "SMem", string_size(const[VALUE])
+                )
+
+    return layout
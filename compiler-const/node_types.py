@@ -1,46 +1,132 @@
-ARGUMENTS = "arguments"
-EMPTY = "empty"
-PROGRAM = "program"
-PROGRAM_BLOCK = "program_block"
-PROGRAM_BODY = "program_body"
-PROCEDURE = "procedure"
-PROCEDURE_CALL = "procedure_call"
-PROCEDURE_CALL_ARGS = "procedure_call_args"
-FUNCTION = "function"
-FUNCTION_BLOCK = "function_block"
-FUNCTION_BODY = "function_body"
-STATEMENT = "statement"
-FUNCTION_CALL = "function_call"
-FUNCTION_RETURN = "function_return"
-VARIABLE_ASSIGNMENT = "variable_assignment"
-ARRAY_VARIABLE_DECLARATION = "array_variable_declaration"
-ARRAY_VARIABLE_DEFINITION = "array_variable_definition"
-VARIABLE_DECLARATION = "variable_declaration"
-VARIABLE_DEFINITION = "variable_definition"
-EXPRESSION = "expression"
-ARITHMETIC_LOGIC = "arithmetic_logic"
-BOOLEAN_LOGIC = "boolean_logic"
-DTYPE = "data_type"
-IDENTIFIER = "identifier"
-TERM = "term"
-FACTOR = "factor"
-ICONSTANT = "iconstant"
-DCONSTANT = "dconstant"
-SCONSTANT = "sconstant"
-CONSTANT = "constant"
-MULTIPLY = "*"
-DIVIDE = "/"
-PLUS = "+"
-MINUS = "-"
-OPERATOR = "operator"
-COMPARISON = "comparison"
-ASSIGN = "="
-FUNCTION_CALL_ARGS = "function_call_args"
-WHILE = "while_statement"
-DO = "do_statement"
-IF = "if_statement"
-AFTER_ELSE_ELSE = "after_else_else"
-AFTER_ELSE_ELSE_IF = "after_else_else_if"
-VARIABLE_DECREMENT_INCREMENT = "variable_decrement_increment"
-IDENTIFIERS = "identifiers"
-SCOPE_BODY = "scope_body"
+# Node types are small integers, cheap to store in every node; compare them with "==". Their names
+# are the ones printed in the AST.
+#   NODE_TYPE_NAMES[node type] => name of the node type.
+#   NODE_TYPE_IDS[name] => node type of the name.
+#
+# The node types declared below are fixed: their ids are their indexes in DECLARED_NODE_TYPES, the
+# same in every process. A few more come from tokens the parser makes nodes of: the built in
+# functions ("print_string", "read_integer"...), "++" and "--", and the assignment operators. They
+# are registered as they are first seen, so their ids are not the same from one process to the
+# next: what is saved (pickles, ast_cache.py) holds the names instead. They are bounded by the
+# grammar: the identifiers of a program are IdentifierNodes, with their name as a property, so
+# the table does not grow with the programs compiled.
+
+import threading
+
+DECLARED_NODE_TYPES = (
+    "arguments",
+    "empty",
+    "program",
+    "program_block",
+    "program_body",
+    "procedure",
+    "procedure_call",
+    "procedure_call_args",
+    "function",
+    "function_block",
+    "function_body",
+    "statement",
+    "function_call",
+    "function_return",
+    "variable_assignment",
+    "array_variable_declaration",
+    "array_variable_definition",
+    "variable_declaration",
+    "variable_definition",
+    "expression",
+    "arithmetic_logic",
+    "boolean_logic",
+    "data_type",
+    "identifier",
+    "term",
+    "factor",
+    "iconstant",
+    "dconstant",
+    "sconstant",
+    "constant",
+    "*",
+    "/",
+    "+",
+    "-",
+    "operator",
+    "comparison",
+    "=",
+    "function_call_args",
+    "while_statement",
+    "do_statement",
+    "if_statement",
+    "after_else_else",
+    "after_else_else_if",
+    "variable_decrement_increment",
+    "identifiers",
+    "scope_body",
+    "token",
+)
+NODE_TYPE_NAMES = list(DECLARED_NODE_TYPES)
+NODE_TYPE_IDS = {name: type_id for type_id, name in enumerate(DECLARED_NODE_TYPES)}
+
+# Held while a name is registered: compilations parse on several threads (see compiler.py).
+_register_lock = threading.Lock()
+
+
+# node_type(name) => returns the node type of a name, and registers it first if it is new.
+def node_type(name: str) -> int:
+    type_id = NODE_TYPE_IDS.get(name)
+    if type_id is None:
+        with _register_lock:
+            type_id = NODE_TYPE_IDS.get(name)
+            if type_id is None:
+                type_id = len(NODE_TYPE_NAMES)
+                NODE_TYPE_NAMES.append(name)
+                NODE_TYPE_IDS[name] = type_id
+
+    return type_id
+
+
+ARGUMENTS = NODE_TYPE_IDS["arguments"]
+EMPTY = NODE_TYPE_IDS["empty"]
+PROGRAM = NODE_TYPE_IDS["program"]
+PROGRAM_BLOCK = NODE_TYPE_IDS["program_block"]
+PROGRAM_BODY = NODE_TYPE_IDS["program_body"]
+PROCEDURE = NODE_TYPE_IDS["procedure"]
+PROCEDURE_CALL = NODE_TYPE_IDS["procedure_call"]
+PROCEDURE_CALL_ARGS = NODE_TYPE_IDS["procedure_call_args"]
+FUNCTION = NODE_TYPE_IDS["function"]
+FUNCTION_BLOCK = NODE_TYPE_IDS["function_block"]
+FUNCTION_BODY = NODE_TYPE_IDS["function_body"]
+STATEMENT = NODE_TYPE_IDS["statement"]
+FUNCTION_CALL = NODE_TYPE_IDS["function_call"]
+FUNCTION_RETURN = NODE_TYPE_IDS["function_return"]
+VARIABLE_ASSIGNMENT = NODE_TYPE_IDS["variable_assignment"]
+ARRAY_VARIABLE_DECLARATION = NODE_TYPE_IDS["array_variable_declaration"]
+ARRAY_VARIABLE_DEFINITION = NODE_TYPE_IDS["array_variable_definition"]
+VARIABLE_DECLARATION = NODE_TYPE_IDS["variable_declaration"]
+VARIABLE_DEFINITION = NODE_TYPE_IDS["variable_definition"]
+EXPRESSION = NODE_TYPE_IDS["expression"]
+ARITHMETIC_LOGIC = NODE_TYPE_IDS["arithmetic_logic"]
+BOOLEAN_LOGIC = NODE_TYPE_IDS["boolean_logic"]
+DTYPE = NODE_TYPE_IDS["data_type"]
+IDENTIFIER = NODE_TYPE_IDS["identifier"]
+TERM = NODE_TYPE_IDS["term"]
+FACTOR = NODE_TYPE_IDS["factor"]
+ICONSTANT = NODE_TYPE_IDS["iconstant"]
+DCONSTANT = NODE_TYPE_IDS["dconstant"]
+SCONSTANT = NODE_TYPE_IDS["sconstant"]
+CONSTANT = NODE_TYPE_IDS["constant"]
+MULTIPLY = NODE_TYPE_IDS["*"]
+DIVIDE = NODE_TYPE_IDS["/"]
+PLUS = NODE_TYPE_IDS["+"]
+MINUS = NODE_TYPE_IDS["-"]
+OPERATOR = NODE_TYPE_IDS["operator"]
+COMPARISON = NODE_TYPE_IDS["comparison"]
+ASSIGN = NODE_TYPE_IDS["="]
+FUNCTION_CALL_ARGS = NODE_TYPE_IDS["function_call_args"]
+WHILE = NODE_TYPE_IDS["while_statement"]
+DO = NODE_TYPE_IDS["do_statement"]
+IF = NODE_TYPE_IDS["if_statement"]
+AFTER_ELSE_ELSE = NODE_TYPE_IDS["after_else_else"]
+AFTER_ELSE_ELSE_IF = NODE_TYPE_IDS["after_else_else_if"]
+VARIABLE_DECREMENT_INCREMENT = NODE_TYPE_IDS["variable_decrement_increment"]
+IDENTIFIERS = NODE_TYPE_IDS["identifiers"]
+SCOPE_BODY = NODE_TYPE_IDS["scope_body"]
+TOKEN = NODE_TYPE_IDS["token"]
@@ -0,0 +1,99 @@
+# This file holds the tracing of the reductions made by the parser.
+#
+# Tracing is off by default, and costs nothing then: the grammar actions do no tracing themselves.
+# enable_tracing() wraps the actions bound to a parser, so that every reduction emits a
+# ReductionEvent (rule, lineno, lexpos) to a sink; disable_tracing() puts the actions back.
+#
+# A sink is any object with an emit(event) method, for example:
+#   RingBufferSink => keeps the last events in memory.
+#   JsonLinesSink  => writes one JSON object per event to a file.
+#   HistogramSink  => counts the reductions of each rule.
+#   PrintSink      => prints the reductions, the way the parser used to print them.
+
+import collections
+import sys
+
+ReductionEvent = collections.namedtuple("ReductionEvent", ["rule", "lineno", "lexpos"])
+
+
+class RingBufferSink:
+    def __init__(self, capacity=1024):
+        self.events = collections.deque(maxlen=capacity)
+
+    def emit(self, event):
+        self.events.append(event)
+
+
+class JsonLinesSink:
+    def __init__(self, file=sys.stderr):
+        # json is only imported when tracing to JSON lines (it is most of the import time of this file).
+        import json
+
+        self.file = file
+        self.dumps = json.dumps
+
+    def emit(self, event):
+        self.file.write(self.dumps(event._asdict()) + "\n")
+
+
+class HistogramSink:
+    def __init__(self):
+        self.counts = collections.Counter()
+
+    def emit(self, event):
+        self.counts[event.rule] += 1
+
+    def __repr__(self):
+        return "\n".join(
+            "{: >8} {}".format(count, rule) for rule, count in self.counts.most_common()
+        )
+
+
+class PrintSink:
+    def __init__(self, file=sys.stdout):
+        self.file = file
+
+    def emit(self, event):
+        print("\nReduced: {}".format(event.rule), file=self.file)
+
+
+# ----------------------------------------------------------------------------
+# Returns the position of a reduction, as (lineno, lexpos):
+#   the position of its first token, if its right hand side starts with one;
+#   otherwise, the position the lexer is at.
+# ----------------------------------------------------------------------------
+def reduction_position(p):
+    if len(p.slice) > 1:
+        first_symbol = p.slice[1]
+        if hasattr(first_symbol, "lexpos"):
+            return first_symbol.lineno, first_symbol.lexpos
+
+    return p.lexer.lineno, p.lexer.lexpos
+
+
+def traced_action(action, rule, sink):
+    def action_with_tracing(p):
+        lineno, lexpos = reduction_position(p)
+        sink.emit(ReductionEvent(rule, lineno, lexpos))
+        action(p)
+
+    action_with_tracing.untraced_action = action
+    return action_with_tracing
+
+
+# enable_tracing(parser, sink) => emits an event to the sink for every reduction made by the parser.
+def enable_tracing(parser, sink):
+    disable_tracing(parser)
+    for production in parser.productions:
+        if production.callable is not None:
+            production.callable = traced_action(
+                production.callable, str(production), sink
+            )
+
+
+# disable_tracing(parser) => stops the tracing of the parser, if it was enabled.
+def disable_tracing(parser):
+    for production in parser.productions:
+        production.callable = getattr(
+            production.callable, "untraced_action", production.callable
+        )
@@ -0,0 +1,117 @@
+# This file holds the startup of the parser, from a cache of precompiled LALR tables.
+#
+# The tables are pickled into __pycache__, under a name made of a hash of the grammar
+# (the tokens, and the names, docstrings and bytecode of the p_ functions of the parser module).
+# As long as the grammar does not change, the tables are loaded without any check or rebuild;
+# when it does change, they are rebuilt once and the stale cache files are removed.
+# parser.out (the debug file of ply) is only written when asked for, with debug=True.
+
+import glob
+import hashlib
+import os
+import sys
+import types
+
+import ply.yacc as yacc
+
+CACHE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "__pycache__")
+CACHE_PREFIX = "parsetab-"
+CACHE_SUFFIX = ".pickle"
+
+
+# ----------------------------------------------------------------------------
+# Returns the hash of the grammar of the parser module given as parameter.
+# The grammar is read the same way ply reads it: the start symbol, the precedence,
+# the tokens, and the docstrings of the p_ functions, in the order they are defined.
+# The name and the bytecode of each p_ function are hashed as well: the cached tables
+# name the functions of their actions, and an action that builds other nodes must not
+# be left behind by a table of the same docstrings.
+# ----------------------------------------------------------------------------
+def grammar_hash(module) -> str:
+    rules = [
+        function
+        for name, function in vars(module).items()
+        if name.startswith("p_") and name != "p_error" and callable(function)
+    ]
+    rules.sort(key=lambda function: function.__code__.co_firstlineno)
+
+    grammar = hashlib.sha256()
+    grammar.update(str(getattr(module, "start", "")).encode())
+    grammar.update(repr(getattr(module, "precedence", ())).encode())
+    grammar.update(" ".join(module.tokens).encode())
+    for function in rules:
+        grammar.update(function.__name__.encode())
+        grammar.update((function.__doc__ or "").encode())
+        grammar.update(function.__code__.co_code)
+
+    return grammar.hexdigest()[:16]
+
+
+# cache_file(module, cache_directory) => returns the path of the table cache of the parser module.
+def cache_file(module, cache_directory=CACHE_DIRECTORY) -> str:
+    return os.path.join(
+        cache_directory, CACHE_PREFIX + grammar_hash(module) + CACHE_SUFFIX
+    )
+
+
+# ----------------------------------------------------------------------------
+# Builds the parser of the parser module given as parameter.
+#   Warm cache: the tables are loaded from the cache file, with no signature check.
+#   Cold cache: the tables are generated, written atomically to the cache file,
+#               and the cache files of older grammars are removed.
+# Nothing else is written (no parsetab.py), and parser.out only when debug is True.
+# ----------------------------------------------------------------------------
+def build_parser(module, debug=False, cache_directory=CACHE_DIRECTORY):
+    table_file = cache_file(module, cache_directory)
+    error_log = yacc.PlyLogger(sys.stderr) if debug else yacc.NullLogger()
+
+    if not debug and os.path.exists(table_file):
+        return yacc.yacc(
+            module=module,
+            debug=False,
+            optimize=True,
+            write_tables=False,
+            picklefile=table_file,
+            errorlog=error_log,
+        )
+
+    os.makedirs(cache_directory, exist_ok=True)
+
+    # Written to a temporary file first, so that compilers starting at the same time
+    # never load a half written table file.
+    temporary_file = "{}.{}.tmp".format(table_file, os.getpid())
+    parser = yacc.yacc(
+        module=module,
+        debug=debug,
+        write_tables=False,
+        picklefile=temporary_file,
+        errorlog=error_log,
+        outputdir=os.path.dirname(os.path.abspath(module.__file__)),
+    )
+    os.replace(temporary_file, table_file)
+
+    for stale_file in glob.glob(
+        os.path.join(cache_directory, CACHE_PREFIX + "*" + CACHE_SUFFIX)
+    ):
+        if stale_file != table_file:
+            try:
+                os.remove(stale_file)
+            except FileNotFoundError:
+                # Already removed by another compiler.
+                pass
+
+    return parser
+
+
+# ----------------------------------------------------------------------------
+# Returns a new parser over the same tables (and grammar actions) as the parser given as
+# parameter, without loading or building them again. A ply parser keeps the state of the parse
+# it is running (its stacks), so two parses at the same time each need their own parser.
+# errorfunc is called with the token of a syntax error (None at the end of the input); without it,
+# ply writes the error to stderr.
+# ----------------------------------------------------------------------------
+def clone_parser(parser, errorfunc=None):
+    tables = types.SimpleNamespace(
+        lr_productions=parser.productions, lr_action=parser.action, lr_goto=parser.goto
+    )
+    return yacc.LRParser(tables, errorfunc)
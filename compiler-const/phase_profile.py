@@ -0,0 +1,210 @@
+"""
+python simple_ast.py mg.f23 --generate --profile
+"""
+
+# This file is the profiler of the phases of a compilation: where the time (and the memory) of
+# "python simple_ast.py <filename>" goes, between building the lexer and parser tables, lexing,
+# parsing, printing the tree, folding constants, building the symbol tables and generating code.
+#
+# The compiler profiles itself with "--profile" after the file name: every phase is run inside
+# profiler.phase(name, unit), which measures its wall time and, with tracemalloc, the peak of
+# the memory it allocated and what it still holds at its end; the phase is given the number of
+# items it handled (tokens, nodes, symbols, lines of C). The report is printed to stderr.
+#
+# The calls made by the phases can also be dumped, for a closer look:
+#   --profile-stats <file>  => cProfile statistics ("python -m pstats <file>", snakeviz...).
+#   --profile-stacks <file> => collapsed stacks, one "phase;caller;...;callee microseconds" line
+#                              per stack, as read by flamegraph.pl and speedscope.
+# Both use the profile hook of python, so only one of them can be asked for at a time.
+#
+# Measuring costs time: the phases run slower under tracemalloc (and much slower with a dump).
+# The times are meant to be compared between runs of the same mode, not with unprofiled runs.
+
+import contextlib
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+from simple_lex import StreamLexer
+
+
+# One phase of a compilation: name, unit => what it is and what it counts; count => how many
+# items it handled (None if not counted); seconds => wall time; peak_bytes => most memory it had
+# allocated at once; held_bytes => memory it allocated and still held at its end.
+class Phase:
+    def __init__(self, name, unit=""):
+        self.name = name
+        self.unit = unit
+        self.count = None
+        self.seconds = 0.0
+        self.peak_bytes = 0
+        self.held_bytes = 0
+
+
+# ----------------------------------------------------------------------------
+# Records the collapsed stacks of the calls made while it is started: the time spent in every
+# stack of calls (in the function at its top, not in the functions it calls), in microseconds,
+# under the name of the phase as its root.
+# ----------------------------------------------------------------------------
+class StackProfiler:
+    def __init__(self):
+        self.totals = defaultdict(int)
+        self.stacks = []
+        self.last = 0
+
+    # label(frame, event, arg) => the name of the function called, as shown in a flame graph.
+    @staticmethod
+    def label(frame, event, arg):
+        if event == "c_call":
+            module = getattr(arg, "__module__", None) or "builtins"
+            return "{}.{}".format(module, arg.__qualname__)
+        code = frame.f_code
+        return "{}:{} ({}:{})".format(
+            frame.f_globals.get("__name__", "?"),
+            code.co_name,
+            code.co_filename.rsplit("/", 1)[-1],
+            code.co_firstlineno,
+        )
+
+    def callback(self, frame, event, arg):
+        now = time.perf_counter_ns()
+        self.totals[self.stacks[-1]] += now - self.last
+        if event == "call" or event == "c_call":
+            self.stacks.append(self.stacks[-1] + ";" + self.label(frame, event, arg))
+        elif len(self.stacks) > 1:
+            # A return, or an exception out of a builtin; the frames the profiler was started
+            # from return too, and are not on the stack.
+            self.stacks.pop()
+        self.last = time.perf_counter_ns()
+
+    def start(self, root):
+        self.stacks = [root]
+        self.last = time.perf_counter_ns()
+        sys.setprofile(self.callback)
+
+    def stop(self):
+        sys.setprofile(None)
+        self.totals[self.stacks[-1]] += time.perf_counter_ns() - self.last
+
+    # dump(file_name) => writes the collapsed stacks, heaviest first.
+    def dump(self, file_name):
+        with open(file_name, "w") as file:
+            for stack, nanoseconds in sorted(self.totals.items(), key=lambda item: -item[1]):
+                if nanoseconds >= 1000:
+                    file.write("{} {}\n".format(stack, nanoseconds // 1000))
+
+
+# ----------------------------------------------------------------------------
+# Profiles the phases of a compilation (see above). A profiler that is not enabled only runs
+# them: phase() measures nothing, and there is nothing to report.
+# ----------------------------------------------------------------------------
+class PhaseProfiler:
+    def __init__(self, enabled=True, stats_file=None, stacks_file=None):
+        if stats_file and stacks_file:
+            raise ValueError("cProfile statistics and collapsed stacks can not be dumped at once")
+
+        self.enabled = enabled or bool(stats_file or stacks_file)
+        self.phases = []
+        self.stats_file = stats_file
+        self.stacks_file = stacks_file
+        self.calls = None
+        if stats_file:
+            import cProfile
+
+            self.calls = cProfile.Profile()
+        elif stacks_file:
+            self.calls = StackProfiler()
+
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    # from_arguments(arguments) => the profiler asked for by the command line arguments.
+    @classmethod
+    def from_arguments(cls, arguments):
+        def value(flag):
+            if flag not in arguments or arguments.index(flag) + 1 >= len(arguments):
+                return None
+            return arguments[arguments.index(flag) + 1]
+
+        return cls("--profile" in arguments, value("--profile-stats"), value("--profile-stacks"))
+
+    # ----------------------------------------------------------------------------
+    # Runs the body of the with statement as the phase 'name', counting 'unit's;
+    # yields its Phase, whose count the body (or the code after it) sets.
+    # ----------------------------------------------------------------------------
+    @contextlib.contextmanager
+    def phase(self, name, unit=""):
+        phase = Phase(name, unit)
+        if not self.enabled:
+            yield phase
+            return
+
+        self.phases.append(phase)
+        tracemalloc.reset_peak()
+        memory = tracemalloc.get_traced_memory()[0]
+        if isinstance(self.calls, StackProfiler):
+            self.calls.start(name)
+        elif self.calls is not None:
+            self.calls.enable()
+        start = time.perf_counter()
+        try:
+            yield phase
+        finally:
+            phase.seconds = time.perf_counter() - start
+            if isinstance(self.calls, StackProfiler):
+                self.calls.stop()
+            elif self.calls is not None:
+                self.calls.disable()
+            current, peak = tracemalloc.get_traced_memory()
+            phase.peak_bytes = peak - memory
+            phase.held_bytes = current - memory
+
+    # report() => returns the table of the phases, with their totals.
+    def report(self) -> str:
+        lines = [
+            "~ COMPILE PROFILE ~",
+            "{: <16} {: >10} {: >12} {: >12} {: >10}  {}".format(
+                "phase", "wall ms", "peak kB", "held kB", "count", "of"
+            ),
+        ]
+        for phase in self.phases:
+            lines.append(
+                "{: <16} {: >10.3f} {: >12.1f} {: >12.1f} {: >10}  {}".format(
+                    phase.name,
+                    phase.seconds * 1000,
+                    phase.peak_bytes / 1000,
+                    phase.held_bytes / 1000,
+                    "" if phase.count is None else phase.count,
+                    phase.unit,
+                )
+            )
+        lines.append(
+            "{: <16} {: >10.3f} {: >12.1f}".format(
+                "total",
+                sum(phase.seconds for phase in self.phases) * 1000,
+                max((phase.peak_bytes for phase in self.phases), default=0) / 1000,
+            )
+        )
+        return "\n".join(lines) + "\n"
+
+    # finish() => prints the report to stderr, and writes the dump asked for.
+    def finish(self):
+        if not self.enabled:
+            return
+        print(self.report(), file=sys.stderr)
+        if self.stats_file:
+            self.calls.dump_stats(self.stats_file)
+        elif self.stacks_file:
+            self.calls.dump(self.stacks_file)
+
+
+# ----------------------------------------------------------------------------
+# A lexer with the interface of a ply lexer, over tokens lexed before: the parser is given one
+# when lexing is profiled as a phase of its own, so that the parse phase does not lex again.
+# ----------------------------------------------------------------------------
+class ReplayLexer(StreamLexer):
+    def __init__(self, tokens):
+        self.tokens = iter(tokens)
+        self.lineno = 1
+        self.lexpos = 0
@@ -0,0 +1,590 @@
+# This file allocates the registers of the f23 virtual machine to the values of a function of the
+# IR (see ir.py): its 32 R (integer) registers and 16 F (double) registers (F23_RSize, F23_FSize).
+#
+# First, the scalar integer and double variables of the function itself are promoted: each one
+# gets a virtual register for the whole function, which its loads and stores become copies of.
+# A variable is only loaded from memory at the entry of the function if it may be read before it
+# is written there (a parameter, stored by the caller), and a variable of the static data is
+# stored back when the function returns; a variable of the stack frame is gone by then. Any other
+# variable never touches memory. The copies left are folded away where they can be:
+# "t := x; ...t..." reads x, and "t := a + b; x := t" is "x := a + b".
+#
+# Then the virtual registers are mapped to the R and F registers by linear scan: every virtual
+# register is live over one interval of the function (its blocks in layout order, see liveness()),
+# the intervals are walked by their start, and a register is given back when its interval ends.
+# When none is free, the interval that ends last is spilled: a variable to its place in memory,
+# any other value to a slot of the stack frame (below FR); a spilled value is loaded into one of
+# the registers kept for them (the last 2 of each file) where it is read, and stored where it is
+# written.
+#
+# A function of the program that is called allocates the registers all over again, so the values
+# that live across the call are saved in the frame of the caller before it, and loaded back after.
+#
+# Promotion does not pay in every function: one that calls a lot (the main of mg.f23) saves and
+# loads back its variables around every call, where it read them from memory only when it used
+# them. So a function is also allocated with its variables left in memory, and the allocation of
+# the two with the lower F23_Time is kept (see allocate_registers()).
+
+import copy
+
+from ir import (
+    DOUBLE,
+    INTEGER,
+    Address,
+    AddressOf,
+    Binary,
+    Call,
+    Convert,
+    Copy,
+    Invoke,
+    Load,
+    Negate,
+    Return,
+    Store,
+    VirtualRegister,
+)
+
+# Registers of the f23 virtual machine (F23_RSize, F23_FSize in f23.c), by data type.
+REGISTER_FILES = {INTEGER: ("R", 32), DOUBLE: ("F", 16)}
+
+# The last registers of each file are kept for the spilled values an instruction reads (at most 2).
+SCRATCH_REGISTERS = 2
+
+# The instructions that compute their destination from their operands only.
+COMPUTATIONS = (Binary, Negate, Convert, Copy, Load, Call, AddressOf)
+
+
+# ----------------------------------------------------------------------------
+# What allocation did to a function: its loads and stores of memory, and their access time
+# (F23_Time, counted once per instruction), before and after; the variables promoted, the
+# virtual registers spilled, and the report of the optimize pass (see allocate_registers()).
+# ----------------------------------------------------------------------------
+class AllocationReport:
+    def __init__(self, name):
+        self.name = name
+        self.memory_before = 0
+        self.memory_after = 0
+        self.time_before = 0
+        self.time_after = 0
+        self.promoted = 0
+        self.spilled = 0
+        self.optimization = None
+        # Set when the variables are left in memory, promotion costing more than it saves: the
+        # F23_Time the function would have had with them promoted.
+        self.promoted_time = None
+
+
+# memory_accesses(ir_function) => the loads and stores of a function.
+def memory_accesses(ir_function) -> int:
+    return sum(
+        isinstance(instruction, (Load, Store))
+        for block in ir_function.blocks
+        for instruction in block.instructions
+    )
+
+
+# ----------------------------------------------------------------------------
+# Allocates the registers of a function; promotes its variables first if 'promote' is set, unless
+# the function takes longer that way (see above; report.promoted_time is set then).
+# The function is rewritten in place (spill code included); returns the registers,
+# virtual register number => C name of its register, and the AllocationReport.
+# instruction_time(instruction) => the access time of an instruction, for the report.
+# optimize(ir_function) => a pass run once the variables are promoted, before the registers are
+# allocated (the loop optimization, see loop_optimization.py); what it returns is kept in the
+# report, as report.optimization.
+# ----------------------------------------------------------------------------
+def allocate_registers(ir_function, instruction_time, promote=True, optimize=None):
+    if not promote:
+        return allocate(ir_function, instruction_time, promote=False)
+
+    # The frame is the one made by the memory layout, which the allocation does not change.
+    in_memory = copy.deepcopy(ir_function, {id(ir_function.frame): ir_function.frame})
+    registers, report = allocate(ir_function, instruction_time, promote=True, optimize=optimize)
+    memory_registers, memory_report = allocate(in_memory, instruction_time, promote=False)
+    if memory_report.time_after < report.time_after:
+        vars(ir_function).update(vars(in_memory))
+        memory_report.promoted_time = report.time_after
+        return memory_registers, memory_report
+    return registers, report
+
+
+# allocate(ir_function, instruction_time, promote, optimize) => allocates the registers of a
+# function, as allocate_registers() says, with its variables promoted or not.
+def allocate(ir_function, instruction_time, promote, optimize=None):
+    report = AllocationReport(ir_function.name)
+    report.memory_before = memory_accesses(ir_function)
+    report.time_before = function_time(ir_function, instruction_time)
+
+    if promote:
+        report.promoted = promote_variables(ir_function)
+        fold_copies(ir_function)
+        if optimize is not None:
+            report.optimization = optimize(ir_function)
+
+    registers, spilled = linear_scan(ir_function)
+    report.spilled = len(spilled)
+    if spilled:
+        registers.update(rewrite_spills(ir_function, spilled))
+    save_across_calls(ir_function, registers)
+
+    report.memory_after = memory_accesses(ir_function)
+    report.time_after = function_time(ir_function, instruction_time)
+    return registers, report
+
+
+def function_time(ir_function, instruction_time) -> int:
+    return sum(
+        sum(map(instruction_time, block.instructions)) + instruction_time(block.terminator)
+        for block in ir_function.blocks
+    )
+
+
+# ----------------------------------------------------------------------------
+# Promotes the variables of the function (ir_function.variables) to virtual registers;
+# returns how many were promoted.
+# ----------------------------------------------------------------------------
+def promote_variables(ir_function) -> int:
+    homes = {}  # variable key => (its Address, its virtual register)
+
+    def home(address):
+        if address.index is not None or address.key() not in ir_function.variables:
+            return None
+        key = address.key()
+        if key not in homes:
+            homes[key] = address, ir_function.new_register(address.dtype)
+        return homes[key][1]
+
+    for block in ir_function.blocks:
+        for position, instruction in enumerate(block.instructions):
+            if isinstance(instruction, Load):
+                register = home(instruction.address)
+                if register is not None:
+                    block.instructions[position] = Copy(instruction.dest, register)
+            elif isinstance(instruction, Store):
+                register = home(instruction.address)
+                if register is not None:
+                    block.instructions[position] = Copy(register, instruction.source)
+
+    # A variable read before it is written is loaded when the function starts; one of the static
+    # data keeps its value from one call to the next.
+    live_in, live_out = liveness(ir_function)
+    entry_values = live_in[ir_function.blocks[0].number]
+    entry_loads = []
+    for address, register in homes.values():
+        if register.number in entry_values:
+            entry_loads.append(Load(register, address))
+            if address.register is not None:
+                continue
+            for block in ir_function.blocks:
+                if isinstance(block.terminator, Return):
+                    block.instructions.append(Store(address, register))
+    ir_function.blocks[0].instructions[:0] = entry_loads
+
+    # A promoted variable that is spilled goes back to its place in memory (see rewrite_spills()).
+    for address, register in homes.values():
+        ir_function.homes[register.number] = address
+    return len(homes)
+
+
+# ----------------------------------------------------------------------------
+# Folds the copies of the function (see above), block by block.
+# ----------------------------------------------------------------------------
+def fold_copies(ir_function):
+    # virtual register number => how many times it is written, and read.
+    definitions = {}
+    uses = {}
+    for block in ir_function.blocks:
+        for instruction in block.instructions + [block.terminator]:
+            if instruction.dest is not None:
+                number = instruction.dest.number
+                definitions[number] = definitions.get(number, 0) + 1
+            for register in instruction.uses():
+                uses[register.number] = uses.get(register.number, 0) + 1
+
+    for block in ir_function.blocks:
+        instructions = block.instructions + [block.terminator]
+        position = 0
+        while position < len(instructions) - 1:
+            instruction = instructions[position]
+            if isinstance(instruction, Copy) and (
+                instruction.source is instruction.dest
+                or propagate_copy(instructions, position, definitions, uses)
+                or coalesce_copy(instructions, position, definitions, uses)
+            ):
+                del instructions[position]
+            else:
+                position += 1
+        block.instructions = instructions[:-1]
+
+
+# reads(instruction, register) => how many times the instruction reads the virtual register.
+def reads(instruction, register) -> int:
+    return sum(used.number == register.number for used in instruction.uses())
+
+
+# ----------------------------------------------------------------------------
+# "t := x; ...t..." => "...x...": when the copy is the only write of t, every read of t comes after
+# it in the block, and x (a constant, or a register) is not written before the last of them.
+# Returns whether the copy was folded.
+# ----------------------------------------------------------------------------
+def propagate_copy(instructions, position, definitions, uses) -> bool:
+    copy = instructions[position]
+    dest, source = copy.dest, copy.source
+    if definitions[dest.number] != 1:
+        return False
+
+    later = instructions[position + 1 :]
+    counts = [reads(instruction, dest) for instruction in later]
+    if sum(counts) != uses.get(dest.number, 0):
+        return False
+    last = max((index for index, count in enumerate(counts) if count), default=-1)
+    if isinstance(source, VirtualRegister) and any(
+        instruction.dest is not None and instruction.dest.number == source.number
+        for instruction in later[:last]
+    ):
+        return False
+
+    for instruction, count in zip(later, counts):
+        if count:
+            instruction.replace_uses({dest.number: source})
+    if isinstance(source, VirtualRegister):
+        uses[source.number] += sum(counts) - 1
+    definitions[dest.number] = 0
+    uses[dest.number] = 0
+    return True
+
+
+# ----------------------------------------------------------------------------
+# "t := a + b; ... x := t" => "x := a + b": when t is only written by the instruction, and read by
+# the copy, and x is neither read nor written in between. Returns whether the copy was folded.
+# ----------------------------------------------------------------------------
+def coalesce_copy(instructions, position, definitions, uses) -> bool:
+    copy = instructions[position]
+    dest, source = copy.dest, copy.source
+    if not isinstance(source, VirtualRegister):
+        return False
+    if definitions[source.number] != 1 or uses[source.number] != 1:
+        return False
+
+    for index in range(position - 1, -1, -1):
+        instruction = instructions[index]
+        if instruction.dest is not None and instruction.dest.number == source.number:
+            break
+        if instruction.dest is not None and instruction.dest.number == dest.number:
+            return False
+        if reads(instruction, dest):
+            return False
+    else:
+        # Written in another block.
+        return False
+
+    if not isinstance(instruction, COMPUTATIONS):
+        return False
+    instruction.dest = dest
+    definitions[source.number] = 0
+    uses[source.number] = 0
+    return True
+
+
+# ----------------------------------------------------------------------------
+# Returns the live virtual registers (numbers) at the start and at the end of every block
+# (block number => set), by the usual backward data flow over the blocks.
+# ----------------------------------------------------------------------------
+def liveness(ir_function):
+    used = {}
+    defined = {}
+    for block in ir_function.blocks:
+        block_used = set()
+        block_defined = set()
+        for instruction in block.instructions + [block.terminator]:
+            for register in instruction.uses():
+                if register.number not in block_defined:
+                    block_used.add(register.number)
+            if instruction.dest is not None:
+                block_defined.add(instruction.dest.number)
+        used[block.number] = block_used
+        defined[block.number] = block_defined
+
+    live_in = {block.number: set() for block in ir_function.blocks}
+    live_out = {block.number: set() for block in ir_function.blocks}
+    changed = True
+    while changed:
+        changed = False
+        for block in reversed(ir_function.blocks):
+            number = block.number
+            out = set()
+            for successor in block.successors():
+                out |= live_in[successor.number]
+            entry = used[number] | (out - defined[number])
+            if out != live_out[number] or entry != live_in[number]:
+                live_out[number], live_in[number] = out, entry
+                changed = True
+
+    return live_in, live_out
+
+
+# ----------------------------------------------------------------------------
+# Returns the live interval of every virtual register: number => [start, end, VirtualRegister].
+# The instructions are numbered in layout order; an instruction at n reads its operands at 2n and
+# writes its destination at 2n + 1, so a value may take the register of one last read by the
+# instruction that writes it.
+# ----------------------------------------------------------------------------
+def live_intervals(ir_function):
+    live_in, live_out = liveness(ir_function)
+    intervals = {}
+
+    def extend(register, position):
+        interval = intervals.get(register.number)
+        if interval is None:
+            intervals[register.number] = [position, position, register]
+        else:
+            interval[0] = min(interval[0], position)
+            interval[1] = max(interval[1], position)
+
+    registers = {}
+    position = 0
+    for block in ir_function.blocks:
+        first = position
+        for instruction in block.instructions + [block.terminator]:
+            for register in instruction.uses():
+                registers[register.number] = register
+                extend(register, 2 * position)
+            if instruction.dest is not None:
+                registers[instruction.dest.number] = instruction.dest
+                extend(instruction.dest, 2 * position + 1)
+            position += 1
+        for number in live_in[block.number]:
+            extend(registers[number], 2 * first)
+        for number in live_out[block.number]:
+            extend(registers[number], 2 * position - 1)
+
+    return intervals
+
+
+# ----------------------------------------------------------------------------
+# Maps the virtual registers to registers by linear scan; returns the registers (virtual register
+# number => C name) and the spilled virtual registers.
+# ----------------------------------------------------------------------------
+def linear_scan(ir_function):
+    intervals = sorted(live_intervals(ir_function).values(), key=lambda interval: interval[0])
+    free = {
+        dtype: list(range(size - SCRATCH_REGISTERS))
+        for dtype, (file_name, size) in REGISTER_FILES.items()
+    }
+    active = []  # [end, register, VirtualRegister], of the intervals that hold a register
+    assigned = {}  # virtual register number => (VirtualRegister, register)
+    registers = {}
+    spilled = []
+
+    for start, end, virtual in intervals:
+        # Give back the registers of the intervals that ended.
+        for ended in [interval for interval in active if interval[0] < start]:
+            active.remove(ended)
+            free[ended[2].dtype].append(ended[1])
+
+        dtype = virtual.dtype
+        if free[dtype]:
+            register = min(free[dtype])
+            free[dtype].remove(register)
+        else:
+            # Spill the interval of this type that ends last: this one, or one holding a register.
+            candidates = [interval for interval in active if interval[2].dtype == dtype]
+            victim = max(candidates, key=lambda interval: interval[0])
+            if victim[0] <= end:
+                spilled.append(virtual)
+                continue
+            active.remove(victim)
+            spilled.append(victim[2])
+            del assigned[victim[2].number]
+            register = victim[1]
+
+        assigned[virtual.number] = virtual, register
+        active.append([end, register, virtual])
+
+    for number, (virtual, register) in assigned.items():
+        registers[number] = "{}[{}]".format(REGISTER_FILES[virtual.dtype][0], register)
+    return registers, spilled
+
+
+# ----------------------------------------------------------------------------
+# Rewrites the instructions that read or write spilled virtual registers: a read loads the value
+# into a scratch register first, a write stores it after. A variable is spilled to its place in
+# memory; its loads from and stores to there are dropped. Returns the registers of the scratch
+# virtual registers (number => C name).
+# ----------------------------------------------------------------------------
+def rewrite_spills(ir_function, spilled):
+    slots = {}
+    for virtual in spilled:
+        if virtual.number in ir_function.homes:
+            slots[virtual.number] = ir_function.homes[virtual.number]
+        else:
+            # A new slot of the stack frame, below FR.
+            ir_function.frame_size += 1
+            slots[virtual.number] = Address(
+                "Mem" if virtual.dtype == INTEGER else "FMem",
+                -ir_function.frame_size,
+                register="FR",
+            )
+
+    registers = {}
+
+    def scratch(dtype, index):
+        file_name, size = REGISTER_FILES[dtype]
+        virtual = ir_function.new_register(dtype)
+        registers[virtual.number] = "{}[{}]".format(file_name, size - SCRATCH_REGISTERS + index)
+        return virtual
+
+    for block in ir_function.blocks:
+        rewritten = []
+        for instruction in block.instructions + [block.terminator]:
+            dest = instruction.dest
+            if isinstance(instruction, Load) and dest is not None and dest.number in slots:
+                if slots[dest.number] is instruction.address:
+                    continue  # The variable is already in its place in memory.
+            if isinstance(instruction, Store) and isinstance(instruction.source, VirtualRegister):
+                if slots.get(instruction.source.number) is instruction.address:
+                    continue
+
+            replacements = {}
+            counts = {INTEGER: 0, DOUBLE: 0}
+            for register in instruction.uses():
+                if register.number in slots and register.number not in replacements:
+                    loaded = scratch(register.dtype, counts[register.dtype])
+                    counts[register.dtype] += 1
+                    rewritten.append(Load(loaded, slots[register.number]))
+                    replacements[register.number] = loaded
+            if replacements:
+                instruction.replace_uses(replacements)
+
+            store = None
+            if dest is not None and dest.number in slots:
+                instruction.dest = scratch(dest.dtype, 0)
+                store = Store(slots[dest.number], instruction.dest)
+
+            if instruction is block.terminator:
+                block.terminator = instruction
+            else:
+                rewritten.append(instruction)
+            if store is not None:
+                rewritten.append(store)
+        block.instructions = rewritten
+
+    return registers
+
+
+# ----------------------------------------------------------------------------
+# Saves the registers of the values live across every Invoke (see above): a variable in its place
+# in memory, any other value in a slot of the stack frame, one per register. A value is not stored
+# again while its place already holds it (it was loaded from there, or stored there, and not
+# written since, in the block): the values live across two calls in a row are only stored before
+# the first one. The values live across a call have different registers, so none of them can take
+# the slot of another one in between.
+# ----------------------------------------------------------------------------
+def save_across_calls(ir_function, registers):
+    live_in, live_out = liveness(ir_function)
+    virtuals = {}
+    for block in ir_function.blocks:
+        for instruction in block.instructions:
+            if instruction.dest is not None:
+                virtuals[instruction.dest.number] = instruction.dest
+
+    def in_home(address, register):
+        home = ir_function.homes.get(register.number)
+        return home is not None and address.index is None and address.key() == home.key()
+
+    # Invoke => the values (register numbers) whose place holds them before it.
+    saved = {}
+    for block in ir_function.blocks:
+        clean = set()
+        for instruction in block.instructions:
+            if isinstance(instruction, Invoke):
+                saved[instruction] = set(clean)
+                # The values live across it are loaded back from their places after it.
+                clean.update(virtuals)
+            elif instruction.dest is not None:
+                clean.discard(instruction.dest.number)
+                if isinstance(instruction, Load) and in_home(instruction.address, instruction.dest):
+                    clean.add(instruction.dest.number)
+            elif isinstance(instruction, Store) and isinstance(instruction.source, VirtualRegister):
+                if in_home(instruction.address, instruction.source):
+                    clean.add(instruction.source.number)
+
+    slots = {}  # C name of the register => its slot
+
+    def slot(virtual):
+        if virtual.number in ir_function.homes:
+            return ir_function.homes[virtual.number]
+        name = registers[virtual.number]
+        if name not in slots:
+            ir_function.frame_size += 1
+            slots[name] = Address(
+                "Mem" if virtual.dtype == INTEGER else "FMem",
+                -ir_function.frame_size,
+                register="FR",
+            )
+        return slots[name]
+
+    for block in ir_function.blocks:
+        # The block is walked backward, from the values live at its end.
+        live = set(live_out[block.number])
+        live.update(register.number for register in block.terminator.uses())
+        rewritten = []
+        for instruction in reversed(block.instructions):
+            if isinstance(instruction, Invoke):
+                across = [virtuals[number] for number in sorted(live) if number in registers]
+                rewritten.extend(Load(virtual, slot(virtual)) for virtual in reversed(across))
+                rewritten.append(instruction)
+                rewritten.extend(
+                    Store(slot(virtual), virtual)
+                    for virtual in reversed(across)
+                    if virtual.number not in saved[instruction]
+                )
+            else:
+                rewritten.append(instruction)
+            if instruction.dest is not None:
+                live.discard(instruction.dest.number)
+            live.update(register.number for register in instruction.uses())
+        block.instructions = rewritten[::-1]
+
+
+# report(reports) => the table of the AllocationReports given as parameter, with their totals;
+# a function whose variables were left in memory is marked "*", and said why below the table.
+def report(reports) -> str:
+    lines = [
+        "~ REGISTER ALLOCATION ~",
+        "{: <20} {: >9} {: >9} {: >9} {: >11} {: >11} {: >9}".format(
+            "function", "promoted", "spilled", "mem ops", "removed", "F23_Time", "drop"
+        ),
+    ]
+    for item in reports:
+        lines.append(
+            "{: <20} {: >9} {: >9} {: >9} {: >11} {: >11} {: >9}".format(
+                item.name if item.promoted_time is None else item.name + " *",
+                item.promoted,
+                item.spilled,
+                "{}->{}".format(item.memory_before, item.memory_after),
+                item.memory_before - item.memory_after,
+                "{}->{}".format(item.time_before, item.time_after),
+                item.time_before - item.time_after,
+            )
+        )
+    lines.append(
+        "{: <20} {: >9} {: >9} {: >9} {: >11} {: >11} {: >9}".format(
+            "total",
+            sum(item.promoted for item in reports),
+            sum(item.spilled for item in reports),
+            "",
+            sum(item.memory_before - item.memory_after for item in reports),
+            "",
+            sum(item.time_before - item.time_after for item in reports),
+        )
+    )
+    lines.append("(F23_Time: of every instruction once; loops run theirs more than once)")
+    for item in reports:
+        if item.promoted_time is not None:
+            lines.append(
+                "* {}: variables left in memory; promoted, its F23_Time would be {}->{}".format(
+                    item.name, item.time_before, item.promoted_time
+                )
+            )
+    return "\n".join(lines) + "\n"
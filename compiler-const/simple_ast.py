@@ -1,50 +1,82 @@
+import functools
 import sys
 
-import ply.yacc as yacc
-
 from code_generation import *
+from constant_folding import convert, evaluate, evaluate_chain, format_constant, parse_constant
+from ir_builder import Unsupported, build_ir
+from memory_layout import layout_memory
 from node_types import *
+from parse_tracing import JsonLinesSink, enable_tracing
+from parser_tables import build_parser
 from symbol_table_properties import *
-from simple_lex import tokens
+from simple_lex import StreamLexer, map_source, tokens
 from symbol_table import SymbolTable
+from tree_walk import visit_tree, walk_tree
+
 
+# ----------------------------------------------------------------------------
+# Raised by the walks when the program can not be compiled (like an undefined identifier);
+# its message is the one printed for it.
+# ----------------------------------------------------------------------------
+class CompileError(Exception):
+    pass
 
-symbol_table_hash_map = {}
+
+# print_banner(titles, file) => prints the banner of a walk through the AST, with its titles.
+def print_banner(*titles, file=None):
+    print(file=file)
+    print("~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~", file=file)
+    for title in titles:
+        print("~ {} ~".format(title), file=file)
+    print("~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~", file=file)
+    print(file=file)
 
 
 class Node:
-    def __init__(self, type, meta=None, children=None):
-        self.type = type
-        self.meta = meta
-        if children is not None:
-            if not isinstance(children, list):
-                self.children = [children]
-            else:
-                self.children = children
+    # ----------------------------------------------------------------------------
+    # Nodes are compact: no __dict__ (__slots__), the type is a small integer (see node_types.py),
+    # and the children are a tuple. Nodes with properties (the name of an identifier, the value
+    # of a constant...) are the typed subclasses below, which hold them in their own slots.
+    # ----------------------------------------------------------------------------
+    __slots__ = ("type", "children")
+
+    def __init__(self, type, children=None):
+        self.type = node_type(type) if isinstance(type, str) else type
+        if children is None:
+            self.children = ()
+        elif isinstance(children, (list, tuple)):
+            self.children = tuple(children)
         else:
-            self.children = []
+            self.children = (children,)
 
     def append_child(self, child: "Node"):
-        self.children.append(child)
+        self.children += (child,)
+
+    # A node is pickled with the name of its type: the node types of the names that come from
+    # tokens depend on the order they were first seen in (see node_types.py), so they are not the
+    # same from one process to the next.
+    def __getstate__(self):
+        properties = ()
+        if type(self) is not Node:
+            properties = tuple(getattr(self, slot) for slot in self.__slots__)
+        return NODE_TYPE_NAMES[self.type], self.children, properties
+
+    def __setstate__(self, state):
+        name, self.children, properties = state
+        self.type = node_type(name)
+        for slot, value in zip(self.__slots__, properties):
+            setattr(self, slot, value)
 
     @staticmethod
     def print_tree(node):
-        print()
-        print("~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~")
-        print("~ WALKING THROUGH THE AST ~")
-        print("~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~")
-        print()
-
-        level = "1"
-        print(
-            "Position: {: >15} | Parent Position: {: >15} |".format(level, "N/A"), node
-        )
-        queue = [
-            (child, "{}{}".format(level, position), level)
-            for position, child in enumerate(node.children)
-        ]
-        while queue:
-            node, position, parent = queue.pop(0)
+        print_banner("WALKING THROUGH THE AST")
+
+        # The scope passed down the tree is the position of the parent node.
+        for node, position, parent in walk_tree(
+            node,
+            scope="N/A",
+            enter_scope=lambda node, position, parent: position,
+        ):
             print(
                 "Position: {: >15} | Parent Position: {: >15} |".format(
                     position, parent
@@ -52,422 +84,83 @@ class Node:
                 node,
             )
 
-            child_position = 0
-            if isinstance(node, Node):
-                for child in node.children:
-                    queue.append(
-                        (child, "{}{}".format(position, child_position), position)
-                    )
-                    child_position += 1
+    # ----------------------------------------------------------------------------
+    # The symbol table and code generation walks take the function that walks through the tree:
+    # visit_tree for a tree of Node objects, or FlatTree.visit for a flattened tree (flat_ast.py).
+    # They keep no state of their own: the symbol tables of a program are returned by
+    # generate_symbol_tables, and given to walk_tree_generate_code. What they print goes to file
+    # (sys.stdout by default).
+    # ----------------------------------------------------------------------------
+    @staticmethod
+    def fold_constants(node):
+        # Folds the constant arithmetic of the tree in place (see ConstantFolder);
+        # returns the number of nodes replaced by a constant.
+        folder = ConstantFolder()
+        folder.fold(node)
+        return folder.folded
 
     @staticmethod
-    def generate_symbol_tables(node):
-        print()
-        print("~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~")
-        print("~ WALKING THROUGH THE AST ~")
-        print("~ GENERATING SYMBOL TABLE ~")
-        print("~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~")
-        print()
+    def generate_symbol_tables(node, visit=visit_tree, file=None):
+        # Returns the symbol tables of the program, by scope name.
+        print_banner("WALKING THROUGH THE AST", "GENERATING SYMBOL TABLE", file=file)
 
         # ----------------------------------------------------
         # Generate symbol table for ROOT program node...
         # ----------------------------------------------------
-        # This is the root program scope, so create a new symbol table; add to the symbol table hash map.
+        # This is the root program scope, so create a new symbol table; add it to the symbol tables
+        # of the program (which all the tables of the program share).
         program_symbol_table = SymbolTable(
             parent_table=None,
-            scope=node.type,
-            scope_name=node.meta.name,
+            scope=NODE_TYPE_NAMES[node.type],
+            scope_name=node.name,
         )
 
         program_st_key = str(program_symbol_table.scope_name)
-        symbol_table_hash_map[program_st_key] = program_symbol_table
-
-        level = "1"
-        print(
-            "Position: {: >10} | Symbol Table: {: >15} | Parent Symbol Table: {: >15} |".format(
-                level,
-                program_symbol_table.scope_name,
-                "N/A",
-            ),
-            node,
-        )
-        queue = [
-            (
-                child,
-                "{}{}".format(level, position),
-                program_symbol_table,
-                program_symbol_table,
-            )
-            for position, child in enumerate(node.children)
-        ]
-
-        while queue:
-            node, position, node_st, parent_st = queue.pop(0)
-
-            # ----------------------------------------------------
-            # Generate symbol table for other nodes.
-            # ----------------------------------------------------
-            # In the case of a "function" or a "procedure" node:
-            #   Generate a symbol table for it;
-            #   Get its parent symbol table;
-            #   Add it as the "function"/"procedure" parent symbol table;
-            #   Add the "function"/"procedure" symbol table to the symbol tables hash map.
-            # In the case of other nodes:
-            #   Get its symbol table (node_st), which is passed down;
-            #   Add to or manipulate the symbol table depending on what the node requires.
-            # ----------------------------------------------------
-            if node.type is FUNCTION:
-                function_symbol_table = SymbolTable(
-                    scope=node.type,
-                    scope_name=node.meta.name,
-                    parent_table=parent_st,
-                )
+        program_symbol_table.symbol_tables[program_st_key] = program_symbol_table
 
-                function_st_key = str(function_symbol_table.scope_name)
-                symbol_table_hash_map[function_st_key] = function_symbol_table
-
-                child_position = 0
-                if isinstance(node, Node):
-                    for child in node.children:
-                        queue.append(
-                            (
-                                child,
-                                "{}{}".format(position, child_position),
-                                function_symbol_table,
-                                parent_st,
-                            ),
-                        )
-                        child_position += 1
-
-                print(
-                    "Position: {: >10} | Symbol Table: {: >15} | Parent Symbol Table: {: >15} |".format(
-                        position,
-                        function_symbol_table.scope_name,
-                        parent_st.scope_name,
-                    ),
-                    node,
-                )
+        # ----------------------------------------------------
+        # Generate symbol table for other nodes.
+        # ----------------------------------------------------
+        # The scope passed down the tree is the symbol table of the nodes;
+        # see symbol_table_visitors for what each type of node adds to it.
+        # ----------------------------------------------------
+        visit(node, symbol_table_visitors, scope=program_symbol_table)
 
-            elif node.type is PROCEDURE:
-                procedure_symbol_table = SymbolTable(
-                    scope=node.type,
-                    scope_name=node.meta.name,
-                    parent_table=parent_st,
-                )
+        return program_symbol_table.symbol_tables
 
-                # If the procedure has parameters, add them to the symbol table
-                try:
-                    procedure_parameter_dtype = node.meta.args[0][0]
-                    procedure_parameter_identifier = node.meta.args[0][1]
-
-                    procedure_symbol_table.put(
-                        symbol=procedure_parameter_identifier,
-                        property_key=DATA_TYPE,
-                        property_value=procedure_parameter_dtype,
-                    )
-                except:
-                    # Nothing, the procedure has no parameters to add to symbol table
-                    pass
-
-                procedure_st_key = str(procedure_symbol_table.scope_name)
-                symbol_table_hash_map[procedure_st_key] = procedure_symbol_table
-
-                child_position = 0
-                if isinstance(node, Node):
-                    for child in node.children:
-                        queue.append(
-                            (
-                                child,
-                                "{}{}".format(position, child_position),
-                                procedure_symbol_table,
-                                parent_st,
-                            ),
-                        )
-                        child_position += 1
-
-                print(
-                    "Position: {: >10} | Symbol Table: {: >15} | Parent Symbol Table: {: >15} |".format(
-                        position,
-                        procedure_symbol_table.scope_name,
-                        parent_st.scope_name,
-                    ),
-                    node,
-                )
+    @staticmethod
+    def walk_tree_generate_code(node, symbol_tables, visit=visit_tree, emitter=None, file=None):
+        print_banner("WALKING THROUGH THE AST", "GENERATING CODE", file=file)
 
-            else:
-                symbol_table = node_st
-
-                if node.type is VARIABLE_DEFINITION:
-                    # "variable_definition" will only have 2 types of children:
-                    #   * DTYPE
-                    #   * IDENTIFIER
-                    symbol = None
-                    dtype = None
-                    for child in node.children:
-                        if child.type is IDENTIFIER:
-                            # Create a new symbol table entry for this IDENTIFIER:
-                            symbol = child.meta.name
-                        else:
-                            # symbol = SymbolProperties(data_type=child.meta.dtype)
-                            dtype = child.meta.dtype
-
-                    # Place in the symbol table, for symbol, the property.
-                    # This property can then be accessed with: symbol_table[symbol][property].
-                    symbol_table.put(
-                        symbol=symbol, property_key=DATA_TYPE, property_value=dtype
-                    )
-
-                elif node.type is VARIABLE_ASSIGNMENT:
-                    # "variable_assignment" will only have 3 types of children:
-                    #   * IDENTIFIER
-                    #   * ASSIGN
-                    #   * expression
-                    id_name = None
-                    id_value = None
-                    for child in node.children:
-                        if child.type is IDENTIFIER:
-                            id_name = child.meta.name
-                        elif child.type is EXPRESSION:
-                            # Get the value of this expression node;
-                            # The value is returned as a list:
-                            id_value: list = get_expression_value(
-                                child,
-                                expression_list=[],
-                            )
-                        else:
-                            # This is where the ASSIGN node goes to;
-                            # Nothing is done here.
-                            pass
-
-                    # Add to symbol table;
-                    # BEFORE adding to symbol table,
-                    # Check the current symbol table and parent tables for the value of this IDENTIFIER.
-                    # If it exists, update its value;
-                    # Otherwise, throw an error.
-                    current_symbol_table = symbol_table
-                    while current_symbol_table is not None:
-                        if current_symbol_table.is_present(id_name):
-                            # Update the symbol value in the symbol table.
-                            # current_symbol_table.put(key=id_name, value=id_value)
-                            current_symbol_table.put(
-                                symbol=id_name,
-                                property_key=VALUE,
-                                property_value=id_value,
-                            )
-                            break
-                        current_symbol_table = current_symbol_table.parent_table
-                    else:
-                        print(
-                            'Error! Identifier "%s" not defined, found at line number PLACE_LINE_NUMBER_HERE.'
-                            % id_name
-                        )
-                        exit(0)
-
-                elif node.type is PROCEDURE_CALL:
-                    # For this node, we want to update the parameter value of the procedure symbol table.
-                    procedure_identifier = node.meta.name
-                    procedure_argument_node = node.children[0].children[0]
-                    procedure_argument_identifier = procedure_argument_node.meta.name
-                    procedure_argument_value = symbol_table.table[
-                        procedure_argument_identifier
-                    ][VALUE]
-
-                    symbol_table_hash_map[procedure_identifier].table[
-                        procedure_argument_identifier
-                    ][VALUE] = procedure_argument_value
-
-                elif node.type is CONSTANT:
-                    # For this node, we want to add its constant to its scope symbol table.
-                    constant_dtype = node.meta.dtype
-                    constant_value = node.meta.value
-                    symbol_table.put_constant(
-                        const_dtype=constant_dtype,
-                        const_value=constant_value,
-                    )
-
-                child_position = 0
-                if isinstance(node, Node):
-                    for child in node.children:
-                        queue.append(
-                            (
-                                child,
-                                "{}{}".format(position, child_position),
-                                node_st,
-                                parent_st,
-                            ),
-                        )
-                        child_position += 1
-
-                print(
-                    "Position: {: >10} | Symbol Table: {: >15} | ".format(
-                        position,
-                        node_st.scope_name,
-                    ),
-                    node,
-                )
+        # Generated code is collected in memory and written once, at the end of the walk;
+        # when an emitter is given, the code is left in it for the caller (nothing is written).
+        write = emitter is None
+        if write:
+            emitter = CodeEmitter()
 
-    @staticmethod
-    def walk_tree_generate_code(node):
-        print()
-        print("~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~")
-        print("~ WALKING THROUGH THE AST ~")
-        print("~ GENERATING CODE ~")
-        print("~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~")
-        print()
-
-        program_symbol_table = symbol_table_hash_map[node.meta.name]
-        level = "1"
-        print(
-            "Position: {: >10} | Symbol Table: {: >15} | Parent Symbol Table: {: >15} |".format(
-                level,
-                program_symbol_table.scope_name,
-                "N/A",
-            ),
-            node,
-        )
-        queue = [
-            (
-                child,
-                "{}{}".format(level, position),
-                program_symbol_table,
-                program_symbol_table,
-            )
-            for position, child in enumerate(node.children)
-        ]
-
-        while queue:
-            node, position, node_st, parent_st = queue.pop(0)
-
-            if node.type is FUNCTION:
-                # Get the function symbol table;
-                # Pass it down to its children:
-                function_symbol_table = symbol_table_hash_map[node.meta.name]
-
-                # Generate code for this 'function' node:
-                generate_code_function(node)
-
-                child_position = 0
-                if isinstance(node, Node):
-                    for child in node.children:
-                        queue.append(
-                            (
-                                child,
-                                "{}{}".format(position, child_position),
-                                function_symbol_table,
-                                parent_st,
-                            ),
-                        )
-                        child_position += 1
-
-                print(
-                    "Position: {: >10} | Symbol Table: {: >15} | Parent Symbol Table: {: >15} |".format(
-                        position,
-                        function_symbol_table.scope_name,
-                        parent_st.scope_name,
-                    ),
-                    node,
-                )
+        # Every variable and string constant is given its place in memory before the walk;
+        # the static data is set up once, by the prologue.
+        layout = layout_memory(symbol_tables.values())
+        generate_code_static_data(emitter, layout)
 
-            # TODO: Place an elif for PROCEDURE here:
+        # The scope passed down the tree is the symbol table of the nodes.
+        program_symbol_table = symbol_tables[node.name]
+        visit(node, code_visitors(emitter), scope=program_symbol_table)
 
-            else:
-                current_symbol_table = node_st
-
-                if node.type == FUNCTION_CALL:
-                    # Walk its left branch to get the function call type.
-                    # The function call type will directly be the first child in the left branch.
-                    function_call_type_node = node.children[0]
-                    function_call_type = function_call_type_node.type
-
-                    # Walk its right branch to get the function call argument value.
-                    right_node = node.children[1]
-                    function_call_argument_value_node = get_function_call_argument(
-                        right_node
-                    )
-
-                    # -------------------------
-                    # There are 2 types of args:
-                    #   CONSTANT -> Get value from node.
-                    #   IDENTIFIER -> Get value corresponding to IDENTIFIER from symbol table.
-                    # -------------------------
-                    if function_call_argument_value_node.type == IDENTIFIER:
-                        identifier_name = function_call_argument_value_node.meta.name
-                        # TODO: Left off here...
-                        print("PRINTING SYMBOL TABLE...")
-                        print(current_symbol_table)
-                    else:
-                        function_call_argument_value = (
-                            function_call_argument_value_node.meta.value
-                        )
-                        function_call_argument_dtype = (
-                            function_call_argument_value_node.meta.dtype
-                        )
-
-                    # Retrieve the constant/variable in the symbol table.
-                    # Allocate space in memory for the constant/variable.
-                    function_call_argument_mem_location = None
-                    const_list = current_symbol_table.table["CONSTANTS"]
-                    for const in const_list:
-                        if (
-                            const[DTYPE] == function_call_argument_dtype
-                            and const[VALUE] == function_call_argument_value
-                        ):
-                            if function_call_argument_dtype == "SCONSTANT":
-                                # Memory value is the argument length + 1 for the end of string in C.
-                                # Subtract 2 from length to account for the quotation marks.
-                                mem_value = len(function_call_argument_value) - 2 + 1
-                                const[MEM_LOCATION] = mem_value
-
-                                # Get the memory location of the function call argument:
-                                function_call_argument_mem_location = str(mem_value)
-
-                    # Pass this information to the code generation function.
-                    #   - function call type
-                    #   - constant value
-                    #   - constant memory location
-                    generate_code_function_call(
-                        call_type=function_call_type,
-                        argument=function_call_argument_value,
-                        mem_location=function_call_argument_mem_location,
-                    )
-
-                child_position = 0
-                if isinstance(node, Node):
-                    for child in node.children:
-                        queue.append(
-                            (
-                                child,
-                                "{}{}".format(position, child_position),
-                                node_st,
-                                parent_st,
-                            ),
-                        )
-                        child_position += 1
-
-                print(
-                    "Position: {: >10} | Symbol Table: {: >15} | ".format(
-                        position,
-                        node_st.scope_name,
-                    ),
-                    node,
-                )
+        if write:
+            emitter.write("yourmain.h")
 
-    def __repr__(self) -> str:
-        if self.meta:
-            return "<Node: {}, Meta: {}>".format(self.type, self.meta)
-        return "<Node: {}>".format(self.type)
+        return layout
 
+    # meta_repr() => returns the representation of the properties of the node, if it has any.
+    def meta_repr(self):
+        return None
 
-def get_function_call_argument(node: Node):
-    while node:
-        if node.type == IDENTIFIER or node.type == CONSTANT:
-            print("PRINTING FROM INSIDE IF...")
-            print(node.type)
-            return node
-        else:
-            print("PRINTING FROM INSIDE ELSE...")
-            print(node.type)
-            node = node.children[0]
+    def __repr__(self) -> str:
+        meta = self.meta_repr()
+        if meta:
+            return "<Node: {}, Meta: {}>".format(NODE_TYPE_NAMES[self.type], meta)
+        return "<Node: {}>".format(NODE_TYPE_NAMES[self.type])
 
 
 def get_expression_value(node: Node, expression_list: list):
@@ -477,12 +170,13 @@ def get_expression_value(node: Node, expression_list: list):
     #   right: expressionNode
     # Recursively traverse the node in In-Order Binary traversal;
     # BASE CASE - the node is a CONSTANT or an IDENTIFIER.
+    # (Tokens kept as strings, like the MINUS of a negative constant, hold no value.)
 
-    if node is not None:
+    if is_node(node):
         # ----------------------
         # BASE CASE: CONSTANT or IDENTIFIER
         # ----------------------
-        if node.type is CONSTANT or node.type is IDENTIFIER:
+        if node.type == CONSTANT or node.type == IDENTIFIER:
             expression_list.append(node)
         # ----------------------
 
@@ -500,109 +194,666 @@ def get_expression_value(node: Node, expression_list: list):
     return expression_list
 
 
+# ----------------------------------------------------
+# Visitors of the symbol table walk.
+# Each one is given a node, its position, and the symbol table of its scope.
+# ----------------------------------------------------
+def enter_function_scope(node, position, symbol_table):
+    # In the case of a "function" node:
+    #   Generate a symbol table for it, whose parent is the symbol table of its scope;
+    #   Add its parameters to it, in order;
+    #   Add the "function" symbol table to the symbol tables of the program;
+    #   Pass it down to its children.
+    function_symbol_table = SymbolTable(
+        scope=NODE_TYPE_NAMES[node.type],
+        scope_name=node.name,
+        parent_table=symbol_table,
+    )
+    function_symbol_table.return_type = getattr(node, "return_type", None)
+
+    # The parameters are added before the body is walked (the walk is breadth-first, so the
+    # statements of the body would be reached before the definitions of the parameters).
+    for parameter_position, (symbol, dtype, array_size) in enumerate(get_parameters(node)):
+        function_symbol_table.put(symbol=symbol, property_key=DATA_TYPE, property_value=dtype)
+        function_symbol_table.put(
+            symbol=symbol, property_key=PARAMETER, property_value=parameter_position
+        )
+        if array_size is not None:
+            function_symbol_table.put(
+                symbol=symbol, property_key=ARRAY_SIZE, property_value=array_size
+            )
+
+    function_st_key = str(function_symbol_table.scope_name)
+    symbol_table.symbol_tables[function_st_key] = function_symbol_table
+
+    return function_symbol_table
+
+
+def enter_procedure_scope(node, position, symbol_table):
+    # Same as for a "function" node; a procedure returns nothing.
+    return enter_function_scope(node, position, symbol_table)
+
+
+def add_variable_definition(node, position, symbol_table):
+    # "variable_definition" will only have 2 types of children:
+    #   * DTYPE
+    #   * IDENTIFIERS (one or more identifiers, separated by commas)
+    # "array_variable_definition" has a single IDENTIFIER instead, and its size expression.
+    dtype = node.children[0].dtype
+
+    # Place in the symbol table, for symbol, the property.
+    # This property can then be accessed with: symbol_table[symbol][property].
+    for symbol, array_size in get_defined_variables(node):
+        symbol_table.put(symbol=symbol, property_key=DATA_TYPE, property_value=dtype)
+        if array_size is not None:
+            symbol_table.put(
+                symbol=symbol, property_key=ARRAY_SIZE, property_value=array_size
+            )
+
+
+def add_variable_declaration(node, position, symbol_table):
+    # "variable_declaration" defines the variables of its "variable_definition" (the last one is
+    # assigned the expression), then the identifiers after the expression, all of the same type.
+    # They are all added when the declaration is reached: the walk is breadth-first, so the
+    # statements after it are reached before its children.
+    definition, assign, expression, identifiers = node.children
+    dtype = definition.children[0].dtype
+    defined = get_defined_variables(definition) + get_defined_identifiers(identifiers)
+    for symbol, array_size in defined:
+        symbol_table.put(symbol=symbol, property_key=DATA_TYPE, property_value=dtype)
+        if array_size is not None:
+            symbol_table.put(
+                symbol=symbol, property_key=ARRAY_SIZE, property_value=array_size
+            )
+
+
+def assign_variable(node, position, symbol_table):
+    # "variable_assignment" will only have 3 types of children:
+    #   * IDENTIFIER
+    #   * ASSIGN
+    #   * expression
+    # The children are Node objects, or FlatNode views of them (flat_ast.py): both have a type.
+    id_name = None
+    id_value = None
+    for child in node.children:
+        child_type = getattr(child, "type", None)
+        if child_type is None:
+            # The ASSIGN token of an array element assignment is kept as a string.
+            continue
+        if child_type == IDENTIFIER:
+            id_name = child.name
+        elif child_type == EXPRESSION:
+            # Get the value of this expression node;
+            # The value is a number if the expression was folded to a constant, otherwise it is returned as a list:
+            id_value = get_folded_value(child)
+            if id_value is None:
+                id_value: list = get_expression_value(
+                    child,
+                    expression_list=[],
+                )
+        else:
+            # This is where the ASSIGN node goes to;
+            # Nothing is done here.
+            pass
+
+    set_variable_value(symbol_table, id_name, id_value)
+
+
+def set_variable_value(symbol_table, id_name, id_value):
+    # Add to symbol table;
+    # BEFORE adding to symbol table,
+    # Resolve this IDENTIFIER in the current symbol table and parent tables (cached by the table).
+    # If it exists, update its value;
+    # Otherwise, throw an error.
+    resolution = symbol_table.resolve(id_name)
+    if resolution is None:
+        raise CompileError(
+            'Error! Identifier "%s" not defined, found at line number PLACE_LINE_NUMBER_HERE.'
+            % id_name
+        )
+
+    # Update the symbol value in the symbol table.
+    symbol_table.get_resolved(resolution)[VALUE] = id_value
+
+
+def add_constant(node, position, symbol_table):
+    # For this node, we want to add its constant to its scope symbol table.
+    constant_dtype = node.dtype
+    constant_value = node.value
+    symbol_table.put_constant(
+        const_dtype=constant_dtype,
+        const_value=constant_value,
+    )
+
+
+symbol_table_visitors = {
+    FUNCTION: enter_function_scope,
+    PROCEDURE: enter_procedure_scope,
+    VARIABLE_DEFINITION: add_variable_definition,
+    ARRAY_VARIABLE_DEFINITION: add_variable_definition,
+    VARIABLE_DECLARATION: add_variable_declaration,
+    VARIABLE_ASSIGNMENT: assign_variable,
+    CONSTANT: add_constant,
+}
+
+
+# ----------------------------------------------------
+# Visitors of the code generation walk.
+# Each one is given the code emitter, a node, its position, and the symbol table of its scope.
+# ----------------------------------------------------
+def generate_function_code(emitter, node, position, symbol_table):
+    # Get the function (or procedure) symbol table;
+    # Pass it down to its children:
+    function_symbol_table = symbol_table.symbol_tables[node.name]
+
+    # Generate code for this 'function' or 'procedure' node: build its IR, statement by statement,
+    # then lower the IR to C (see ir_builder.py and code_generation.py).
+    try:
+        ir_function = build_ir(node, function_symbol_table)
+    except Unsupported as error:
+        raise CompileError(error.message(node.name))
+    lower_function(emitter, ir_function)
+
+    return function_symbol_table
+
+
+# code_visitors(emitter) => the visitors of the code generation walk, emitting into the emitter.
+def code_visitors(emitter):
+    return {
+        FUNCTION: functools.partial(generate_function_code, emitter),
+        PROCEDURE: functools.partial(generate_function_code, emitter),
+    }
+
+
+# ----------------------------------------------------
+# Constant folding.
+# Replaces, in place, the arithmetic (expression, term and factor nodes) whose operands are all known
+# at compile time by its value; the arithmetic itself is in constant_folding.py.
+# The known values of variables are propagated through straight-line code: the statements of a
+# scope body are folded in order, so a variable assigned a constant is known until it is assigned
+# something else, or until control flow (if, do, while, calls that are not built in) makes it unknown.
+# ----------------------------------------------------
+class ConstantFolder:
+    # The built in functions, which change no variable.
+    PRINT_FUNCTIONS = ("print_integer", "print_double", "print_string")
+
+    def __init__(self):
+        # variable name => its value, while it is known.
+        self.known = {}
+        # variable name => its data type, for the scope being folded.
+        self.types = {}
+        # The number of nodes replaced by a constant.
+        self.folded = 0
+
+    def fold(self, node):
+        if not is_node(node):
+            return
+
+        node_type = node.type
+        if node_type == EXPRESSION or node_type == TERM:
+            self.fold_chain(node)
+        elif node_type == FUNCTION or node_type == PROCEDURE:
+            self.fold_scope(node)
+        elif node_type == VARIABLE_ASSIGNMENT:
+            self.fold_assignment(node)
+        elif node_type == VARIABLE_DECLARATION:
+            self.fold_declaration(node)
+        elif node_type == VARIABLE_DEFINITION or node_type == ARRAY_VARIABLE_DEFINITION:
+            self.fold_definition(node)
+        elif node_type == VARIABLE_DECREMENT_INCREMENT:
+            self.fold_increment(node)
+        elif node_type == FUNCTION_CALL or node_type == PROCEDURE_CALL:
+            self.fold_children(node)
+            if (
+                node_type == PROCEDURE_CALL
+                or NODE_TYPE_NAMES[node.children[0].type] not in self.PRINT_FUNCTIONS
+            ):
+                # The call may change any variable it can see.
+                self.known.clear()
+        elif node_type == IF:
+            self.fold_if(node)
+        elif node_type == DO or node_type == WHILE:
+            self.fold_loop(node)
+        else:
+            self.fold_children(node)
+
+    def fold_children(self, node):
+        for child in node.children:
+            self.fold(child)
+
+    # A function or procedure body may run at any time: nothing is known when it starts.
+    def fold_scope(self, node):
+        known, types = self.known, self.types
+        self.known, self.types = {}, dict(types)
+        self.fold_children(node)
+        self.known, self.types = known, types
+
+    # The condition and every branch start from what is known before the "if"; nothing is known after it.
+    def fold_if(self, node):
+        known = self.known
+        for child in node.children:
+            self.known = dict(known)
+            self.fold(child)
+        self.known = {}
+
+    # The condition, the step and the body run many times: each starts from nothing known.
+    def fold_loop(self, node):
+        for child in node.children:
+            self.known = {}
+            self.fold(child)
+        self.known = {}
+
+    def fold_definition(self, node):
+        # Fold the size expressions of arrays; the identifiers are chained, so walk them in a loop.
+        children = list(node.children[1:])
+        while children:
+            child = children.pop()
+            if child.type == IDENTIFIERS:
+                children.extend(child.children)
+            elif child.type != IDENTIFIER:
+                self.fold(child)
+
+        dtype = node.children[0].dtype
+        for name, array_size in get_defined_variables(node):
+            self.types[name] = dtype if array_size is None else None
+            self.known.pop(name, None)
+
+    def fold_declaration(self, node):
+        # "variable_declaration" has 4 children: variable_definition, ASSIGN, expression, identifiers.
+        definition, assign, expression, identifiers = node.children
+        self.fold(definition)
+        value = self.fold_chain(expression)
+
+        dtype = definition.children[0].dtype
+        for name, array_size in get_defined_identifiers(identifiers):
+            self.types[name] = dtype if array_size is None else None
+            self.known.pop(name, None)
+
+        # "integer i, n := 1" assigns n, the last variable of the definition.
+        names = get_defined_variables(definition)
+        if names:
+            self.assign(names[-1][0], value)
+
+    # fold_assignment(node) => the value assigned, if it is known.
+    def fold_assignment(self, node):
+        children = node.children
+        if len(children) == 4:
+            # An array element: IDENTIFIER, index, ASSIGN (a string), value; elements are not tracked.
+            self.fold(children[1])
+            value = self.fold_value(children[3])
+            return value if children[2] == ":=" else None
+
+        name = children[0].name
+        operator = NODE_TYPE_NAMES[children[1].type]
+        value = self.fold_value(children[2])
+        if operator != ":=":
+            # "x += value" is "x := x + value" (and so on, for the other operators).
+            value = evaluate(operator[0], self.known.get(name), value)
+
+        return self.assign(name, value)
+
+    def fold_increment(self, node):
+        name = node.children[0].name
+        operator = NODE_TYPE_NAMES[node.children[1].type]
+        self.assign(name, evaluate(operator[0], self.known.get(name), 1))
+
+    # fold_value(node) => the value of the right hand side of an assignment, if it is known.
+    def fold_value(self, node):
+        if node.type == EXPRESSION:
+            return self.fold_chain(node)
+        if node.type == VARIABLE_ASSIGNMENT:
+            return self.fold_assignment(node)
+
+        self.fold(node)
+        return None
+
+    # assign(name, value) => records the value of a variable, as the variable stores it.
+    def assign(self, name, value):
+        value = convert(value, self.types.get(name))
+        if value is None:
+            self.known.pop(name, None)
+        else:
+            self.known[name] = value
+        return value
+
+    # fold_chain(node) => the value of an expression (terms joined by + -) or of a term
+    # (factors joined by * / %), if it is known; folds as much of it as can be folded.
+    def fold_chain(self, node):
+        operands = []
+        operators = []
+        chain = node
+        while True:
+            operands.append(chain.children[0])
+            if len(chain.children) < 3:
+                break
+            operators.append(chain.children[1].operator)
+            chain = chain.children[2]
+
+        if node.type == EXPRESSION:
+            values = [self.fold_chain(operand) for operand in operands]
+        else:
+            values = [self.fold_factor(operand) for operand in operands]
+        if len(operands) == 1:
+            # The operand was folded in place.
+            return values[0]
+
+        value = evaluate_chain(values, operators)
+        if value is not None:
+            node.children = (self.make_operand(node.type, value),)
+            self.folded += 1
+            return value
+
+        # Otherwise, fold the operands known from the left: "2 * 3 * x" is "6 * x".
+        known_operands = 0
+        while known_operands < len(values) and values[known_operands] is not None:
+            known_operands += 1
+        if known_operands >= 2:
+            value = evaluate_chain(
+                values[:known_operands], operators[: known_operands - 1]
+            )
+            if value is not None:
+                operands = [self.make_operand(node.type, value)] + operands[known_operands:]
+                operators = operators[known_operands - 1 :]
+                node.children = self.make_chain(node.type, operands, operators)
+                self.folded += 1
+
+        return None
+
+    # fold_factor(node) => the value of a factor, if it is known.
+    def fold_factor(self, node):
+        children = node.children
+        negative = not is_node(children[0])
+        if negative:
+            # The MINUS token is kept as a string.
+            children = children[1:]
+
+        operand = children[0]
+        if len(children) > 1:
+            # An array element: only its index can be folded.
+            self.fold(children[1])
+            return None
+
+        if operand.type == CONSTANT:
+            value = parse_constant(operand.value, operand.dtype)
+            return evaluate("-", 0, value) if negative else value
+        if operand.type == EXPRESSION:
+            value = self.fold_chain(operand)
+        elif operand.type == IDENTIFIER:
+            value = self.known.get(operand.name)
+        else:
+            self.fold(operand)
+            return None
+
+        if negative:
+            value = evaluate("-", 0, value)
+        if value is not None:
+            node.children = self.make_factor(value).children
+            self.folded += 1
+        return value
+
+    # make_factor(value) => a "factor" node holding a constant.
+    @staticmethod
+    def make_factor(value):
+        negative = value < 0
+        constant_value, constant_dtype = format_constant(abs(value))
+        constant_node = ConstantNode(value=constant_value, dtype=constant_dtype)
+        if negative:
+            return Node(FACTOR, children=["-", constant_node])
+        return Node(FACTOR, children=constant_node)
+
+    # make_operand(chain_type, value) => an operand (term or factor) of a chain, holding a constant.
+    @classmethod
+    def make_operand(cls, chain_type, value):
+        if chain_type == EXPRESSION:
+            return Node(TERM, children=cls.make_factor(value))
+        return cls.make_factor(value)
+
+    # make_chain(chain_type, operands, operators) => the children of a chain node (right recursive,
+    # as parsed) joining the operands with the operators.
+    @staticmethod
+    def make_chain(chain_type, operands, operators):
+        chain = Node(chain_type, children=operands[-1])
+        for operand, operator in reversed(list(zip(operands, operators))):
+            chain = Node(
+                chain_type, children=[operand, OperatorNode(operator=operator), chain]
+            )
+        return chain.children
+
+
+def get_folded_value(node: Node):
+    # The value of an expression that is a single (maybe negative) constant, as constant folding
+    # leaves it; None otherwise.
+    while node.type == EXPRESSION or node.type == TERM:
+        if len(node.children) != 1:
+            return None
+        node = node.children[0]
+
+    children = node.children
+    negative = not is_node(children[0])
+    constant = children[-1]
+    if len(children) != 1 + negative or constant.type != CONSTANT:
+        return None
+
+    value = parse_constant(constant.value, constant.dtype)
+    return evaluate("-", 0, value) if negative else value
+
+
+def get_defined_variables(node: Node):
+    # The (name, array size) of each variable defined by a "variable_definition" or an
+    # "array_variable_definition"; the size is None if it is not an array, 0 if it is not known.
+    variables = []
+    for child in node.children:
+        if child.type == IDENTIFIER:
+            # An "array_variable_definition"; its size expression is the child after it, if any.
+            if len(node.children) > 2:
+                variables.append((child.name, get_array_size(node.children[2])))
+            else:
+                variables.append((child.name, 0))
+        elif child.type == IDENTIFIERS:
+            variables.extend(get_defined_identifiers(child))
+
+    return variables
+
+
+def get_defined_identifiers(node: Node):
+    # An "identifiers" node holds an IDENTIFIER (and the size expression of an array),
+    # followed by the "identifiers" node of the next identifiers, if there are more.
+    # Returns the (name, array size) of each identifier; the size is None if it is not an array.
+    identifiers = []
+    while node is not None:
+        next_node = None
+        name = None
+        array_size = None
+        for child in node.children:
+            if child.type == IDENTIFIER:
+                name = child.name
+            elif child.type == IDENTIFIERS:
+                next_node = child
+            elif child.type != EMPTY:
+                array_size = get_array_size(child)
+        if name is not None:
+            identifiers.append((name, array_size))
+        node = next_node
+
+    return identifiers
+
+
+def get_parameters(node: Node):
+    # The (name, data type, array size) of each parameter of a "function" or "procedure" node, in
+    # order; the size is None if it is not an array, 0 for an array parameter ("double a[]").
+    # The "arguments" node holds a definition and the "arguments" node of the next ones (or only
+    # that one, after a comma); a procedure without parameters has no "arguments" node.
+    parameters = []
+    node = node.children[0] if len(node.children) > 1 else None
+    while node is not None and node.type == ARGUMENTS:
+        next_node = None
+        for child in node.children:
+            if child.type == ARGUMENTS:
+                next_node = child
+            elif child.type == VARIABLE_DEFINITION or child.type == ARRAY_VARIABLE_DEFINITION:
+                dtype = child.children[0].dtype
+                for name, array_size in get_defined_variables(child):
+                    parameters.append((name, dtype, array_size))
+        node = next_node
+
+    return parameters
+
+
+def get_array_size(node: Node):
+    # The number of elements of an array, if its size expression is a single integer constant;
+    # 0 if the size is only known at run time.
+    expression_list = get_expression_value(node, expression_list=[])
+    if len(expression_list) == 1:
+        constant = expression_list[0]
+        if constant.type == CONSTANT and constant.dtype == "ICONSTANT":
+            return int(constant.value)
+
+    return 0
+
+
+# is_node(obj) => whether a child is a node (a Node, or a FlatNode of flat_ast.py), not a token kept
+# as a string (like the MINUS of a negative constant).
 def is_node(obj):
-    return isinstance(obj, Node)
+    return hasattr(obj, "children")
 
 
-class ProgramNodeMeta:
-    def __init__(self, name):
+class ProgramNode(Node):
+    __slots__ = ("name",)
+
+    def __init__(self, name, children=None):
+        super().__init__(PROGRAM, children)
         self.name = name
 
-    def __repr__(self):
+    def meta_repr(self):
         return "<ProgramNodeMeta: NAME({})>".format(self.name)
 
 
-class FunctionNodeMeta:
-    def __init__(self, name, return_type, *args):
+class FunctionNode(Node):
+    __slots__ = ("name", "return_type", "args")
+
+    def __init__(self, name, return_type, *args, children=None):
+        super().__init__(FUNCTION, children)
         self.name = name
         self.return_type = return_type
         self.args = args
 
-    def __repr__(self):
+    def meta_repr(self):
         return "<FunctionNodeMeta: NAME({}) RETURN-TYPE({})>".format(
             self.name, self.return_type
         )
 
 
-class ProcedureNodeMeta:
-    def __init__(self, name, *args):
+class ProcedureNode(Node):
+    __slots__ = ("name", "args")
+
+    def __init__(self, name, *args, children=None):
+        super().__init__(PROCEDURE, children)
         self.name = name
         self.args = args
 
-    def __repr__(self):
+    def meta_repr(self):
         return "<ProcedureNodeMeta: NAME({}) ARG-TYPES{}>".format(self.name, self.args)
 
 
-class ProcedureCallNodeMeta:
-    def __init__(self, name):
+class ProcedureCallNode(Node):
+    __slots__ = ("name",)
+
+    def __init__(self, name, children=None):
+        super().__init__(PROCEDURE_CALL, children)
         self.name = name
 
-    def __repr__(self):
+    def meta_repr(self):
         return "<ProcedureCallNodeMeta: NAME({})>".format(self.name)
 
 
-class ConstantNodeMeta:
-    def __init__(self, value, dtype) -> None:
+class ConstantNode(Node):
+    __slots__ = ("value", "dtype")
+
+    def __init__(self, value, dtype, children=None):
+        super().__init__(CONSTANT, children)
         self.value = value
         self.dtype = dtype
 
-    def __repr__(self) -> str:
+    def meta_repr(self) -> str:
         return "<ConstantNodeMeta: DTYPE({}) VALUE({})>".format(
             self.dtype,
             self.value,
         )
 
 
-class IdentifierNodeMeta:
-    def __init__(self, name):
+class IdentifierNode(Node):
+    __slots__ = ("name",)
+
+    def __init__(self, name, children=None):
+        super().__init__(IDENTIFIER, children)
         self.name = name
 
-    def __repr__(self) -> str:
+    def meta_repr(self) -> str:
         return "<IdentifierNodeMeta: NAME({})>".format(self.name)
 
 
-class OperatorNodeMeta:
-    def __init__(self, operator):
+class OperatorNode(Node):
+    __slots__ = ("operator",)
+
+    def __init__(self, operator, children=None):
+        super().__init__(OPERATOR, children)
         self.operator = operator
 
-    def __repr__(self):
+    def meta_repr(self):
         return "<OperatorNodeMeta: VALUE({})>".format(self.operator)
 
 
-class ComparisonNodeMeta:
-    def __init__(self, comparison):
+class ComparisonNode(Node):
+    __slots__ = ("comparison",)
+
+    def __init__(self, comparison, children=None):
+        super().__init__(COMPARISON, children)
         self.comparison = comparison
 
-    def __repr__(self):
+    def meta_repr(self):
         return "<ComparisonNodeMeta: VALUE({})>".format(self.comparison)
 
 
-class DataTypeNodeMeta:
-    def __init__(self, dtype):
+# A statement, with the line it is on (of its ";", or of the keyword of an if, do or while).
+class StatementNode(Node):
+    __slots__ = ("lineno",)
+
+    def __init__(self, lineno, children=None):
+        super().__init__(STATEMENT, children)
+        self.lineno = lineno
+
+
+class DataTypeNode(Node):
+    __slots__ = ("dtype",)
+
+    def __init__(self, dtype, children=None):
+        super().__init__(DTYPE, children)
         self.dtype = dtype
 
-    def __repr__(self):
+    def meta_repr(self):
         return "<DataTypeNodeMeta: VALUE({})>".format(self.dtype)
 
 
-def reduced_print(p):
-    matched_grammar = [(i.type, i.value) for i in p.slice[1:]]
-    print(
-        "\nReduced: {}: {}".format(
-            p.slice[0], " ".join([i[0] for i in matched_grammar])
-        )
-    )
-    for i in matched_grammar:
-        print("**** {} {}".format(i[0], i[1]))
+# The typed nodes, by node type.
+NODE_CLASSES = {
+    PROGRAM: ProgramNode,
+    FUNCTION: FunctionNode,
+    PROCEDURE: ProcedureNode,
+    PROCEDURE_CALL: ProcedureCallNode,
+    CONSTANT: ConstantNode,
+    IDENTIFIER: IdentifierNode,
+    OPERATOR: OperatorNode,
+    COMPARISON: ComparisonNode,
+    DTYPE: DataTypeNode,
+    STATEMENT: StatementNode,
+}
 
 
 def p_program(p):
     """
     program : K_PROGRAM IDENTIFIER LCURLY program_body RCURLY
     """
-    reduced_print(p)
-    meta = ProgramNodeMeta(p[2])
-    p[0] = Node(PROGRAM, meta=meta, children=[c for c in p[4]])
+    p[0] = ProgramNode(p[2], children=[c for c in p[4]])
 
 
 def p_program_body(p):
@@ -611,7 +862,6 @@ def p_program_body(p):
                  | procedure program_body
                  | empty
     """
-    reduced_print(p)
     if p[1].type == EMPTY:
         p[0] = p[1]
     else:
@@ -627,38 +877,28 @@ def p_function(p):
              | K_FUNCTION K_DOUBLE IDENTIFIER LPAREN arguments RPAREN LCURLY scope_body RCURLY
              | K_FUNCTION K_STRING IDENTIFIER LPAREN arguments RPAREN LCURLY scope_body RCURLY
     """
-    reduced_print(p)
-
-    meta = FunctionNodeMeta(name=p[3], return_type=p[2])
-    p[0] = Node(FUNCTION, meta=meta, children=[p[5], p[8]])
+    p[0] = FunctionNode(name=p[3], return_type=p[2], children=[p[5], p[8]])
 
 
 def p_procedure(p):
     """
     procedure : K_PROCEDURE IDENTIFIER LPAREN RPAREN LCURLY scope_body RCURLY
     """
-    reduced_print(p)
-
-    procedure_meta = ProcedureNodeMeta(name=p[2])
-    p[0] = Node(PROCEDURE, meta=procedure_meta, children=p[6])
+    p[0] = ProcedureNode(name=p[2], children=p[6])
 
 
 def p_procedure_with_args(p):
     """
     procedure : K_PROCEDURE IDENTIFIER LPAREN arguments RPAREN LCURLY scope_body RCURLY
     """
-    reduced_print(p)
-
-    procedure_meta = ProcedureNodeMeta(p[2], p[4])
 
-    p[0] = Node(PROCEDURE, meta=procedure_meta, children=[p[4], p[7]])
+    p[0] = ProcedureNode(p[2], p[4], children=[p[4], p[7]])
 
 
 def p_arguments(p):
     """
     arguments : variable_definition arguments
     """
-    reduced_print(p)
     p[0] = Node(ARGUMENTS, children=[p[1], p[2]])
 
 
@@ -666,7 +906,6 @@ def p_arguments_with_comma(p):
     """
     arguments : COMMA arguments
     """
-    reduced_print(p)
     p[0] = Node(ARGUMENTS, children=[p[2]])
 
 
@@ -684,14 +923,14 @@ def p_scope_body(p):
                | procedure scope_body
                | empty
     """
-    reduced_print(p)
     if p[1].type == EMPTY:
         p[0] = p[1]
     else:
         siblings = []
-        # TODO : check this for proper output.
-        if isinstance(p[2], list):
-            siblings = [s for s in p[2] if s.type != EMPTY]
+        # The rest of the scope body is reduced first, into its own "scope_body" node;
+        # keep its statements as siblings of this one.
+        if isinstance(p[2], Node) and p[2].type == SCOPE_BODY:
+            siblings = p[2].children
         p[0] = (
             Node(SCOPE_BODY, children=[p[1], *siblings])
             if siblings
@@ -709,8 +948,7 @@ def p_statement(p):
               | procedure_call SEMI
               | variable_decrement_increment SEMI
     """
-    reduced_print(p)
-    p[0] = Node(STATEMENT, children=p[1])
+    p[0] = StatementNode(p.lineno(2), children=p[1])
 
 
 def p_statement_looping(p):
@@ -719,24 +957,24 @@ def p_statement_looping(p):
               | do_statement
               | while_statement
     """
-    reduced_print(p)
-    p[0] = Node(STATEMENT, children=p[1])
+    # The line of its keyword, set on the if, do and while symbols by their rules.
+    p[0] = StatementNode(p.lineno(1), children=p[1])
 
 
 def p_while_statement_with_braces(p):
     """
     while_statement : K_WHILE LPAREN boolean_logic RPAREN LCURLY scope_body RCURLY
     """
-    reduced_print(p)
     p[0] = Node(WHILE, children=[p[3], p[6]])
+    p.set_lineno(0, p.lineno(1))
 
 
 def p_while_statement_without_braces(p):
     """
     while_statement : K_WHILE LPAREN boolean_logic RPAREN statement
     """
-    reduced_print(p)
     p[0] = Node(WHILE, children=[p[3], p[5]])
+    p.set_lineno(0, p.lineno(1))
 
 
 def p_do_statement(p):
@@ -746,8 +984,8 @@ def p_do_statement(p):
                  | K_DO LPAREN variable_assignment SEMI boolean_logic SEMI variable_decrement_increment RPAREN LCURLY scope_body RCURLY
                  | K_DO LPAREN variable_definition SEMI boolean_logic SEMI variable_decrement_increment RPAREN LCURLY scope_body RCURLY
     """
-    reduced_print(p)
     p[0] = Node(DO, children=[p[3], p[5], p[7], p[10]])
+    p.set_lineno(0, p.lineno(1))
 
 
 def p_do_statement_without_braces(p):
@@ -757,47 +995,46 @@ def p_do_statement_without_braces(p):
                  | K_DO LPAREN variable_assignment SEMI boolean_logic SEMI variable_decrement_increment RPAREN statement
                  | K_DO LPAREN variable_definition SEMI boolean_logic SEMI variable_decrement_increment RPAREN statement
     """
-    reduced_print(p)
     p[0] = Node(DO, children=[p[3], p[5], p[7], p[9]])
+    p.set_lineno(0, p.lineno(1))
 
 
 def p_if_statement_only(p):
     """
     if_statement : if
     """
-    reduced_print(p)
     p[0] = Node(IF, children=p[1])
+    p.set_lineno(0, p.lineno(1))
 
 
 def p_if_statement(p):
     """
     if_statement : if K_ELSE after_else
     """
-    reduced_print(p)
     p[0] = Node(IF, children=[p[1], p[3]])
+    p.set_lineno(0, p.lineno(1))
 
 
 def p_if_without_braces(p):
     """
     if : K_IF LPAREN boolean_logic RPAREN K_THEN statement
     """
-    reduced_print(p)
     p[0] = Node(IF, children=[p[3], p[6]])
+    p.set_lineno(0, p.lineno(1))
 
 
 def p_if_with_braces(p):
     """
     if : K_IF LPAREN boolean_logic RPAREN K_THEN LCURLY scope_body RCURLY
     """
-    reduced_print(p)
     p[0] = Node(IF, children=[p[3], p[7]])
+    p.set_lineno(0, p.lineno(1))
 
 
 def p_if_empty(p):
     """
     if : empty
     """
-    reduced_print(p)
     p[0] = p[1]
 
 
@@ -806,7 +1043,6 @@ def p_after_else_1_without_braces(p):
     after_else : statement
     """
     # This "after else" parses the case where only an 'else' comes after.
-    reduced_print(p)
     p[0] = Node(AFTER_ELSE_ELSE, children=[p[1]])
 
 
@@ -815,7 +1051,6 @@ def p_after_else_1_with_braces(p):
     after_else : LCURLY scope_body RCURLY
     """
     # This "after else" parses the case where only an 'else' comes after.
-    reduced_print(p)
     p[0] = Node(AFTER_ELSE_ELSE, children=[p[2]])
 
 
@@ -824,7 +1059,6 @@ def p_after_else_2(p):
     after_else : if K_ELSE after_else
     """
     # This "after else" parses the case where one or more 'else if' come after.
-    reduced_print(p)
     p[0] = Node(AFTER_ELSE_ELSE_IF, children=[p[1], p[3]])
 
 
@@ -832,7 +1066,6 @@ def p_built_in_function_call(p):
     """
     function_call : built_in_functions LPAREN function_call_args RPAREN
     """
-    reduced_print(p)
     p[0] = Node(FUNCTION_CALL, children=[p[1], p[3]])
 
 
@@ -840,10 +1073,7 @@ def p_created_function_call(p):
     """
     function_call : IDENTIFIER LPAREN function_call_args RPAREN
     """
-    reduced_print(p)
-
-    id_meta = IdentifierNodeMeta(name=p[1])
-    id_node = Node(IDENTIFIER, meta=id_meta)
+    id_node = IdentifierNode(name=p[1])
 
     p[0] = Node(FUNCTION_CALL, children=[id_node, p[3]])
 
@@ -852,10 +1082,7 @@ def p_function_return_identifier(p):
     """
     function_return : K_RETURN IDENTIFIER
     """
-    reduced_print(p)
-
-    id_meta = IdentifierNodeMeta(name=p[2])
-    id_node = Node(IDENTIFIER, meta=id_meta)
+    id_node = IdentifierNode(name=p[2])
 
     p[0] = Node(FUNCTION_RETURN, children=[id_node])
 
@@ -866,10 +1093,7 @@ def p_function_return_constant(p):
                     | K_RETURN DCONSTANT
                     | K_RETURN SCONSTANT
     """
-    reduced_print(p)
-
-    constant_meta = ConstantNodeMeta(value=p[2], dtype=p.slice[2].type)
-    constant_node = Node(CONSTANT, meta=constant_meta)
+    constant_node = ConstantNode(value=p[2], dtype=p.slice[2].type)
 
     p[0] = Node(FUNCTION_RETURN, children=[constant_node])
 
@@ -879,8 +1103,6 @@ def p_function_return_other(p):
     function_return : K_RETURN function_call
                     | K_RETURN variable_assignment
     """
-    reduced_print(p)
-
     p[0] = Node(FUNCTION_RETURN, children=[p[2]])
 
 
@@ -888,9 +1110,7 @@ def p_procedure_call(p):
     """
     procedure_call : IDENTIFIER LPAREN procedure_call_args RPAREN
     """
-    reduced_print(p)
-    procedure_call_meta = ProcedureCallNodeMeta(name=p[1])
-    p[0] = Node(PROCEDURE_CALL, meta=procedure_call_meta, children=p[3])
+    p[0] = ProcedureCallNode(name=p[1], children=p[3])
 
 
 def p_built_in_functions(p):
@@ -902,7 +1122,6 @@ def p_built_in_functions(p):
                        | K_READ_DOUBLE
                        | K_READ_STRING
     """
-    reduced_print(p)
     p[0] = Node(p[1])
 
 
@@ -911,8 +1130,6 @@ def p_procedure_call_args(p):
     procedure_call_args : identifiers
                         | term
     """
-    reduced_print(p)
-
     p[0] = Node(PROCEDURE_CALL_ARGS, children=[p[1]])
 
 
@@ -922,7 +1139,6 @@ def p_function_call_args(p):
                        | term function_call_args
                        | empty
     """
-    reduced_print(p)
     if p[1].type == EMPTY:
         p[0] = p[1]
     else:
@@ -934,10 +1150,7 @@ def p_variable_decrement_increment(p):
     variable_decrement_increment : IDENTIFIER INCREMENT
                                  | IDENTIFIER DECREMENT
     """
-    reduced_print(p)
-
-    id_meta = IdentifierNodeMeta(name=p[1])
-    id_node = Node(IDENTIFIER, meta=id_meta)
+    id_node = IdentifierNode(name=p[1])
 
     inc_dec_node = Node(p[2])
 
@@ -955,12 +1168,9 @@ def p_variable_assignment(p):
                         | IDENTIFIER ASSIGN_MINUS expression
                         | IDENTIFIER ASSIGN_MOD expression
     """
-    reduced_print(p)
-
-    id_meta = IdentifierNodeMeta(name=p[1])
     p[0] = Node(
         VARIABLE_ASSIGNMENT,
-        children=[Node(IDENTIFIER, meta=id_meta), Node(p[2]), p[3]],
+        children=[IdentifierNode(name=p[1]), Node(p[2]), p[3]],
     )
 
 
@@ -982,11 +1192,8 @@ def p_variable_assignment_array(p):
                         | IDENTIFIER LBRACKET variable_decrement_increment RBRACKET ASSIGN_MINUS expression
                         | IDENTIFIER LBRACKET variable_decrement_increment RBRACKET ASSIGN_MOD expression
     """
-    reduced_print(p)
-
-    id_meta = IdentifierNodeMeta(name=p[1])
     # TODO : take care of array element location expression
-    id_node = Node(IDENTIFIER, meta=id_meta)
+    id_node = IdentifierNode(name=p[1])
 
     p[0] = Node(VARIABLE_ASSIGNMENT, children=[id_node, p[3], p[5], p[6]])
 
@@ -995,8 +1202,6 @@ def p_variable_declaration(p):
     """
     variable_declaration : variable_definition ASSIGN expression identifiers
     """
-    reduced_print(p)
-
     p[0] = Node(
         VARIABLE_DECLARATION,
         children=[p[1], Node(ASSIGN), p[3], p[4]],
@@ -1009,10 +1214,7 @@ def p_variable_definition(p):
                         | K_DOUBLE identifiers
                         | K_STRING identifiers
     """
-    reduced_print(p)
-
-    dtype_meta = DataTypeNodeMeta(dtype=p[1])
-    dtype_node = Node(DTYPE, meta=dtype_meta)
+    dtype_node = DataTypeNode(dtype=p[1])
 
     p[0] = Node(
         VARIABLE_DEFINITION,
@@ -1024,9 +1226,7 @@ def p_identifiers(p):
     """
     identifiers : IDENTIFIER identifiers
     """
-    reduced_print(p)
-    id_meta = IdentifierNodeMeta(name=p[1])
-    id_node = Node(IDENTIFIER, meta=id_meta)
+    id_node = IdentifierNode(name=p[1])
     p[0] = Node(IDENTIFIERS, children=[id_node, p[2]])
 
 
@@ -1035,9 +1235,7 @@ def p_identifiers_array(p):
     identifiers : IDENTIFIER LBRACKET expression RBRACKET identifiers
                 | IDENTIFIER LBRACKET variable_decrement_increment RBRACKET identifiers
     """
-    reduced_print(p)
-    id_meta = IdentifierNodeMeta(name=p[1])
-    id_node = Node(IDENTIFIER, meta=id_meta)
+    id_node = IdentifierNode(name=p[1])
     p[0] = Node(IDENTIFIERS, children=[id_node, p[3], p[5]])
 
 
@@ -1045,7 +1243,6 @@ def p_identifiers_comma(p):
     """
     identifiers : COMMA identifiers
     """
-    reduced_print(p)
     p[0] = Node(IDENTIFIERS, children=p[2])
 
 
@@ -1053,7 +1250,6 @@ def p_identifiers_empty(p):
     """
     identifiers : empty
     """
-    reduced_print(p)
     p[0] = p[1]
 
 
@@ -1063,12 +1259,9 @@ def p_variable_definition_array(p):
                         | K_DOUBLE IDENTIFIER LBRACKET RBRACKET
                         | K_STRING IDENTIFIER LBRACKET RBRACKET
     """
-    reduced_print(p)
-    dtype_meta = DataTypeNodeMeta(dtype=p[1])
-    dtype_node = Node(DTYPE, meta=dtype_meta)
+    dtype_node = DataTypeNode(dtype=p[1])
 
-    id_meta = IdentifierNodeMeta(name=p[2])
-    id_node = Node(IDENTIFIER, meta=id_meta)
+    id_node = IdentifierNode(name=p[2])
 
     p[0] = Node(ARRAY_VARIABLE_DEFINITION, children=[dtype_node, id_node])
 
@@ -1082,12 +1275,9 @@ def p_variable_definition_array_other(p):
                         | K_DOUBLE IDENTIFIER LBRACKET variable_decrement_increment RBRACKET
                         | K_STRING IDENTIFIER LBRACKET variable_decrement_increment RBRACKET
     """
-    reduced_print(p)
-    dtype_meta = DataTypeNodeMeta(dtype=p[1])
-    dtype_node = Node(DTYPE, meta=dtype_meta)
+    dtype_node = DataTypeNode(dtype=p[1])
 
-    id_meta = IdentifierNodeMeta(name=p[2])
-    id_node = Node(IDENTIFIER, meta=id_meta)
+    id_node = IdentifierNode(name=p[2])
 
     p[0] = Node(ARRAY_VARIABLE_DEFINITION, children=[dtype_node, id_node, p[4]])
 
@@ -1097,14 +1287,12 @@ def p_boolean_logic_1(p):
     boolean_logic : arithmetic_logic DAND arithmetic_logic
                   | arithmetic_logic DOR arithmetic_logic
     """
-    reduced_print(p)
-    comparison_meta = ComparisonNodeMeta(comparison=p[2])
 
     p[0] = Node(
         BOOLEAN_LOGIC,
         children=[
             p[1],
-            Node(COMPARISON, meta=comparison_meta),
+            ComparisonNode(comparison=p[2]),
             p[3],
         ],
     )
@@ -1114,14 +1302,11 @@ def p_boolean_logic_2(p):
     """
     boolean_logic : NOT arithmetic_logic
     """
-    reduced_print(p)
-
-    comparison_meta = ComparisonNodeMeta(comparison=p[1])
 
     p[0] = Node(
         BOOLEAN_LOGIC,
         children=[
-            Node(COMPARISON, meta=comparison_meta),
+            ComparisonNode(comparison=p[1]),
             p[2],
         ],
     )
@@ -1131,8 +1316,6 @@ def p_boolean_logic_3(p):
     """
     boolean_logic : arithmetic_logic
     """
-    reduced_print(p)
-
     p[0] = Node(BOOLEAN_LOGIC, children=[p[1]])
 
 
@@ -1151,15 +1334,12 @@ def p_arithmetic_logic_function_call(p):
                      | function_call LT expression
                      | function_call NE expression
     """
-    reduced_print(p)
-
-    comparison_meta = ComparisonNodeMeta(comparison=p[2])
 
     p[0] = Node(
         ARITHMETIC_LOGIC,
         children=[
             p[1],
-            Node(COMPARISON, meta=comparison_meta),
+            ComparisonNode(comparison=p[2]),
             p[3],
         ],
     )
@@ -1180,15 +1360,12 @@ def p_arithmetic_logic_expression(p):
                      | expression LT function_call
                      | expression NE function_call
     """
-    reduced_print(p)
-
-    comparison_meta = ComparisonNodeMeta(comparison=p[2])
 
     p[0] = Node(
         ARITHMETIC_LOGIC,
         children=[
             p[1],
-            Node(COMPARISON, meta=comparison_meta),
+            ComparisonNode(comparison=p[2]),
             p[3],
         ],
     )
@@ -1199,13 +1376,11 @@ def p_expression_term_plus_minus_expression(p):
     expression : term PLUS expression
                | term MINUS expression
     """
-    reduced_print(p)
-    operator_meta = OperatorNodeMeta(operator=p[2])
     p[0] = Node(
         EXPRESSION,
         children=[
             p[1],
-            Node(OPERATOR, meta=operator_meta),
+            OperatorNode(operator=p[2]),
             p[3],
         ],
     )
@@ -1215,7 +1390,6 @@ def p_expression_term(p):
     """
     expression : term
     """
-    reduced_print(p)
     p[0] = Node(EXPRESSION, children=p[1])
 
 
@@ -1225,16 +1399,13 @@ def p_term_factor_divide_multiply_term(p):
          | factor MULTIPLY term
          | factor MOD term
     """
-    reduced_print(p)
-    operator_meta = OperatorNodeMeta(operator=p[2])
-    p[0] = Node(TERM, children=[p[1], Node(OPERATOR, meta=operator_meta), p[3]])
+    p[0] = Node(TERM, children=[p[1], OperatorNode(operator=p[2]), p[3]])
 
 
 def p_term_factor(p):
     """
     term : factor
     """
-    reduced_print(p)
     p[0] = Node(TERM, children=p[1])
 
 
@@ -1242,8 +1413,6 @@ def p_factor_paren_expression(p):
     """
     factor : LPAREN expression RPAREN
     """
-    reduced_print(p)
-
     p[0] = Node(FACTOR, children=p[2])
 
 
@@ -1253,10 +1422,7 @@ def p_factor_constant(p):
            | DCONSTANT
            | SCONSTANT
     """
-    reduced_print(p)
-
-    constant_meta = ConstantNodeMeta(value=p[1], dtype=p.slice[1].type)
-    constant_node = Node(CONSTANT, meta=constant_meta)
+    constant_node = ConstantNode(value=p[1], dtype=p.slice[1].type)
 
     p[0] = Node(FACTOR, children=constant_node)
 
@@ -1266,9 +1432,7 @@ def p_factor_negative_constant(p):
     factor : MINUS ICONSTANT
            | MINUS DCONSTANT
     """
-    reduced_print(p)
-    constant_meta = ConstantNodeMeta(value=p[2], dtype=p.slice[2].type)
-    constant_node = Node(CONSTANT, meta=constant_meta)
+    constant_node = ConstantNode(value=p[2], dtype=p.slice[2].type)
 
     p[0] = Node(FACTOR, children=[p[1], constant_node])
 
@@ -1277,10 +1441,7 @@ def p_factor_identifier(p):
     """
     factor : IDENTIFIER
     """
-    reduced_print(p)
-
-    id_meta = IdentifierNodeMeta(name=p[1])
-    id_node = Node(IDENTIFIER, meta=id_meta)
+    id_node = IdentifierNode(name=p[1])
 
     p[0] = Node(FACTOR, children=id_node)
 
@@ -1289,10 +1450,7 @@ def p_factor_negative_identifier(p):
     """
     factor : MINUS IDENTIFIER
     """
-    reduced_print(p)
-
-    id_meta = IdentifierNodeMeta(name=p[2])
-    id_node = Node(IDENTIFIER, meta=id_meta)
+    id_node = IdentifierNode(name=p[2])
 
     p[0] = Node(FACTOR, children=[p[1], id_node])
 
@@ -1302,10 +1460,7 @@ def p_factor_array_identifier(p):
     factor : IDENTIFIER LBRACKET expression RBRACKET
            | IDENTIFIER LBRACKET variable_decrement_increment RBRACKET
     """
-    reduced_print(p)
-
-    id_meta = IdentifierNodeMeta(name=p[1])
-    id_node = Node(IDENTIFIER, meta=id_meta)
+    id_node = IdentifierNode(name=p[1])
 
     p[0] = Node(FACTOR, children=[id_node, p[3]])
 
@@ -1315,10 +1470,7 @@ def p_factor_array_negative_identifier(p):
     factor : MINUS IDENTIFIER LBRACKET expression RBRACKET
            | MINUS IDENTIFIER LBRACKET variable_decrement_increment RBRACKET
     """
-    reduced_print(p)
-
-    id_meta = IdentifierNodeMeta(name=p[2])
-    id_node = Node(IDENTIFIER, meta=id_meta)
+    id_node = IdentifierNode(name=p[2])
 
     p[0] = Node(FACTOR, children=[p[1], id_node, p[4]])
 
@@ -1327,19 +1479,133 @@ def p_empty(p):
     """
     empty :
     """
-    reduced_print(p)
     p[0] = Node(EMPTY)
 
 
-# Build the parser
-parser = yacc.yacc()
-
-data = open(sys.argv[1], "r").read()
-node = parser.parse(data)
-Node.print_tree(node)
-# Node.generate_symbol_tables(node)
-# Node.walk_tree_generate_code(node)
-
+# Build the parser, from the cached tables when the grammar has not changed.
+# Pass "--debug" after the file name to rebuild the tables and write parser.out.
+parser = build_parser(
+    sys.modules[__name__],
+    debug=__name__ == "__main__" and "--debug" in sys.argv[2:],
+)
+
+if __name__ == "__main__":
+    # Pass "--import-profile" after the file name to print to stderr what importing the compiler
+    # costs a cold start, per module (see import_profile.py).
+    if "--import-profile" in sys.argv[2:]:
+        from import_profile import profile_imports, report
+
+        print(report(profile_imports("simple_ast")), file=sys.stderr)
+
+    # Pass "--trace" after the file name to write every reduction, as JSON lines, to stderr.
+    if "--trace" in sys.argv[2:]:
+        enable_tracing(parser, JsonLinesSink(sys.stderr))
+
+    # Pass "--profile" after the file name to print to stderr the wall time, peak memory and size
+    # of every phase of the compilation; "--profile-stats <file>" or "--profile-stacks <file>" to
+    # also dump its calls, as cProfile statistics or collapsed stacks (see phase_profile.py).
+    from phase_profile import PhaseProfiler, ReplayLexer
+
+    profiler = PhaseProfiler.from_arguments(sys.argv[2:])
+    if profiler.enabled:
+        # The parser was built on import: built again, to be measured (the lexer is built the
+        # first time it is used).
+        with profiler.phase("tables", "parser states") as phase:
+            from simple_lex import get_lexer
+
+            get_lexer()
+            phase.count = len(build_parser(sys.modules[__name__]).action)
+
+    # The source is lexed while it is read, from an mmap of the file (see stream_tokens()).
+    # Pass "--ast-cache" to load the tree from the AST cache when the file was parsed before, and
+    # to cache it otherwise (see ast_cache.py); a tree loaded from the cache is not traced.
+    source = map_source(sys.argv[1])
+    node = None
+    ast_cache = None
+    if "--ast-cache" in sys.argv[2:]:
+        # The cache builds its nodes from this module, not from a second import of it.
+        sys.modules.setdefault("simple_ast", sys.modules[__name__])
+        from ast_cache import ASTCache
+
+        ast_cache = ASTCache()
+        with profiler.phase("ast cache", "nodes") as phase:
+            node = ast_cache.get(source)
+        phase.count = node and sum(1 for _ in walk_tree(node))
+    if node is None:
+        lexer = StreamLexer(source)
+        if profiler.enabled:
+            # Lexed on its own, to be measured apart from the parse.
+            with profiler.phase("lex", "tokens") as phase:
+                tokens_lexed = list(lexer)
+            phase.count = len(tokens_lexed)
+            lexer = ReplayLexer(tokens_lexed)
+        with profiler.phase("parse", "nodes") as phase:
+            node = parser.parse(lexer=lexer)
+        phase.count = node and sum(1 for _ in walk_tree(node))
+        if ast_cache is not None and node is not None:
+            ast_cache.put(source, node)
+    with profiler.phase("print tree", "nodes") as phase:
+        Node.print_tree(node)
+    phase.count = node and sum(1 for _ in walk_tree(node))
+    # Node.generate_symbol_tables(node)
+    # Node.walk_tree_generate_code(node)
+
+    # Pass "--generate" after the file name to also build the symbol tables and generate yourmain.h;
+    # constant arithmetic is folded first, unless "--no-fold" is given.
+    # Pass "--memory-map" to generate yourmain.h and print where every variable and string constant
+    # was placed in memory; "--ir" to generate yourmain.h and print the IR of every function (see ir.py).
+    # Variables are kept in registers, unless "--no-registers" is given; "--registers" generates
+    # yourmain.h and prints what that saved in every function (see register_allocation.py).
+    # Their loops are optimized, unless "--no-loop-optimization" is given; "--loops" generates
+    # yourmain.h and prints what was done to the loops of every function (see loop_optimization.py).
+    if any(
+        flag in sys.argv[2:]
+        for flag in ("--generate", "--memory-map", "--ir", "--registers", "--loops")
+    ):
+        if node is None:
+            # The parser printed the syntax error; there is no tree to generate code from.
+            print("Error! {} does not parse: no code is generated.".format(sys.argv[1]))
+            profiler.finish()
+            sys.exit(1)
+        if "--no-fold" not in sys.argv[2:]:
+            with profiler.phase("fold constants", "nodes") as phase:
+                Node.fold_constants(node)
+            phase.count = sum(1 for _ in walk_tree(node))
+        try:
+            with profiler.phase("symbol tables", "symbols") as phase:
+                symbol_tables = Node.generate_symbol_tables(node)
+            phase.count = sum(table.size() for table in symbol_tables.values())
+            with profiler.phase("generate code", "lines of C") as phase:
+                emitter = CodeEmitter(
+                    promote_variables="--no-registers" not in sys.argv[2:],
+                    optimize_loops="--no-loop-optimization" not in sys.argv[2:],
+                )
+                layout = Node.walk_tree_generate_code(node, symbol_tables, emitter=emitter)
+                emitter.write("yourmain.h")
+            phase.count = emitter.render().count("\n")
+        except CompileError as error:
+            print(error)
+            profiler.finish()
+            sys.exit(1)
+        if "--memory-map" in sys.argv[2:]:
+            print()
+            print(layout.report())
+        if "--ir" in sys.argv[2:]:
+            print_banner("INTERMEDIATE REPRESENTATION")
+            for ir_function in emitter.ir_functions.values():
+                print(ir_function.listing())
+        if "--registers" in sys.argv[2:]:
+            from register_allocation import report
+
+            print()
+            print(report(emitter.allocation_reports.values()))
+        if "--loops" in sys.argv[2:]:
+            from loop_optimization import report
+
+            print()
+            print(report(emitter.loop_reports.values()))
+
+    profiler.finish()
 
 # print()
 # print()
@@ -1348,7 +1614,7 @@ Node.print_tree(node)
 # print("~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~")
 # print()
 #
-# for key in symbol_table_hash_map.keys():
-#     print(symbol_table_hash_map[key])
+# for key in symbol_tables.keys():
+#     print(symbol_tables[key])
 #
 # print()
@@ -2,9 +2,14 @@
 python simple_lex.py mg.f23
 """
 
-import sys
+# Importing this module only defines the tokens and their rules: the ply lexer is built the first
+# time it is needed (get_lexer(), or simple_lex.lexer), so a module that only needs the tokens
+# (the parser, table_lex.py) does not pay for it, nor for importing ply.lex.
 
-from ply.lex import lex
+import codecs
+import io
+import mmap
+import sys
 
 
 reserved = {
@@ -130,20 +135,152 @@ def t_error(t):
     t.lexer.skip(1)
 
 
-# Build the lexer
-lexer = lex()
+# The lexer, once built (see get_lexer()).
+_lexer = None
+
+
+# ----------------------------------------------------------------------------
+# Returns the lexer of the f23 tokens, building it on the first call;
+# it is also the lexer ply.yacc uses when parse() is given no lexer.
+# ----------------------------------------------------------------------------
+def get_lexer():
+    global _lexer
+    if _lexer is None:
+        from ply.lex import lex
+
+        _lexer = lex(module=sys.modules[__name__])
+
+    return _lexer
+
+
+# simple_lex.lexer => the lexer, built on first use.
+def __getattr__(name):
+    if name == "lexer":
+        return get_lexer()
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+# ---Streaming--- #
+# stream_tokens(source) lexes a source while it is being read, chunk by chunk, instead of reading
+# it all into one string first: source is a file (opened as text or binary), or an mmap of one
+# (see map_source()), and tokens are yielded as soon as the lines they are on have been read.
+#
+# Every chunk is lexed up to its last newline, with the same lexer for the whole source, so lineno
+# is counted as usual; the rest of the chunk is kept and lexed with the next one, so no token is
+# cut by the end of a chunk (an identifier, a "//" comment, a DCONSTANT like 2.5d-3 all end before
+# a newline). The only token a newline can be part of is a SCONSTANT: a '"' whose string is not
+# closed yet (lexed as a PERIOD) is kept too, with all that follows it, until its closing '"' has
+# been read.
+# lexpos is the position in the whole source, in characters, as if it had been read at once.
+
+# Size of the chunks a source is read in, in bytes (or characters, for a text file).
+CHUNK_SIZE = 1 << 20
+
+
+# ----------------------------------------------------------------------------
+# Returns an mmap of the file, to give to stream_tokens(): its pages are read by the system
+# as the lexer gets to them, and are not copied into memory all at once.
+# ----------------------------------------------------------------------------
+def map_source(file_name):
+    with open(file_name, "rb") as file:
+        try:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # An empty file can not be mapped.
+            return io.BytesIO()
+
+
+# read_chunks(source, chunk_size) => yields the text of a file or mmap, chunk_size at a time;
+# bytes are decoded as UTF-8 with universal newlines (like open(file_name, "r")), keeping the
+# bytes of a character (or the "\r" of a "\r\n") cut by a chunk for the next one.
+def read_chunks(source, chunk_size=CHUNK_SIZE):
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder("utf-8")(), translate=True
+    )
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        if not isinstance(chunk, str):
+            chunk = decoder.decode(chunk)
+        yield chunk
+
+    rest = decoder.decode(b"", final=True)
+    if rest:
+        yield rest
+
+
+# ----------------------------------------------------------------------------
+# Yields the tokens of a file, or an mmap of one, as they are read (see above);
+# they are the same tokens, with the same lineno and lexpos, as lexer.input() on the whole text.
+# ----------------------------------------------------------------------------
+def stream_tokens(source, chunk_size=CHUNK_SIZE):
+    chunk_lexer = get_lexer().clone()
+    chunk_lexer.lineno = 1
+
+    offset = 0
+    rest = ""
+    chunks = read_chunks(source, chunk_size)
+    while True:
+        chunk = next(chunks, None)
+        last = chunk is None
+        text = rest + (chunk or "")
+
+        # The part of the text that is lexed now: up to the last newline, or all of it at the end.
+        end = len(text) if last else text.rfind("\n") + 1
+        if end == 0 and not last:
+            rest = text
+            continue
+
+        chunk_lexer.input(text[:end])
+        for tok in iter(chunk_lexer.token, None):
+            if tok.value == '"' and not last:
+                # A string that is not closed in the text read so far (a lone '"' is a PERIOD).
+                end = tok.lexpos
+                break
+            tok.lexpos += offset
+            yield tok
+
+        offset += end
+        rest = text[end:]
+        if last:
+            break
+
+
+# ----------------------------------------------------------------------------
+# A lexer with the interface of a ply lexer, over stream_tokens(), for the parser:
+#   parser.parse(lexer=StreamLexer(map_source(file_name)))
+# ----------------------------------------------------------------------------
+class StreamLexer:
+    def __init__(self, source, chunk_size=CHUNK_SIZE):
+        self.tokens = stream_tokens(source, chunk_size)
+        self.lineno = 1
+        self.lexpos = 0
+
+    def token(self):
+        tok = next(self.tokens, None)
+        if tok is not None:
+            self.lineno = tok.lineno
+            self.lexpos = tok.lexpos + len(tok.value)
+        return tok
+
+    def __iter__(self):
+        return iter(self.token, None)
+
+# ----------------------------------------------------------------------------
+# Prints the tokens of the file given as parameter, as they are lexed:
+#   python simple_lex.py <filename>
+# ----------------------------------------------------------------------------
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("usage: python simple_lex.py <filename>", file=sys.stderr)
+        return 2
 
-# Test it out
-# data = open(sys.argv[1], "r").read()
-data = "a := 34"
+    for tok in stream_tokens(map_source(argv[0])):
+        print(tok)
+    return 0
 
-# Give the lexer some input
-lexer.input(data)
 
-# Tokenize
-while True:
-    tok = lexer.token()
-    if not tok:
-        break  # No more input
-    # print(tok)
-    # print(tok.type, tok.value, tok.lineno, tok.lexpos)
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,7 +3,7 @@ import sys
 import ply.yacc as yacc
 
 from node_types import *
-from simple_lex import tokens
+from simple_lex import get_lexer, tokens
 
 
 class Node:
@@ -240,5 +240,5 @@ def p_empty(p):
 parser = yacc.yacc()
 
 data = open(sys.argv[1], "r").read()
-node = parser.parse(data)
+node = parser.parse(data, lexer=get_lexer())
 Node.print_tree(node)
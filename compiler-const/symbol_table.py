@@ -1,6 +1,23 @@
 # ---Symbol Table--- #
 # A symbol table as a python dictionary, with its APIs.
 # A python dictionary is by default a hash table, with O(1) insertion & O(1) look-up.
+#
+# Symbols are also resolved through the chain of parent tables:
+#   Every table has a depth (the program table is at depth 0) and gives every symbol a slot index,
+#   when the symbol is first put in it. resolve(key) binds a key to the (depth, slot) of the closest
+#   table that defines it, and get_resolved((depth, slot)) gets its properties back with two
+#   list accesses. Resolutions are cached per table; the caches are invalidated whenever a symbol
+#   is added to or deleted from any table of the program (but not when the properties of a symbol
+#   change).
+#
+# Constants are interned in the ConstantPool of the program table, which all its child tables share;
+# the "CONSTANTS" entry of a table maps the (data type, value) of the constants used in its scope
+# to their (shared) pool entries.
+#
+# Everything shared by the tables of a program (the constant pool, the symbol_tables of the program
+# by scope name, the generation of the caches) belongs to its program table: two programs never
+# share any state, so they can be compiled at the same time.
+from constant_pool import ConstantPool
 from symbol_table_properties import VALUE
 
 
@@ -8,6 +25,10 @@ class SymbolTable:
     parent_table = None
     scope = None
     scope_name = None
+    # The return type of a function (None for a procedure, or the program), and the activation
+    # record of a function or procedure, once the memory layout made it (see memory_layout.py).
+    return_type = None
+    frame = None
 
     def __init__(self, scope=None, scope_name=None, parent_table=None):
         self.table = {}
@@ -19,6 +40,36 @@ class SymbolTable:
         if parent_table:
             self.parent_table = parent_table
 
+        # scopes[depth] => the symbol table at that depth, from the program table down to this one.
+        if self.parent_table is not None:
+            self.scopes = self.parent_table.scopes + [self]
+        else:
+            self.scopes = [self]
+        self.depth = len(self.scopes) - 1
+
+        # One constant pool, and one map of the symbol tables (scope name => symbol table),
+        # for the whole program, created by the program table.
+        if self.parent_table is not None:
+            self.program_table = self.parent_table.program_table
+            self.constant_pool = self.parent_table.constant_pool
+            self.symbol_tables = self.parent_table.symbol_tables
+        else:
+            self.program_table = self
+            self.constant_pool = ConstantPool()
+            self.symbol_tables = {}
+
+            # Incremented whenever a symbol is added to or deleted from any table of the program.
+            self.generation = 0
+
+        # slots[symbol] => slot index of the symbol; entries[slot index] => properties of the symbol.
+        self.slots = {}
+        self.entries = []
+
+        # resolution_cache[key] => (depth, slot) of the key, or None if it is not defined;
+        # valid as long as the generation of the program table is resolution_generation.
+        self.resolution_cache = {}
+        self.resolution_generation = self.program_table.generation
+
     # size() => returns size of symbol table.
     def size(self):
         return len(self.table)
@@ -33,7 +84,7 @@ class SymbolTable:
 
     # is_present(key) => returns a boolean value based on whether a symbol is present, given a key as a parameter.
     def is_present(self, key):
-        return key in self.table.keys()
+        return key in self.table
 
     # get(key) => returns the symbol table value, associated with the key given as parameter, from the symbol table.
     def get(self, key):
@@ -49,19 +100,24 @@ class SymbolTable:
             self.table[symbol] = {}
             self.table[symbol][property_key] = property_value
 
+            self.slots[symbol] = len(self.entries)
+            self.entries.append(self.table[symbol])
+            self.program_table.generation += 1
+
+    # put_constant(const_dtype, const_value) => interns a constant in the constant pool,
+    # and records it as used in this scope; returns its pool entry.
     def put_constant(self, const_dtype, const_value):
-        # NOTE: duplicate constants need to be taken care of.
+        const_object = self.constant_pool.intern(const_dtype, const_value)
 
-        const_object = {
-            "data_type": const_dtype,
-            "value": const_value,
-        }
+        if self.table.get("CONSTANTS") is None:
+            self.table["CONSTANTS"] = {}
+        self.table["CONSTANTS"][(const_dtype, const_value)] = const_object
 
-        if self.table.get("CONSTANTS") is not None:
-            self.table["CONSTANTS"].append(const_object)
-        else:
-            self.table["CONSTANTS"] = []
-            self.table["CONSTANTS"].append(const_object)
+        return const_object
+
+    # get_constant(const_dtype, const_value) => returns the pool entry of a constant, or None.
+    def get_constant(self, const_dtype, const_value):
+        return self.constant_pool.get(const_dtype, const_value)
 
     # delete(key) => deletes a <key, value> pair, associated with the key given as a parameter,
     # from the symbol table; returns the deleted key if one needs to check what was deleted.
@@ -69,12 +125,63 @@ class SymbolTable:
         if self.is_present(key):
             self.table.pop(key)
 
+            # The slot of a deleted symbol is never given to another symbol.
+            slot = self.slots.pop(key, None)
+            if slot is not None:
+                self.entries[slot] = None
+            self.program_table.generation += 1
+
+    # resolve(key) => returns the (depth, slot) of the key in the closest table, from this one up
+    # through its parent tables, that defines it; or None if no table defines it.
+    def resolve(self, key):
+        generation = self.program_table.generation
+        if self.resolution_generation != generation:
+            self.resolution_cache = {}
+            self.resolution_generation = generation
+
+        try:
+            return self.resolution_cache[key]
+        except KeyError:
+            pass
+
+        resolution = None
+        for symbol_table in reversed(self.scopes):
+            slot = symbol_table.slots.get(key)
+            if slot is not None:
+                resolution = (symbol_table.depth, slot)
+                break
+
+        self.resolution_cache[key] = resolution
+        return resolution
+
+    # get_resolved(resolution) => returns the properties of the symbol resolved to (depth, slot).
+    def get_resolved(self, resolution):
+        depth, slot = resolution
+        return self.scopes[depth].entries[slot]
+
+    # get_visible(key) => returns the properties of the key in the closest table, from this one up,
+    # that defines it; or None.
+    def get_visible(self, key):
+        resolution = self.resolve(key)
+        if resolution is None:
+            return None
+        return self.get_resolved(resolution)
+
+    # lookup(key) => returns the closest table, from this one up, that defines the key; or None.
+    def lookup(self, key):
+        resolution = self.resolve(key)
+        if resolution is None:
+            return None
+        return self.scopes[resolution[0]]
+
     def __repr__(self):
         return "Symbol Table\nSCOPE - {scope}\nSCOPE NAME - {scope_name}\nPARENT TABLE - {parent_table}\n\t {table}\n".format(
             scope=self.scope,
             scope_name=self.scope_name,
-            parent_table=self.parent_table.scope_name
-            if self.parent_table is not None
-            else str(None),
+            parent_table=(
+                self.parent_table.scope_name
+                if self.parent_table is not None
+                else str(None)
+            ),
             table=self.table,
         )
@@ -1,3 +1,8 @@
 VALUE = "value"
 DATA_TYPE = "data_type"
 MEM_LOCATION = "memory_location"
+MEMORY = "memory"
+ARRAY_SIZE = "array_size"
+PARAMETER = "parameter"
+REGISTER = "register"
+REFERENCE = "reference"
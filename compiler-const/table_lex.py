@@ -0,0 +1,196 @@
+"""
+python table_lex.py mg.f23
+"""
+
+# A table-driven lexer for the same f23 vocabulary as simple_lex.py (its tokens, reserved words
+# and t_ rules), built as one combined master regex.
+#
+# The rules are tried in the order ply gives them: the rules written as functions first (in the
+# order they are defined), then the rules written as strings (longest regex first); so both
+# lexers split a source in the same tokens. Each group of the master regex maps, through a table
+# indexed by the group number, to the id of its token type (its index in TOKEN_NAMES).
+#
+# The blanks (t_ignore) are not a token of their own: every match starts with the blanks before
+# its token, so a source is lexed in about half the matches. The reserved words are tried just
+# before IDENTIFIER, as one alternation factored on their first letter ("d(?:(ouble)|(o))|...")
+# with a group per word: keywords are told apart by the regex itself, instead of by a look-up
+# in the reserved dict for every identifier, and only the words starting with the letter at hand
+# are tried (trying all 19 at every position was most of the time spent).
+#
+# tokenize_all(source) lexes a whole source at once, into parallel arrays; TableLexer wraps it
+# with the input()/token() interface of a ply lexer, for yacc.
+
+import itertools
+import re
+import sys
+from array import array
+from collections import namedtuple
+
+import simple_lex
+
+# TOKEN_NAMES[token id] => name of the token type; TOKEN_IDS[name] => its token id.
+TOKEN_NAMES = list(simple_lex.tokens)
+TOKEN_IDS = {name: token_id for token_id, name in enumerate(TOKEN_NAMES)}
+
+# Characters that can go on in an identifier (see t_IDENTIFIER); a reserved word is only
+# a keyword if it is not followed by one of them.
+IDENTIFIER_CHARACTERS = r"[a-zA-Z_\$0-9]"
+
+# Token types whose value is always the same text (the reserved words, and the rules whose regex
+# is plain text, like t_ASSIGN): their values are shared, not sliced from the source.
+FIXED_VALUES = {name: keyword for keyword, name in simple_lex.reserved.items()}
+for name in simple_lex.tokens:
+    regex = getattr(simple_lex, "t_" + name, None)
+    if isinstance(regex, str) and re.fullmatch(r"(\\.|[^\\.^$*+?{}\[\]|()])+", regex):
+        FIXED_VALUES[name] = re.sub(r"\\(.)", r"\1", regex)
+
+# The parallel arrays of tokenize_all():
+#   types[i] => token id of the i-th token (see TOKEN_NAMES);
+#   values[i] => its text; linenos[i] => its line number; positions[i] => its offset in the source.
+TokenArrays = namedtuple("TokenArrays", ["types", "values", "linenos", "positions"])
+
+
+def rules(module=simple_lex):
+    # The (name, regex) of the t_ rules of the module, in the order ply tries them.
+    function_rules = []
+    string_rules = []
+    for name, rule in vars(module).items():
+        if not name.startswith("t_") or name in ("t_ignore", "t_error"):
+            continue
+        if callable(rule):
+            function_rules.append((rule.__code__.co_firstlineno, name[2:], rule.__doc__))
+        else:
+            string_rules.append((name[2:], rule))
+
+    function_rules.sort()
+    string_rules.sort(key=lambda named_rule: len(named_rule[1]), reverse=True)
+    return [(name, regex) for line, name, regex in function_rules] + string_rules
+
+
+def build_master_regex(module=simple_lex):
+    # Returns the master regex, and the token id (or kind of skipped text) of each of its groups.
+    alternatives = []
+    group_types = [None]
+
+    def add_group(name, regex):
+        # The groups of a rule do not capture: the group number is the rule.
+        regex = re.sub(r"(?<!\\)\((?!\?)", "(?:", regex)
+        group_types.append(TOKEN_IDS.get(name, name))
+        return "({})".format(regex)
+
+    # After the rules: an illegal character, or the end of the source (after its last blanks).
+    for name, regex in rules(module) + [("error", r"[\s\S]"), ("ignore", r"\Z")]:
+        if name == "IDENTIFIER":
+            # The reserved words, longest first within a letter, so "do" does not cut "double".
+            keywords = sorted(module.reserved, key=lambda keyword: (keyword[0], -len(keyword)))
+            branches = []
+            for first, words in itertools.groupby(keywords, key=lambda keyword: keyword[0]):
+                suffixes = [
+                    add_group(module.reserved[word], re.escape(word[1:])) for word in words
+                ]
+                branches.append(re.escape(first) + "(?:" + "|".join(suffixes) + ")")
+            alternatives.append(
+                "(?:" + "|".join(branches) + ")(?!" + IDENTIFIER_CHARACTERS + ")"
+            )
+        alternatives.append(add_group(name, regex))
+
+    blanks = "[{}]*".format(re.escape(module.t_ignore))
+    return re.compile(blanks + "(?:" + "|".join(alternatives) + ")"), group_types
+
+
+MASTER_REGEX, GROUP_TYPES = build_master_regex()
+
+# FIXED_TOKEN_VALUES[token id] => its value, for the token types that always have the same text.
+FIXED_TOKEN_VALUES = [FIXED_VALUES.get(name) for name in TOKEN_NAMES]
+
+
+# ----------------------------------------------------------------------------
+# Lexes a whole source; returns its tokens as TokenArrays.
+# Skips blanks and comments, counts lines like simple_lex (at the newlines outside of other tokens),
+# and prints (then skips) illegal characters like it does.
+# ----------------------------------------------------------------------------
+def tokenize_all(source: str, lineno=1, offset=0) -> TokenArrays:
+    types = array("H")
+    values = []
+    linenos = array("i")
+    positions = array("i")
+
+    group_types = GROUP_TYPES
+    fixed_values = FIXED_TOKEN_VALUES
+    append_type = types.append
+    append_value = values.append
+    append_lineno = linenos.append
+    append_position = positions.append
+    for match in MASTER_REGEX.finditer(source):
+        index = match.lastindex
+        token_type = group_types[index]
+        if token_type.__class__ is int:
+            value = fixed_values[token_type] or match.group(index)
+            append_type(token_type)
+            append_value(value)
+            append_lineno(lineno)
+            append_position(match.end() - len(value) + offset)
+        elif token_type == "newline":
+            lineno += match.end() - match.start(index)
+        elif token_type == "error":
+            print("Illegal character '%s'" % match.group(index))
+
+    return TokenArrays(types, values, linenos, positions)
+
+
+class Token:
+    # A token, as yacc reads it from a lexer (like ply's LexToken).
+    __slots__ = ("type", "value", "lineno", "lexpos")
+
+    def __init__(self, type, value, lineno, lexpos):
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+    def __repr__(self):
+        return "LexToken(%s,%r,%d,%d)" % (self.type, self.value, self.lineno, self.lexpos)
+
+
+# ----------------------------------------------------------------------------
+# A lexer with the interface of a ply lexer, over tokenize_all():
+#   parser.parse(data, lexer=TableLexer())
+# ----------------------------------------------------------------------------
+class TableLexer:
+    def __init__(self):
+        self.lexdata = ""
+        self.lineno = 1
+        self.lexpos = 0
+        self.tokens = TokenArrays(array("H"), [], array("i"), array("i"))
+        self.index = 0
+
+    def input(self, data):
+        self.lexdata = data
+        self.tokens = tokenize_all(data, lineno=self.lineno)
+        self.index = 0
+
+    def token(self):
+        index = self.index
+        tokens = self.tokens
+        if index >= len(tokens.types):
+            return None
+
+        self.index = index + 1
+        self.lexpos = tokens.positions[index]
+        return Token(
+            TOKEN_NAMES[tokens.types[index]],
+            tokens.values[index],
+            tokens.linenos[index],
+            self.lexpos,
+        )
+
+    def __iter__(self):
+        return iter(self.token, None)
+
+
+if __name__ == "__main__":
+    data = open(sys.argv[1], "r").read()
+    lexer = TableLexer()
+    lexer.input(data)
+    for token in lexer:
+        print(token)
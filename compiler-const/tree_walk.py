@@ -0,0 +1,47 @@
+# This file holds the traversal engine shared by the walks through the AST.
+#
+# The AST is walked in breadth-first order, with a deque as the queue, so a walk is linear in
+# the number of nodes. Every node is given a position, the same way the walks always numbered
+# them: the root is "1", and the position of a child is its parent position followed by its index.
+#
+# Every node is also given a scope, which is whatever the walk needs to pass down the tree
+# (a symbol table, a parent position...). A node passes its own scope down to its children,
+# unless enter_scope(node, position, scope) returns another one for them.
+
+from collections import deque
+
+
+# ----------------------------------------------------------------------------
+# Walks through the tree given as parameter, lazily;
+# yields (node, position, scope) for each node, in breadth-first order.
+# enter_scope is called for a node when the walk is resumed after yielding it.
+# ----------------------------------------------------------------------------
+def walk_tree(root, scope=None, enter_scope=None):
+    queue = deque([(root, "1", scope)])
+    while queue:
+        node, position, scope = queue.popleft()
+        yield node, position, scope
+
+        if enter_scope is not None:
+            scope = enter_scope(node, position, scope)
+        for child_position, child in enumerate(getattr(node, "children", ())):
+            queue.append((child, position + str(child_position), scope))
+
+
+# ----------------------------------------------------------------------------
+# Walks through the tree given as parameter, calling the visitor of each node's type:
+#   visitors => {node type: visitor(node, position, scope)}
+# A visitor may return the scope of the children of its node; if it returns None,
+# they keep the scope of their parent. Nodes of other types are only walked through.
+# ----------------------------------------------------------------------------
+def visit_tree(root, visitors, scope=None):
+    def visit(node, position, scope):
+        visitor = visitors.get(getattr(node, "type", None))
+        if visitor is None:
+            return scope
+
+        child_scope = visitor(node, position, scope)
+        return scope if child_scope is None else child_scope
+
+    for _ in walk_tree(root, scope, visit):
+        pass
@@ -1,12 +1,8 @@
 int yourmain(){
-	strcpy(&SMem[8], "Hello\n");
-	print_string(&SMem[8]);
-	F23_Time += 120;
-	int yourmain(){
-	int yourmain(){
-	int yourmain(){
+	allocate_in_Mem(1);
+	strcpy(&SMem[16], "Hello\n");
+	F23_Time += 20;
+	print_string(&SMem[16]);
+	F23_Time += 100;
 	return 0;
-}return 0;
-}return 0;
-}return 0;
-}
\ No newline at end of file
+}